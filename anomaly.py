@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+
+# 롤링 창 (거래일), z-score 임계값
+ANOMALY_WINDOW = 21
+ANOMALY_Z_THRESHOLD = 6.0
+
+# 로그 비율 척도의 하한 (0.1%, OHLC 경미한 차이 기준과 동일)
+# 두 출처 값이 거의 같으면 MAD가 0에 가까워져 미세한 반올림 차이도 큰 z-score가 되는 것을 막음
+ANOMALY_MIN_SCALE = 1e-3
+
+# 정규분포에서 MAD -> 표준편차 환산 계수
+MAD_TO_SIGMA = 1.4826
+
+# 단계 변화 비율이 이 값들과 가까우면 분할/통화 단위 문제로 추정 (상대 오차 2% 이내)
+SPLIT_RATIOS = [2, 3, 4, 5, 8, 10, 15, 20, 25, 50]
+CURRENCY_UNIT_RATIOS = [100]
+RATIO_MATCH_TOLERANCE = 0.02
+
+INCIDENT_COLUMNS = [
+    'ticker', 'start_date', 'end_date', 'change_date', 'points', 'kind', 'peak_z', 'step_ratio', 'median_ratio',
+    'suspected_cause', 'severity',
+]
+
+
+def align_price_ratio(eodhd_df, yf_df):
+    """
+    EODHD 수정종가와 yfinance 종가를 거래일 기준으로 정렬하고 로그 비율을 계산합니다.
+    반환 컬럼: Date, eodhd_close, yfinance_close, log_ratio
+    """
+    eodhd_close = 'adjusted_close' if 'adjusted_close' in eodhd_df.columns else 'close'
+    if 'Date' not in eodhd_df.columns or eodhd_close not in eodhd_df.columns:
+        raise ValueError("EODHD 데이터에 'Date' 또는 종가 열이 없습니다.")
+    if 'Date' not in yf_df.columns or 'Close' not in yf_df.columns:
+        raise ValueError("yfinance 데이터에 'Date' 또는 'Close' 열이 없습니다.")
+
+    left = pd.DataFrame({'Date': eodhd_df['Date'].to_numpy(),
+                         'eodhd_close': eodhd_df[eodhd_close].to_numpy(dtype=np.float64)})
+    right = pd.DataFrame({'Date': yf_df['Date'].to_numpy(),
+                          'yfinance_close': yf_df['Close'].to_numpy(dtype=np.float64)})
+    aligned = left.drop_duplicates('Date').merge(right.drop_duplicates('Date'), on='Date', how='inner')
+    aligned = aligned.sort_values('Date', ignore_index=True)
+
+    valid = (aligned['eodhd_close'] > 0) & (aligned['yfinance_close'] > 0)
+    aligned = aligned[valid].reset_index(drop=True)
+    aligned['log_ratio'] = np.log(aligned['eodhd_close'] / aligned['yfinance_close'])
+    return aligned
+
+
+def score_ratio_series(aligned, window=ANOMALY_WINDOW, min_scale=ANOMALY_MIN_SCALE):
+    """
+    로그 비율 시계열에 롤링 median/MAD 기반 점수를 한 번에 계산합니다.
+    z: 중앙 창 median 대비 robust z-score (일회성 튐)
+    shift_score: 직전 창과 이후 창 median 차이의 robust 점수 (구조적 변화)
+    """
+    scored = aligned.copy()
+    ratio = scored['log_ratio']
+    min_periods = max(3, window // 2)
+
+    median = ratio.rolling(window, center=True, min_periods=min_periods).median()
+    # MAD 근사: 각 시점 median과의 절대 편차를 다시 롤링 median
+    mad = (ratio - median).abs().rolling(window, center=True, min_periods=min_periods).median()
+    scale = np.maximum(MAD_TO_SIGMA * mad.fillna(0).to_numpy(), min_scale)
+
+    # 직전 창 (t-window ~ t-1) / 이후 창 (t ~ t+window-1)
+    before = ratio.rolling(window, min_periods=min_periods).median().shift(1)
+    after = ratio[::-1].rolling(window, min_periods=min_periods).median()[::-1]
+
+    scored['median'] = median
+    scored['scale'] = scale
+    scored['z'] = (ratio - median) / scale
+    scored['step'] = after - before
+    scored['shift_score'] = scored['step'].abs() / scale
+    return scored
+
+
+def classify_step(step_ratio):
+    """단계 변화 비율로 원인 추정 (dashboard common_causes 문구 사용)"""
+    if not np.isfinite(step_ratio) or step_ratio <= 0:
+        return "기타"
+    magnitude = max(step_ratio, 1 / step_ratio)
+    for ratio in CURRENCY_UNIT_RATIOS:
+        if abs(magnitude / ratio - 1) <= RATIO_MATCH_TOLERANCE:
+            return "환율 적용 차이"
+    for ratio in SPLIT_RATIOS:
+        if abs(magnitude / ratio - 1) <= RATIO_MATCH_TOLERANCE:
+            return "분할/배당 조정 차이"
+    if magnitude < 1.1:
+        return "조정 계산 방식 차이"
+    return "데이터 소스 차이"
+
+
+def find_incidents(scored, ticker=None, threshold=ANOMALY_Z_THRESHOLD, max_gap=1):
+    """
+    임계값을 넘는 연속 구간을 이상 구간(incident)으로 묶어 심각도 순으로 반환합니다.
+    max_gap: 같은 구간으로 묶을 플래그 사이 최대 간격 (행 수)
+    """
+    z = scored['z'].abs().fillna(0).to_numpy()
+    shift_score = scored['shift_score'].fillna(0).to_numpy()
+    flagged = np.flatnonzero((z >= threshold) | (shift_score >= threshold))
+    if len(flagged) == 0:
+        return pd.DataFrame(columns=INCIDENT_COLUMNS)
+
+    # 플래그 위치가 max_gap보다 벌어지는 곳에서 구간을 나눔
+    breaks = np.flatnonzero(np.diff(flagged) > max_gap + 1) + 1
+    starts = np.concatenate(([0], breaks))
+    ends = np.concatenate((breaks, [len(flagged)]))
+
+    dates = scored['Date'].to_numpy()
+    steps = scored['step'].fillna(0).to_numpy()
+    ratios = scored['log_ratio'].to_numpy()
+
+    incidents = []
+    for start, end in zip(starts, ends):
+        lo, hi = flagged[start], flagged[end - 1]
+        span = slice(lo, hi + 1)
+        peak_z = float(z[span].max())
+        peak_shift = float(shift_score[span].max())
+        is_shift = peak_shift >= threshold
+
+        if is_shift:
+            change_at = lo + int(np.argmax(shift_score[span]))
+            change_date = pd.Timestamp(dates[change_at]).strftime('%Y-%m-%d')
+            step_ratio = float(np.exp(steps[change_at]))
+            suspected_cause = classify_step(step_ratio)
+        else:
+            change_date = ''
+            step_ratio = 1.0
+            suspected_cause = "데이터 소스 차이"
+
+        incidents.append({
+            'ticker': ticker,
+            'start_date': pd.Timestamp(dates[lo]).strftime('%Y-%m-%d'),
+            'end_date': pd.Timestamp(dates[hi]).strftime('%Y-%m-%d'),
+            'change_date': change_date,
+            'points': int(hi - lo + 1),
+            'kind': 'level_shift' if is_shift else 'spike',
+            'peak_z': round(peak_z, 2),
+            'step_ratio': round(step_ratio, 6),
+            'median_ratio': round(float(np.exp(np.median(ratios[span]))), 6),
+            'suspected_cause': suspected_cause,
+            'severity': round(max(peak_z, peak_shift), 2),
+        })
+
+    incidents_df = pd.DataFrame(incidents, columns=INCIDENT_COLUMNS)
+    return incidents_df.sort_values(['severity', 'points'], ascending=False, ignore_index=True)
+
+
+def detect_incidents(eodhd_df, yf_df, ticker=None, window=ANOMALY_WINDOW, threshold=ANOMALY_Z_THRESHOLD):
+    """EODHD/yfinance 가격 프레임에서 이상 구간 탐지 (종목당 한 번의 벡터 연산)"""
+    aligned = align_price_ratio(eodhd_df, yf_df)
+    if len(aligned) < 3:
+        return pd.DataFrame(columns=INCIDENT_COLUMNS)
+    return find_incidents(score_ratio_series(aligned, window), ticker, threshold)
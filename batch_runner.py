@@ -0,0 +1,568 @@
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+import pandas as pd
+
+from anomaly import ANOMALY_WINDOW, ANOMALY_Z_THRESHOLD, INCIDENT_COLUMNS
+from corporate_actions import CORPORATE_ACTION_COLUMNS
+from dashboard import COMPARISON_DATA_TYPES, DataComparator
+from date_index import make_date_range
+from digests import DIGEST_FIELDS
+from sampling import (DEFAULT_SAMPLE_PER_STRATUM, DEFAULT_TARGET_HALF_WIDTH, MAX_SAMPLING_ROUNDS, SAMPLING_FIELDS,
+                      STRATUM_KEYS)
+from exporters import EXPORT_FORMATS, export_results
+from ingest import (DEFAULT_BURST, DEFAULT_CONCURRENCY, DEFAULT_RATE, EODHD_BASE_URL, INGEST_DATA_TYPES, INGEST_SOURCES,
+                    MAX_ATTEMPTS, YAHOO_BASE_URL, YAHOO_COOKIE_URL, Ingestor)
+from instrumentation import SamplingProfiler
+from payload_archive import JSON_DECODERS, archive_file, is_archived, resolve_payload, restore_file, set_json_decoder
+from prewarm import PREWARM_VIEWS, Prewarmer, prewarm_workers
+from report_pack import REPORT_INDEX_FILE, ReportPackOptions, build_report_pack, report_workers
+from timeseries_store import SERIES_LAYOUTS
+
+
+def make_comparator(args):
+    """배치용 DataComparator (--metrics-out 지정 시 계측 활성화, --no-result-cache 지정 시 결과 캐시 미사용)"""
+    comparator = DataComparator()
+    comparator.instrumentation.enabled = bool(args.metrics_out)
+    if args.no_result_cache:
+        comparator.result_cache.enabled = False
+    if comparator.provider_error:
+        print(f"경고: {comparator.provider_error} (기본 출처만 사용)")
+    if comparator.tolerance_error:
+        print(f"경고: {comparator.tolerance_error} (기본 허용 오차 사용)")
+    return comparator
+
+
+def resolve_tickers(comparator, tickers):
+    """지정된 종목이 없으면 전체 유니버스 사용"""
+    if tickers:
+        return tickers
+    return [ticker[0] for ticker in comparator.get_ticker_list()]
+
+
+def run_export(args):
+    """비교 결과를 파일로 일괄 내보내기"""
+    comparator = make_comparator(args)
+    tickers = resolve_tickers(comparator, args.tickers)
+
+    fmt = args.format or os.path.splitext(args.output)[1].lstrip('.').lower()
+    if fmt not in EXPORT_FORMATS:
+        print(f"오류: 지원하지 않는 형식입니다 ({fmt}). 사용 가능: {', '.join(EXPORT_FORMATS)}")
+        return 1
+    try:
+        date_range = make_date_range(args.start, args.end, args.last)
+    except ValueError as e:
+        print(f"오류: {e}")
+        return 1
+
+    recorder = comparator.metrics_store.recorder()
+    row_count = export_results(
+        recorder.observe(comparator.iter_comparison_batches(tickers, args.data_types, args.num_records, date_range)),
+        fmt,
+        args.output,
+        comparator.issue_tracker.get_issues()
+    )
+    run_id = recorder.commit()
+    print(f"{len(tickers)}개 종목, {row_count:,}행 내보내기 완료: {args.output} (실행 ID: {run_id})")
+    write_metrics(comparator, args)
+    return 0
+
+
+def run_anomalies(args):
+    """유니버스 전체 가격 비율 이상 구간 탐지 (심각도 순)"""
+    comparator = make_comparator(args)
+    tickers = resolve_tickers(comparator, args.tickers)
+
+    frames = []
+    for ticker in tickers:
+        incidents, error = comparator.detect_price_anomalies(ticker, args.window, args.threshold)
+        if error:
+            print(f"{ticker}: 건너뜀 ({error})")
+            continue
+        if not incidents.empty:
+            frames.append(incidents)
+
+    if frames:
+        incidents = pd.concat(frames, ignore_index=True)
+        incidents = incidents.sort_values(['severity', 'points'], ascending=False, ignore_index=True)
+    else:
+        incidents = pd.DataFrame(columns=INCIDENT_COLUMNS)
+    if args.top:
+        incidents = incidents.head(args.top)
+
+    print(f"{len(tickers)}개 종목, 이상 구간 {len(incidents)}개")
+    if args.output:
+        tmp_path = f"{args.output}.tmp"
+        incidents.to_csv(tmp_path, index=False, encoding='utf-8-sig')
+        os.replace(tmp_path, args.output)
+        print(f"저장: {args.output}")
+    elif not incidents.empty:
+        print(incidents.to_string(index=False))
+    write_metrics(comparator, args)
+    return 0
+
+
+def run_actions(args):
+    """유니버스 전체 분할/배당 이벤트 대조 (문제 이벤트 우선, 설명되는 종가 불일치 수 순)"""
+    comparator = make_comparator(args)
+    tickers = resolve_tickers(comparator, args.tickers)
+
+    frames = []
+    for ticker in tickers:
+        actions, error = comparator.check_corporate_actions(ticker)
+        if error:
+            print(f"{ticker}: 건너뜀 ({error})")
+            continue
+        if not actions.empty:
+            frames.append(actions)
+
+    if frames:
+        actions = pd.concat(frames, ignore_index=True)
+    else:
+        actions = pd.DataFrame(columns=CORPORATE_ACTION_COLUMNS)
+    problems = actions['status'] != 'matched'
+    print(f"{len(tickers)}개 종목, 이벤트 {len(actions)}개 (문제 {int(problems.sum())}개)")
+    if not actions.empty:
+        print(actions.groupby(['action', 'status']).size().to_string())
+
+    if not args.all:
+        actions = actions[problems]
+    actions = (actions.assign(_problem=actions['status'] != 'matched')
+               .sort_values(['_problem', 'explained_mismatches', 'ticker'], ascending=[False, False, True])
+               .drop(columns='_problem').reset_index(drop=True))
+    if args.top:
+        actions = actions.head(args.top)
+
+    if args.output:
+        tmp_path = f"{args.output}.tmp"
+        actions.to_csv(tmp_path, index=False, encoding='utf-8-sig')
+        os.replace(tmp_path, args.output)
+        print(f"저장: {args.output}")
+    elif not actions.empty:
+        print(actions.to_string(index=False))
+    write_metrics(comparator, args)
+    return 0
+
+
+def run_estimate(args):
+    """층화 무작위 표본으로 유니버스 불일치율 추정"""
+    comparator = make_comparator(args)
+    tickers = resolve_tickers(comparator, args.tickers)
+
+    report, errors = comparator.estimate_quality(tickers, args.data_types, args.per_stratum,
+                                                 args.target_half_width, args.max_rounds, args.seed)
+    for ticker, data_type, error in errors:
+        print(f"{ticker} {data_type}: 건너뜀 ({error})")
+
+    overall = report.estimate()
+    if overall.empty:
+        print("표본을 추출할 데이터가 없습니다.")
+        return 1
+
+    overall = overall.iloc[0]
+    print(f"{len(tickers)}개 종목, 표본 {int(overall['sampled']):,} / 모집단 {int(overall['population']):,}행 "
+          f"(추출 {report.rounds}회)")
+    print(f"추정 불일치율: {overall['rate'] * 100:.2f}% "
+          f"(95% 신뢰구간 {overall['ci_low'] * 100:.2f}% ~ {overall['ci_high'] * 100:.2f}%)")
+    if args.by:
+        print(report.estimate(args.by).to_string(index=False))
+
+    if args.output:
+        tmp_path = f"{args.output}.tmp"
+        report.strata.to_csv(tmp_path, index=False, encoding='utf-8-sig')
+        os.replace(tmp_path, args.output)
+        print(f"층별 결과 저장: {args.output}")
+    write_metrics(comparator, args)
+    return 0
+
+
+def run_verify(args):
+    """digest 트리로 유니버스 검증 (같은 블록은 건너뛰고 다른 월만 값 비교)"""
+    comparator = make_comparator(args)
+    tickers = resolve_tickers(comparator, args.tickers)
+
+    batches = []
+    identical = rows_compared = mismatches = 0
+    for ticker in tickers:
+        for data_type in args.data_types:
+            verification, error = comparator.verify_digests(ticker, data_type)
+            if error:
+                print(f"{ticker} {data_type}: 건너뜀 ({error})")
+                continue
+            identical += verification['identical']
+            rows_compared += verification['rows_compared']
+            mismatches += len(verification['results'])
+            if verification['differing_months']:
+                print(f"{ticker} {data_type}: 다른 월 {len(verification['differing_months'])}개, "
+                      f"비교 {verification['rows_compared']:,}건, 불일치 {len(verification['results']):,}건")
+            batches.append((ticker, data_type, verification['results'], None))
+
+    print(f"{len(batches)}개 (종목, 데이터 유형) 검증: 완전 일치 {identical}개, "
+          f"값 비교 {rows_compared:,}건, 불일치 {mismatches:,}건")
+
+    if args.output:
+        fmt = os.path.splitext(args.output)[1].lstrip('.').lower()
+        if fmt not in EXPORT_FORMATS:
+            print(f"오류: 지원하지 않는 형식입니다 ({fmt}). 사용 가능: {', '.join(EXPORT_FORMATS)}")
+            return 1
+        row_count = export_results(batches, fmt, args.output, comparator.issue_tracker.get_issues())
+        print(f"불일치 {row_count:,}행 저장: {args.output}")
+    write_metrics(comparator, args)
+    return 0
+
+
+def run_ingest(args):
+    """유니버스 원본 파일 동시 수집 (연결 풀 + 동시성/요청률 제한 + 재시도, 파일은 원자적 교체)"""
+    comparator = make_comparator(args)
+    tickers = resolve_tickers(comparator, args.tickers)
+    if args.eodhd_dir:
+        comparator.eodhd_dir = args.eodhd_dir
+    if args.yfinance_dir:
+        comparator.yfinance_dir = args.yfinance_dir
+    if 'eodhd' in args.sources and not (args.api_token or os.environ.get('EODHD_API_TOKEN')):
+        print("오류: EODHD API 토큰이 없습니다. (--api-token 또는 EODHD_API_TOKEN 환경 변수)")
+        return 1
+
+    ingestor = Ingestor(comparator, api_token=args.api_token, eodhd_base_url=args.eodhd_url,
+                        yahoo_base_url=args.yahoo_url,
+                        yahoo_cookie_url=None if args.yahoo_url != YAHOO_BASE_URL else YAHOO_COOKIE_URL,
+                        concurrency=args.concurrency, rate=args.rate, burst=args.burst,
+                        max_attempts=args.max_attempts, append=args.append, archive=args.archive)
+    with comparator.instrumentation.span('ingest.run'):
+        report = ingestor.run(tickers, args.data_types, args.sources)
+
+    frame = report.frame()
+    for row in frame[frame['status'].isin(['error', 'missing'])].itertuples():
+        print(f"{row.source} {row.ticker} {row.data_type}: {row.status} ({row.error})")
+    counts = report.counts()
+    print(f"{len(tickers)}개 종목, 파일 {counts.get('ok', 0) + counts.get('restated', 0):,}개 전체 갱신 "
+          f"(과거 값 변경 {counts.get('restated', 0):,}개) / 델타 추가 {counts.get('appended', 0):,}개 / "
+          f"변경 없음 {counts.get('unchanged', 0):,}개 / 실패 {counts.get('error', 0):,}개 / "
+          f"데이터 없음 {counts.get('missing', 0):,}개")
+    print(f"요청 {report.requests:,}회 (재시도 {report.retries:,}회), {report.elapsed:.1f}초, "
+          f"{report.requests / report.elapsed if report.elapsed else 0:.1f}회/초, "
+          f"{frame['bytes'].sum() / 1024 / 1024:.1f} MB")
+
+    if args.output:
+        tmp_path = f"{args.output}.tmp"
+        frame.to_csv(tmp_path, index=False, encoding='utf-8-sig')
+        os.replace(tmp_path, args.output)
+        print(f"수집 결과 저장: {args.output}")
+    write_metrics(comparator, args)
+    return 0 if not counts.get('error') else 2
+
+
+def run_compact(args):
+    """시계열 델타 세그먼트를 기본 파일로 병합"""
+    comparator = make_comparator(args)
+    tickers = resolve_tickers(comparator, args.tickers)
+    if args.eodhd_dir:
+        comparator.eodhd_dir = args.eodhd_dir
+    if args.yfinance_dir:
+        comparator.yfinance_dir = args.yfinance_dir
+    store = comparator.series_store
+
+    merged_files = merged_segments = 0
+    for ticker in tickers:
+        for source, data_type in SERIES_LAYOUTS:
+            path = comparator.source_file_path(ticker, data_type, source)
+            count = store.compact(path, store.layout(source, data_type))
+            if count:
+                merged_files += 1
+                merged_segments += count
+    print(f"{len(tickers)}개 종목, 파일 {merged_files:,}개에서 세그먼트 {merged_segments:,}개 병합")
+    write_metrics(comparator, args)
+    return 0
+
+
+def run_archive(args):
+    """시계열이 아닌 JSON 원본(펀더멘털/재무제표)을 압축 보관 형식으로 변환 (--restore: 원래 JSON으로 복원)"""
+    comparator = make_comparator(args)
+    tickers = resolve_tickers(comparator, args.tickers)
+    if args.eodhd_dir:
+        comparator.eodhd_dir = args.eodhd_dir
+    if args.yfinance_dir:
+        comparator.yfinance_dir = args.yfinance_dir
+
+    files = size_before = size_after = 0
+    for ticker in tickers:
+        for source in INGEST_SOURCES:
+            for data_type in INGEST_DATA_TYPES:
+                path = comparator.source_file_path(ticker, data_type, source)
+                # 시계열 JSON(yfinance 시가총액)은 델타 세그먼트를 붙이므로 보관 대상에서 제외
+                if (source, data_type) in SERIES_LAYOUTS or not path.endswith('.json'):
+                    continue
+                current = resolve_payload(path)
+                if args.restore and is_archived(current):
+                    _, before, after = restore_file(current)
+                elif not args.restore and current == path and os.path.exists(path):
+                    _, before, after = archive_file(path)
+                else:
+                    continue
+                files += 1
+                size_before += before
+                size_after += after
+
+    print(f"{len(tickers)}개 종목, 파일 {files:,}개 {'복원' if args.restore else '보관'}: "
+          f"{size_before / 1024 / 1024:.1f} MB -> {size_after / 1024 / 1024:.1f} MB")
+    write_metrics(comparator, args)
+    return 0
+
+
+def run_prewarm(args):
+    """대시보드/배치 결과 캐시 예열 (지수 비중 내림차순, 스레드 풀)"""
+    comparator = make_comparator(args)
+    prewarmer = Prewarmer(comparator, views=args.data_types, num_records=args.num_records, workers=args.workers)
+    status = prewarmer.run(args.tickers or None)
+
+    for ticker, view, error in status['failed']:
+        print(f"{ticker} {view}: {error}")
+    print(f"작업 {status['done']:,}개 완료 (실패 {len(status['failed']):,}개), {status['elapsed']:.1f}초")
+    write_metrics(comparator, args)
+    return 0 if not status['failed'] else 2
+
+
+def run_reports(args):
+    """종목별 HTML/CSV 보고서와 유니버스 목록 페이지를 프로세스 풀에서 일괄 작성"""
+    comparator = make_comparator(args)
+    tickers = resolve_tickers(comparator, args.tickers)
+    try:
+        date_range = make_date_range(args.start, args.end, args.last)
+        report_date = date.fromisoformat(args.report_date) if args.report_date else date.today()
+    except ValueError as e:
+        print(f"오류: {e}")
+        return 1
+
+    options = ReportPackOptions(
+        output_dir=args.output_dir, data_types=args.data_types, num_records=args.num_records or None,
+        date_range=date_range, client_name=args.client_name, report_date=report_date,
+        analyst_name=args.analyst_name, report_type=args.report_type, result_cache=not args.no_result_cache,
+    )
+
+    def progress(done, total, result):
+        if result['error']:
+            print(f"{result['ticker']}: {result['error']}")
+        if done % 50 == 0 or done == total:
+            print(f"보고서 {done:,}/{total:,}")
+
+    started = time.perf_counter()
+    summary, run_id = build_report_pack(comparator, tickers, options, args.workers, progress)
+    written = int(summary['html'].ne('').sum())
+    print(f"{len(tickers)}개 종목 중 {written}개 보고서 작성, {time.perf_counter() - started:.1f}초: "
+          f"{os.path.join(args.output_dir, REPORT_INDEX_FILE)} (실행 ID: {run_id})")
+    write_metrics(comparator, args)
+    return 0 if written == len(summary) else 2
+
+
+def write_metrics(comparator, args):
+    """계측 결과 저장 (.json 또는 Prometheus 텍스트)"""
+    if args.metrics_out:
+        comparator.instrumentation.write(args.metrics_out)
+        print(f"계측 결과 저장: {args.metrics_out}")
+
+
+def run_consensus(args):
+    """등록된 출처(또는 지정 출처)를 한 번에 정렬해 출처 쌍별 불일치와 셀별 합의값 계산"""
+    comparator = make_comparator(args)
+    tickers = resolve_tickers(comparator, args.tickers)
+
+    pairwise_frames, cell_frames = [], []
+    for ticker in tickers:
+        for data_type in args.data_types:
+            alignment, error = comparator.provider_alignment(ticker, data_type, args.providers)
+            if error:
+                print(f"{ticker} {data_type}: 건너뜀 ({error})")
+                continue
+            pairwise = alignment.pairwise()
+            cells = alignment.cells()
+            for frame in (pairwise, cells):
+                frame.insert(0, 'data_type', data_type)
+                frame.insert(0, 'ticker', ticker)
+            pairwise_frames.append(pairwise)
+            cell_frames.append(cells)
+            print(f"{ticker} {data_type}: 출처 {', '.join(alignment.providers)}, 날짜 {len(alignment.dates):,}개, "
+                  f"불일치 셀 {len(cells):,}개")
+
+    if not pairwise_frames:
+        print("비교할 (종목, 데이터 유형)이 없습니다.")
+        return 1
+
+    pairwise = pd.concat(pairwise_frames, ignore_index=True)
+    summary = pairwise.groupby(['data_type', 'left', 'right'])[['compared', 'matches', 'warnings', 'mismatches']].sum()
+    summary['mismatch_rate'] = summary['mismatches'] / summary['compared'].where(summary['compared'] > 0)
+    print(summary.to_string())
+
+    if args.pairwise_output:
+        pairwise.to_csv(args.pairwise_output, index=False)
+        print(f"출처 쌍별 통계 {len(pairwise):,}행 저장: {args.pairwise_output}")
+    if args.output:
+        cells = pd.concat(cell_frames, ignore_index=True)
+        cells.to_csv(args.output, index=False)
+        print(f"불일치 셀 {len(cells):,}행 저장: {args.output}")
+    write_metrics(comparator, args)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="데이터 품질 검증 배치 실행기")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    # 공통 옵션: 계측/프로파일링
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--metrics-out', help="단계별 계측 결과 저장 경로 (.json 또는 .prom)")
+    common.add_argument('--profile-out', help="샘플링 프로파일 저장 경로 (collapsed stacks, flame graph 입력)")
+    common.add_argument('--no-result-cache', action='store_true', help="저장된 비교 결과를 쓰지 않고 다시 계산")
+    common.add_argument('--json-decoder', choices=list(JSON_DECODERS), help="JSON 디코더 (기본: 설치된 가장 빠른 것)")
+
+    export_parser = subparsers.add_parser('export', parents=[common],
+                                          help="비교 결과를 CSV/Parquet/XLSX로 내보내기")
+    export_parser.add_argument('--tickers', nargs='*', help="대상 종목 (생략 시 전체 유니버스)")
+    export_parser.add_argument('--data-types', nargs='+', default=COMPARISON_DATA_TYPES,
+                               choices=COMPARISON_DATA_TYPES, help="대상 데이터 유형")
+    export_parser.add_argument('--num-records', type=int, default=10, help="종목별 검증 데이터 수 (0이면 기간 전체)")
+    export_parser.add_argument('--start', help="비교 기간 시작일 (YYYY-MM-DD, 가격/배당)")
+    export_parser.add_argument('--end', help="비교 기간 종료일 (YYYY-MM-DD, 포함)")
+    export_parser.add_argument('--last', help="최근 기간 (예: 30D, 12W, 6M, 1Y, 종료일 또는 데이터의 마지막 날짜 기준)")
+    export_parser.add_argument('--format', choices=list(EXPORT_FORMATS), help="출력 형식 (생략 시 확장자로 판단)")
+    export_parser.add_argument('--output', required=True, help="출력 파일 경로")
+    export_parser.set_defaults(func=run_export)
+
+    anomaly_parser = subparsers.add_parser('anomalies', parents=[common],
+                                           help="전체 가격 이력의 이상 구간 탐지")
+    anomaly_parser.add_argument('--tickers', nargs='*', help="대상 종목 (생략 시 전체 유니버스)")
+    anomaly_parser.add_argument('--window', type=int, default=ANOMALY_WINDOW, help="롤링 창 (거래일)")
+    anomaly_parser.add_argument('--threshold', type=float, default=ANOMALY_Z_THRESHOLD, help="z-score 임계값")
+    anomaly_parser.add_argument('--top', type=int, default=50, help="출력할 상위 구간 수 (0이면 전체)")
+    anomaly_parser.add_argument('--output', help="CSV 저장 경로 (생략 시 화면 출력)")
+    anomaly_parser.set_defaults(func=run_anomalies)
+
+    actions_parser = subparsers.add_parser('actions', parents=[common],
+                                           help="분할/배당 이벤트를 두 출처 간 대조")
+    actions_parser.add_argument('--tickers', nargs='*', help="대상 종목 (생략 시 전체 유니버스)")
+    actions_parser.add_argument('--all', action='store_true', help="일치한 이벤트도 출력")
+    actions_parser.add_argument('--top', type=int, default=50, help="출력할 상위 이벤트 수 (0이면 전체)")
+    actions_parser.add_argument('--output', help="CSV 저장 경로 (생략 시 화면 출력)")
+    actions_parser.set_defaults(func=run_actions)
+
+    estimate_parser = subparsers.add_parser('estimate', parents=[common],
+                                            help="층화 무작위 표본으로 불일치율 추정")
+    estimate_parser.add_argument('--tickers', nargs='*', help="대상 종목 (생략 시 전체 유니버스)")
+    estimate_parser.add_argument('--data-types', nargs='+', default=list(SAMPLING_FIELDS),
+                                 choices=list(SAMPLING_FIELDS), help="대상 데이터 유형")
+    estimate_parser.add_argument('--per-stratum', type=int, default=DEFAULT_SAMPLE_PER_STRATUM,
+                                 help="층별 초기 표본 수")
+    estimate_parser.add_argument('--target-half-width', type=float, default=DEFAULT_TARGET_HALF_WIDTH,
+                                 help="층별 목표 신뢰구간 반폭 (넘으면 표본 추가)")
+    estimate_parser.add_argument('--max-rounds', type=int, default=MAX_SAMPLING_ROUNDS, help="최대 추출 횟수")
+    estimate_parser.add_argument('--seed', type=int, help="난수 시드 (재현용)")
+    estimate_parser.add_argument('--by', nargs='*', choices=STRATUM_KEYS, help="추정치를 나눠 볼 층 컬럼")
+    estimate_parser.add_argument('--output', help="층별 결과 CSV 저장 경로")
+    estimate_parser.set_defaults(func=run_estimate)
+
+    verify_parser = subparsers.add_parser('verify', parents=[common],
+                                          help="digest 트리로 변경/불일치 블록만 검증")
+    verify_parser.add_argument('--tickers', nargs='*', help="대상 종목 (생략 시 전체 유니버스)")
+    verify_parser.add_argument('--data-types', nargs='+', default=list(DIGEST_FIELDS),
+                               choices=list(DIGEST_FIELDS), help="대상 데이터 유형")
+    verify_parser.add_argument('--output', help="불일치 행 저장 경로 (.csv/.parquet/.xlsx)")
+    verify_parser.set_defaults(func=run_verify)
+
+    consensus_parser = subparsers.add_parser('consensus', parents=[common],
+                                             help="등록된 여러 출처를 함께 비교 (출처 쌍별 불일치, 합의값)")
+    consensus_parser.add_argument('--tickers', nargs='*', help="대상 종목 (생략 시 전체 유니버스)")
+    consensus_parser.add_argument('--data-types', nargs='+', default=list(DIGEST_FIELDS),
+                                  choices=list(DIGEST_FIELDS), help="대상 데이터 유형")
+    consensus_parser.add_argument('--providers', nargs='+',
+                                  help="비교할 출처 (생략 시 등록된 전체, 추가 출처는 providers.json)")
+    consensus_parser.add_argument('--output', help="불일치 셀 CSV 저장 경로 (출처별 값, 합의값, 다른 출처)")
+    consensus_parser.add_argument('--pairwise-output', help="종목별 출처 쌍 통계 CSV 저장 경로")
+    consensus_parser.set_defaults(func=run_consensus)
+
+    ingest_parser = subparsers.add_parser('ingest', parents=[common],
+                                          help="EODHD/yfinance 원본 파일 동시 수집")
+    ingest_parser.add_argument('--tickers', nargs='*', help="대상 종목 (생략 시 전체 유니버스)")
+    ingest_parser.add_argument('--sources', nargs='+', default=INGEST_SOURCES, choices=INGEST_SOURCES,
+                               help="수집 출처")
+    ingest_parser.add_argument('--data-types', nargs='+', default=INGEST_DATA_TYPES, choices=INGEST_DATA_TYPES,
+                               help="대상 데이터 유형")
+    ingest_parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help="동시 요청 수")
+    ingest_parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help="초당 요청 수 한도")
+    ingest_parser.add_argument('--burst', type=int, default=DEFAULT_BURST, help="순간 허용 요청 수")
+    ingest_parser.add_argument('--max-attempts', type=int, default=MAX_ATTEMPTS, help="요청당 최대 시도 횟수")
+    ingest_parser.add_argument('--api-token', help="EODHD API 토큰 (생략 시 EODHD_API_TOKEN 환경 변수)")
+    ingest_parser.add_argument('--eodhd-url', default=EODHD_BASE_URL, help="EODHD API 주소 (목 서버: .../api)")
+    ingest_parser.add_argument('--yahoo-url', default=YAHOO_BASE_URL, help="Yahoo API 주소")
+    ingest_parser.add_argument('--eodhd-dir', help="EODHD 파일 저장 디렉터리 (기본: ./data)")
+    ingest_parser.add_argument('--yfinance-dir', help="yfinance 파일 저장 디렉터리 (기본: ./yfinance_data)")
+    ingest_parser.add_argument('--append', action='store_true',
+                               help="시계열은 마지막 날짜 이후만 받아 델타 세그먼트로 추가")
+    ingest_parser.add_argument('--archive', action='store_true',
+                               help="펀더멘털/재무제표 JSON을 압축 보관 형식으로 저장")
+    ingest_parser.add_argument('--output', help="파일별 수집 결과 CSV 저장 경로")
+    ingest_parser.set_defaults(func=run_ingest)
+
+    compact_parser = subparsers.add_parser('compact', parents=[common],
+                                           help="시계열 델타 세그먼트를 기본 파일로 병합")
+    compact_parser.add_argument('--tickers', nargs='*', help="대상 종목 (생략 시 전체 유니버스)")
+    compact_parser.add_argument('--eodhd-dir', help="EODHD 파일 디렉터리 (기본: ./data)")
+    compact_parser.add_argument('--yfinance-dir', help="yfinance 파일 디렉터리 (기본: ./yfinance_data)")
+    compact_parser.set_defaults(func=run_compact)
+
+    archive_parser = subparsers.add_parser('archive', parents=[common],
+                                           help="펀더멘털/재무제표 JSON을 압축 보관 형식으로 변환")
+    archive_parser.add_argument('--tickers', nargs='*', help="대상 종목 (생략 시 전체 유니버스)")
+    archive_parser.add_argument('--eodhd-dir', help="EODHD 파일 디렉터리 (기본: ./data)")
+    archive_parser.add_argument('--yfinance-dir', help="yfinance 파일 디렉터리 (기본: ./yfinance_data)")
+    archive_parser.add_argument('--restore', action='store_true', help="보관 파일을 원래 JSON으로 복원")
+    archive_parser.set_defaults(func=run_archive)
+
+    prewarm_parser = subparsers.add_parser('prewarm', parents=[common],
+                                           help="비교 결과 캐시 예열 (지수 비중 순)")
+    prewarm_parser.add_argument('--tickers', nargs='*', help="대상 종목 (생략 시 전체 유니버스)")
+    prewarm_parser.add_argument('--data-types', nargs='+', default=PREWARM_VIEWS,
+                                choices=sorted(set(PREWARM_VIEWS) | set(COMPARISON_DATA_TYPES)),
+                                help="대상 데이터 유형 (financial_statements: 재무제표 저장소)")
+    prewarm_parser.add_argument('--num-records', type=int, default=10, help="종목별 검증 데이터 수")
+    prewarm_parser.add_argument('--workers', type=int, default=prewarm_workers(), help="예열 스레드 수")
+    prewarm_parser.set_defaults(func=run_prewarm)
+
+    reports_parser = subparsers.add_parser('reports', parents=[common],
+                                           help="종목별 보고서와 유니버스 목록 페이지 일괄 작성 (프로세스 풀)")
+    reports_parser.add_argument('--tickers', nargs='*', help="대상 종목 (생략 시 전체 유니버스)")
+    reports_parser.add_argument('--data-types', nargs='+', default=COMPARISON_DATA_TYPES,
+                                choices=COMPARISON_DATA_TYPES, help="보고서에 포함할 데이터 유형")
+    reports_parser.add_argument('--num-records', type=int, default=10, help="종목별 검증 데이터 수 (0이면 기간 전체)")
+    reports_parser.add_argument('--start', help="비교 기간 시작일 (YYYY-MM-DD, 가격/배당)")
+    reports_parser.add_argument('--end', help="비교 기간 종료일 (YYYY-MM-DD, 포함)")
+    reports_parser.add_argument('--last', help="최근 기간 (예: 30D, 12W, 6M, 1Y, 종료일 또는 데이터의 마지막 날짜 기준)")
+    reports_parser.add_argument('--client-name', default='', help="고객명")
+    reports_parser.add_argument('--analyst-name', default='', help="분석가")
+    reports_parser.add_argument('--report-type', default='월간 보고서', help="보고서 유형")
+    reports_parser.add_argument('--report-date', help="작성일 (YYYY-MM-DD, 생략 시 오늘)")
+    reports_parser.add_argument('--workers', type=int, default=report_workers(), help="작업 프로세스 수")
+    reports_parser.add_argument('--output-dir', required=True, help="보고서 저장 디렉터리")
+    reports_parser.set_defaults(func=run_reports)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.json_decoder:
+        set_json_decoder(args.json_decoder)
+
+    if args.profile_out:
+        with SamplingProfiler() as profiler:
+            exit_code = args.func(args)
+        profiler.write(args.profile_out)
+        print(f"프로파일 저장: {args.profile_out}")
+        return exit_code
+
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
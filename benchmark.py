@@ -0,0 +1,370 @@
+import argparse
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from dashboard import (
+    COMPARISON_DATA_TYPES, DataComparator, all_fields_mapping,
+    build_results_frame, build_status_index, get_results_page, render_final_report, style_results_page
+)
+
+# (EODHD 거래소 코드, yfinance 접미사, UTC 오프셋) - 실제 데이터 디렉토리의 명명 규칙과 동일
+SYNTHETIC_EXCHANGES = [
+    ('US', '', '-04:00'),
+    ('HK', '.HK', '+08:00'),
+    ('AS', '.AS', '+02:00'),
+    ('LSE', '.L', '+01:00'),
+    ('TA', '.TA', '+03:00'),
+    ('TO', '.TO', '-04:00'),
+]
+
+STATEMENT_FILES = {
+    'income_statement': 'Income_Statement',
+    'balance_sheet': 'Balance_Sheet',
+    'cash_flow': 'Cash_Flow',
+}
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def synthetic_tickers(count):
+    """(EODHD 티커, yfinance 티커, UTC 오프셋) 목록 생성"""
+    tickers = []
+    for i in range(count):
+        code, yf_suffix, offset = SYNTHETIC_EXCHANGES[i % len(SYNTHETIC_EXCHANGES)]
+        symbol = f"SYN{i:04d}"
+        tickers.append((f"{symbol}.{code}", f"{symbol}{yf_suffix}", offset))
+    return tickers
+
+
+def _inject(rng, values, rate, scale):
+    """rate 비율의 행에 상대 오차(scale)를 주입"""
+    values = values.copy()
+    mask = rng.random(len(values)) < rate
+    values[mask] = values[mask] * (1 + scale * rng.choice([-1, 1], mask.sum()))
+    return values
+
+
+def write_synthetic_ticker(root, eodhd_ticker, yf_ticker, offset, years, discrepancy_rate, rng):
+    """한 종목의 EODHD/yfinance 파일 세트 생성"""
+    eodhd_dir = os.path.join(root, 'data')
+    yf_dir = os.path.join(root, 'yfinance_data')
+
+    # 가격: 로그 랜덤워크, 수정주가 계수는 과거로 갈수록 작아짐 (배당 조정)
+    dates = pd.bdate_range(end=pd.Timestamp('2025-09-12'), periods=years * TRADING_DAYS_PER_YEAR)
+    n = len(dates)
+    close = 50 * np.exp(np.cumsum(rng.normal(0, 0.015, n)))
+    open_ = close * (1 + rng.normal(0, 0.005, n))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.005, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.005, n)))
+    volume = rng.integers(100_000, 20_000_000, n)
+    adj_factor = np.linspace(0.7, 1.0, n)
+
+    pd.DataFrame({
+        'date': dates.strftime('%Y-%m-%d'),
+        'open': open_.round(4), 'high': high.round(4), 'low': low.round(4), 'close': close.round(4),
+        'adjusted_close': (close * adj_factor).round(4),
+        'volume': volume,
+    }).to_csv(os.path.join(eodhd_dir, f'historical_ohlc_{eodhd_ticker}.csv'))
+
+    yf_dates = dates.strftime('%Y-%m-%d') + f' 00:00:00{offset}'
+    pd.DataFrame({
+        'Date': yf_dates,
+        'Open': _inject(rng, open_ * adj_factor, discrepancy_rate, 0.01),
+        'High': _inject(rng, high * adj_factor, discrepancy_rate, 0.01),
+        'Low': _inject(rng, low * adj_factor, discrepancy_rate, 0.01),
+        'Close': _inject(rng, close * adj_factor, discrepancy_rate, 0.01),
+        'Volume': np.where(rng.random(n) < discrepancy_rate, volume + 1000, volume),
+        'Dividends': 0.0,
+        'Stock Splits': 0.0,
+    }).to_csv(os.path.join(yf_dir, f'historical_ohlc_{yf_ticker}.csv'), index=False)
+
+    # 배당: 분기별
+    div_positions = np.arange(20, n, TRADING_DAYS_PER_YEAR // 4)
+    div_dates = dates[div_positions]
+    div_values = np.round(rng.uniform(0.1, 1.5, len(div_positions)), 4)
+    pd.DataFrame({
+        'date': div_dates.strftime('%Y-%m-%d'),
+        'declarationDate': (div_dates - pd.Timedelta(days=14)).strftime('%Y-%m-%d'),
+        'recordDate': (div_dates + pd.Timedelta(days=1)).strftime('%Y-%m-%d'),
+        'paymentDate': (div_dates + pd.Timedelta(days=21)).strftime('%Y-%m-%d'),
+        'period': 'Quarterly',
+        'value': div_values,
+        'unadjustedValue': div_values,
+        'currency': 'USD',
+    }).to_csv(os.path.join(eodhd_dir, f'dividends_{eodhd_ticker}.csv'))
+    pd.DataFrame({
+        'Date': div_dates.strftime('%Y-%m-%d') + f' 00:00:00{offset}',
+        'Dividends': _inject(rng, div_values, discrepancy_rate, 0.05),
+    }).to_csv(os.path.join(yf_dir, f'dividends_{yf_ticker}.csv'), index=False)
+
+    # 재무제표: 분기별 (EODHD fundamentals JSON / yfinance 재무제표 CSV)
+    quarter_ends = pd.date_range(end='2025-06-30', periods=years * 4, freq='QE')[::-1]
+    financials = {}
+    for file_type, section in STATEMENT_FILES.items():
+        fields = {k: v for k, v in all_fields_mapping.items() if v['section'] == section}
+        quarterly = {}
+        yf_rows = {}
+        for quarter in quarter_ends:
+            quarter_str = quarter.strftime('%Y-%m-%d')
+            values = {field: float(rng.integers(1_000_000, 50_000_000_000)) for field in fields}
+            quarterly[quarter_str] = {'date': quarter_str, 'currency_symbol': 'USD',
+                                      **{field: f"{value:.2f}" for field, value in values.items()}}
+            for field, info in fields.items():
+                value = values[field]
+                if rng.random() < discrepancy_rate:
+                    value *= 1.02
+                yf_rows.setdefault(info['yf_key'], {})[f"{quarter_str} 00:00:00"] = value
+        financials[section] = {'currency_symbol': 'USD', 'quarterly': quarterly, 'yearly': {}}
+
+        eodhd_statement = {'currency_symbol': 'USD', 'quarterly': quarterly, 'yearly': {}}
+        with open(os.path.join(eodhd_dir, f'{file_type}_{eodhd_ticker}.json'), 'w', encoding='utf-8') as f:
+            json.dump(eodhd_statement, f, indent=4)
+
+        yf_statement = pd.DataFrame.from_dict(yf_rows, orient='index')
+        yf_statement.index.name = 'index'
+        yf_statement.to_csv(os.path.join(yf_dir, f'{file_type}_{yf_ticker}.csv'))
+
+    with open(os.path.join(eodhd_dir, f'fundamentals_{eodhd_ticker}.json'), 'w', encoding='utf-8') as f:
+        json.dump({'General': {'Code': eodhd_ticker.split('.')[0]}, 'Financials': financials}, f, indent=4)
+    with open(os.path.join(yf_dir, f'fundamentals_{yf_ticker}.json'), 'w', encoding='utf-8') as f:
+        json.dump({'symbol': yf_ticker, 'sectorDisp': 'Technology', 'industryDisp': 'Synthetic'}, f, indent=4)
+
+
+def generate_synthetic_tree(root, ticker_count, years, discrepancy_rate, seed=0):
+    """./data, ./yfinance_data와 같은 구조의 합성 데이터 트리 생성"""
+    os.makedirs(os.path.join(root, 'data'), exist_ok=True)
+    os.makedirs(os.path.join(root, 'yfinance_data'), exist_ok=True)
+
+    rng = np.random.default_rng(seed)
+    tickers = synthetic_tickers(ticker_count)
+    for eodhd_ticker, yf_ticker, offset in tickers:
+        write_synthetic_ticker(root, eodhd_ticker, yf_ticker, offset, years, discrepancy_rate, rng)
+    return [t[0] for t in tickers]
+
+
+def peak_rss_mb():
+    """프로세스 최대 RSS (MB, 프로세스 시작 이후 최고치이므로 전체 실행 기준으로만 보고)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 byte 단위
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def traced_peak_mb(fn):
+    """
+    fn 실행 중 할당 최대치 (MB, tracemalloc, numpy 배열 포함)
+    단계마다 reset_peak() 후 측정하므로 앞 단계의 최고치가 섞이지 않습니다.
+    추적 오버헤드가 커서 지연시간 측정과는 별도로 한 번 더 실행합니다.
+    """
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        fn()
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+class StageTimer:
+    """단계별 호출 지연시간과 처리량 수집"""
+
+    def __init__(self):
+        self.stages = {}
+
+    def measure(self, stage, fn, items=None):
+        """fn을 실행하고 지연시간을 기록. items는 처리 건수 (결과에서 계산하는 함수도 허용)"""
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+
+        count = items(result) if callable(items) else (items if items is not None else 1)
+        stats = self.stages.setdefault(stage, {'latencies': [], 'items': 0})
+        stats['latencies'].append(elapsed)
+        stats['items'] += count
+        return result
+
+    def report(self):
+        report = {}
+        for stage, stats in self.stages.items():
+            latencies = np.array(stats['latencies'])
+            total = float(latencies.sum())
+            report[stage] = {
+                'calls': len(latencies),
+                'items': stats['items'],
+                'total_s': round(total, 6),
+                'throughput_per_s': round(stats['items'] / total, 2) if total > 0 else None,
+                'p50_ms': round(float(np.percentile(latencies, 50)) * 1000, 3),
+                'p99_ms': round(float(np.percentile(latencies, 99)) * 1000, 3),
+                'max_ms': round(float(latencies.max()) * 1000, 3),
+            }
+        return report
+
+
+def untimed(stage, fn, items=None):
+    """StageTimer.measure와 같은 시그니처로 기록 없이 실행 (할당 측정용)"""
+    return fn()
+
+
+def make_comparator(root):
+    """합성 트리를 바라보는 DataComparator (이슈/지표/캐시 파일도 합성 트리 안에 둠)"""
+    comparator = DataComparator()
+    comparator.eodhd_dir = os.path.join(root, 'data')
+    comparator.yfinance_dir = os.path.join(root, 'yfinance_data')
+    comparator.issue_tracker.issues_file = os.path.join(root, 'data_issues.json')
+    comparator.issue_tracker.load_issues()
+    comparator.metrics_store.base_dir = os.path.join(root, 'quality_metrics')
+    comparator.digest_store.base_dir = os.path.join(root, 'digest_cache')
+    # 반복 측정이 결과 캐시 적중을 재지 않도록 비교는 매번 계산
+    comparator.result_cache.base_dir = os.path.join(root, 'result_cache')
+    comparator.result_cache.enabled = False
+    return comparator
+
+
+def run_benchmark(root, tickers, num_records, repeat):
+    """load / compare / report 단계 측정 (지연시간은 repeat회, 할당 최대치는 추적 실행 1회)"""
+    comparator = make_comparator(root)
+    timer = StageTimer()
+    stage_alloc = {}
+
+    # 1) load_data: 매번 캐시를 비워 파일 읽기+파싱 비용을 측정
+    for data_type in list(COMPARISON_DATA_TYPES) + list(STATEMENT_FILES):
+        stage = f"load_data.{data_type}"
+
+        def load_all(measure):
+            for ticker in tickers:
+                comparator.invalidate_cache()
+                measure(stage, lambda: comparator.load_data(ticker, data_type), items=len)
+
+        for _ in range(repeat):
+            load_all(timer.measure)
+        stage_alloc[stage] = traced_peak_mb(lambda: load_all(untimed))
+
+    # 2) compare_detailed_data: 데이터 유형별 (결과 캐시 없이 비교 자체만)
+    ohlc_results = {}
+    for data_type in COMPARISON_DATA_TYPES:
+        stage = f"compare_detailed_data.{data_type}"
+
+        def compare_all(measure):
+            for ticker in tickers:
+                results, error = measure(
+                    stage, lambda: comparator.compare_detailed_data(ticker, data_type, num_records),
+                    items=lambda r: len(r[0] or [])
+                )
+                if data_type == 'historical_ohlc' and results:
+                    ohlc_results[ticker] = results
+
+        for _ in range(repeat):
+            compare_all(timer.measure)
+        stage_alloc[stage] = traced_peak_mb(lambda: compare_all(untimed))
+
+    # 3) show_quality_report 준비 단계 (컬럼형 변환, 상태 인덱스, 첫 페이지 스타일)
+    def prepare_report(results):
+        results_df = build_results_frame(results)
+        status_index = build_status_index(results_df)
+        page_positions = get_results_page(results_df, status_index['mismatch'], '차이', False, 0, 100)
+        style_results_page(results_df.iloc[page_positions]).to_html()
+        return results_df
+
+    def prepare_all(measure):
+        for ticker, results in ohlc_results.items():
+            measure("show_quality_report.prepare", lambda: prepare_report(results), items=len)
+
+    for _ in range(repeat):
+        prepare_all(timer.measure)
+    stage_alloc["show_quality_report.prepare"] = traced_peak_mb(lambda: prepare_all(untimed))
+
+    # 4) generate_final_report 렌더링 (전체 행 HTML 스트리밍)
+    def render_report(ticker, results):
+        buffer = io.BytesIO()
+        render_final_report(results, ticker, 'benchmark', date.today(), 'benchmark', 'benchmark',
+                            comparator.issue_tracker.get_issues(ticker)).dump(buffer, encoding='utf-8')
+        return buffer
+
+    def render_all(measure):
+        for ticker, results in ohlc_results.items():
+            measure("generate_final_report.render", lambda: render_report(ticker, results),
+                    items=lambda _: len(results))
+
+    for _ in range(repeat):
+        render_all(timer.measure)
+    stage_alloc["generate_final_report.render"] = traced_peak_mb(lambda: render_all(untimed))
+
+    stages = timer.report()
+    for stage, peak in stage_alloc.items():
+        if stage in stages:
+            stages[stage]['peak_alloc_mb'] = round(peak, 1)
+    return stages
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="합성 데이터 기반 파이프라인 벤치마크")
+    parser.add_argument('--tickers', type=int, default=10, help="합성 종목 수")
+    parser.add_argument('--years', type=int, default=5, help="종목당 가격 이력 연수")
+    parser.add_argument('--discrepancy-rate', type=float, default=0.01, help="yfinance 쪽에 주입할 불일치 비율")
+    parser.add_argument('--num-records', type=int, default=10,
+                        help="compare_detailed_data의 num_records (전체 이력은 큰 값 지정)")
+    parser.add_argument('--repeat', type=int, default=3, help="단계별 반복 횟수")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workdir', help="합성 트리 위치 (생략 시 임시 디렉토리)")
+    parser.add_argument('--keep', action='store_true', help="종료 후 합성 트리 유지")
+    parser.add_argument('--output', help="결과 JSON 경로 (생략 시 표준 출력)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    root = args.workdir or tempfile.mkdtemp(prefix='dq_bench_')
+    try:
+        started = time.perf_counter()
+        tickers = generate_synthetic_tree(root, args.tickers, args.years, args.discrepancy_rate, args.seed)
+        generate_s = time.perf_counter() - started
+
+        stages = run_benchmark(root, tickers, args.num_records, args.repeat)
+
+        report = {
+            'config': {
+                'tickers': args.tickers,
+                'years': args.years,
+                'discrepancy_rate': args.discrepancy_rate,
+                'num_records': args.num_records,
+                'repeat': args.repeat,
+                'seed': args.seed,
+            },
+            'environment': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'pandas': pd.__version__,
+                'numpy': np.__version__,
+            },
+            'generate_s': round(generate_s, 3),
+            'stages': stages,
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+        }
+    finally:
+        if not args.keep and not args.workdir:
+            shutil.rmtree(root, ignore_errors=True)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from tolerance import MATCH, MATCH_SYMBOLS, MISMATCH, WARNING, as_float64_array
+
+PAIRWISE_COLUMNS = ['field', 'left', 'right', 'compared', 'matches', 'warnings', 'mismatches', 'mismatch_rate',
+                    'max_difference']
+
+
+def nan_median(values):
+    """행별 중앙값 (NaN 제외, 값이 없는 행은 NaN)"""
+    ordered = np.sort(values, axis=1)
+    counts = (~np.isnan(values)).sum(axis=1)
+    rows = np.arange(len(values))
+    low = ordered[rows, np.maximum(counts - 1, 0) // 2]
+    high = ordered[rows, np.maximum(counts, 1) // 2]
+    return np.where(counts > 0, (low + high) / 2, np.nan)
+
+
+def align_providers(data_type, frames, fields, tolerances, exchange='', currency=None):
+    """
+    출처별 정규화 시계열 {출처: DataFrame(Date + fields)}을 한 번에 정렬합니다.
+    일치 구분은 tolerances(ToleranceRules)의 종목 거래소/통화 규칙을 따릅니다.
+    모든 출처 날짜의 합집합을 만들고 출처마다 한 번씩 위치를 찾아 값을 배치하므로,
+    출처 쌍마다 다시 병합하지 않습니다. 같은 날짜가 여러 행이면 첫 행을 사용합니다.
+    """
+    names = list(frames)
+    days = {}
+    for name, frame in frames.items():
+        frame_days = frame['Date'].to_numpy().astype('datetime64[D]')
+        days[name] = frame_days[~np.isnat(frame_days)], np.flatnonzero(~np.isnat(frame_days))
+    dates = np.unique(np.concatenate([frame_days for frame_days, _ in days.values()]))
+
+    values = {field: np.full((len(dates), len(names)), np.nan) for field in fields}
+    for column, name in enumerate(names):
+        frame_days, rows = days[name]
+        unique_days, first = np.unique(frame_days, return_index=True)
+        positions = np.searchsorted(dates, unique_days)
+        for field in fields:
+            values[field][positions, column] = as_float64_array(frames[name][field].to_numpy()[rows[first]])
+    return ProviderAlignment(data_type, dates, names, values, tolerances, exchange, currency)
+
+
+class ProviderAlignment:
+    """
+    여러 출처를 한 번에 정렬한 결과와 출처 쌍별 비교, 셀별 합의값
+    dates: 모든 출처 날짜의 합집합 (datetime64[D], 오름차순), providers: 출처 이름 목록
+    values: {항목: (날짜 수, 출처 수) float64 배열, 출처에 없는 날짜/값은 NaN}
+    합의값은 셀에 값이 있는 출처들의 중앙값입니다.
+    """
+
+    def __init__(self, data_type, dates, providers, values, tolerances, exchange='', currency=None):
+        self.data_type = data_type
+        self.tolerances = tolerances
+        self.market = (exchange, currency)
+        self.dates = dates
+        self.providers = list(providers)
+        self.values = values
+        self.consensus = {field: nan_median(array) for field, array in values.items()}
+        self._pair_codes = {}
+
+    @property
+    def fields(self):
+        return list(self.values)
+
+    def classify(self, field, left, right):
+        """두 값 배열의 일치 구분 -> (코드 배열, 절대 차이 배열). 결측 처리는 호출자가 함"""
+        return self.tolerances.classify(self.data_type, field, left, right, *self.market)
+
+    def pair_codes(self, field, left, right):
+        """출처 쌍의 날짜별 일치 코드 (한쪽이라도 값이 없으면 -1)와 절대 차이"""
+        key = (field, left, right)
+        if key not in self._pair_codes:
+            array = self.values[field]
+            a = array[:, self.providers.index(left)]
+            b = array[:, self.providers.index(right)]
+            codes, difference = self.classify(field, a, b)
+            present = ~np.isnan(a) & ~np.isnan(b)
+            self._pair_codes[key] = np.where(present, codes, -1), np.where(present, difference, np.nan)
+        return self._pair_codes[key]
+
+    def pairwise(self):
+        """모든 출처 쌍 x 항목의 비교 통계 (공통 날짜만 비교)"""
+        rows = []
+        for field in self.fields:
+            for left, right in itertools.combinations(self.providers, 2):
+                codes, difference = self.pair_codes(field, left, right)
+                compared = int((codes >= 0).sum())
+                mismatches = int((codes == MISMATCH).sum())
+                rows.append({
+                    'field': field, 'left': left, 'right': right, 'compared': compared,
+                    'matches': int((codes == MATCH).sum()), 'warnings': int((codes == WARNING).sum()),
+                    'mismatches': mismatches, 'mismatch_rate': mismatches / compared if compared else 0.0,
+                    'max_difference': float(np.nanmax(difference)) if compared else 0.0,
+                })
+        return pd.DataFrame(rows, columns=PAIRWISE_COLUMNS)
+
+    def cells(self, disagreements_only=True):
+        """
+        날짜 x 항목 셀 (출처별 값, 합의값, 값이 있는 출처 수, 셀 상태, 합의값과 다른 출처)
+        셀 상태는 출처 쌍 중 가장 나쁜 구분이며, 합의값과 다른 출처는 값이 있는 출처가 3개 이상일 때만 표시합니다.
+        """
+        frames = []
+        for field in self.fields:
+            array = self.values[field]
+            consensus = self.consensus[field]
+            present = ~np.isnan(array)
+            worst = np.full(len(self.dates), -1)
+            for left, right in itertools.combinations(self.providers, 2):
+                worst = np.maximum(worst, self.pair_codes(field, left, right)[0])
+
+            outliers = np.zeros(array.shape, dtype=bool)
+            voters = present.sum(axis=1)
+            for column in range(len(self.providers)):
+                codes, _ = self.classify(field, array[:, column], consensus)
+                outliers[:, column] = present[:, column] & (codes != MATCH) & (voters >= 3)
+
+            selected = worst > MATCH if disagreements_only else worst >= MATCH
+            if not selected.any():
+                continue
+            frame = pd.DataFrame(array[selected], columns=self.providers)
+            frame.insert(0, 'field', field)
+            frame.insert(0, 'date', pd.to_datetime(self.dates[selected]).strftime('%Y-%m-%d'))
+            frame['consensus'] = consensus[selected]
+            frame['providers'] = voters[selected]
+            frame['match'] = np.array(MATCH_SYMBOLS)[worst[selected]]
+            frame['outliers'] = [','.join(np.array(self.providers)[row]) for row in outliers[selected]]
+            frames.append(frame)
+
+        columns = ['date', 'field'] + self.providers + ['consensus', 'providers', 'match', 'outliers']
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True).sort_values(['date', 'field'], ignore_index=True)
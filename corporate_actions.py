@@ -0,0 +1,263 @@
+import numpy as np
+import pandas as pd
+
+from anomaly import RATIO_MATCH_TOLERANCE, SPLIT_RATIOS
+from tolerance import MATCH, MISMATCH, as_float64_array
+
+# 두 출처의 같은 이벤트로 볼 최대 날짜 차이 (일, 배당락일/분할일 표기 차이)
+ACTION_DATE_TOLERANCE_DAYS = 5
+
+# 수정 계수(close / adjusted_close) 변화가 이 비율 이상이면 분할 (배당 조정은 보통 몇 % 이내)
+SPLIT_MIN_RATIO = 1.15
+
+# 분할 확인용 전후 창 (거래일): 하루짜리 값 오류가 아니라 계수 수준이 실제로 바뀌었는지 중앙값으로 확인
+SPLIT_CONFIRM_WINDOW = 5
+
+CORPORATE_ACTION_COLUMNS = [
+    'ticker', 'action', 'status', 'eodhd_date', 'yfinance_date', 'eodhd_value', 'yfinance_value', 'evidence',
+    'affected_start', 'affected_end', 'affected_bars', 'explained_mismatches',
+]
+
+# 상태 (matched 외에는 영향 받는 가격 구간을 함께 보고)
+# date_mismatch: 같은 이벤트인데 날짜가 다름 -> 두 날짜 사이 가격
+# value_mismatch / missing_* / unadjusted_*: 이벤트 이전 가격 전체
+ACTION_STATUSES = ['matched', 'date_mismatch', 'value_mismatch', 'missing_eodhd', 'missing_yfinance',
+                   'unadjusted_eodhd', 'unadjusted_yfinance']
+
+_NO_DATES = np.array([], dtype='datetime64[D]')
+
+
+def _days(values):
+    return np.asarray(values).astype('datetime64[D]')
+
+
+def _is_split_ratio(ratio):
+    """가격 비율이 흔한 분할 비율 (SPLIT_RATIOS 또는 그 역수)과 가까운지"""
+    magnitude = np.maximum(ratio, 1 / ratio)
+    near = [np.abs(magnitude / split - 1) <= RATIO_MATCH_TOLERANCE for split in SPLIT_RATIOS]
+    return np.logical_or.reduce(near)
+
+
+def _confirmed_steps(log_values, threshold, window=SPLIT_CONFIRM_WINDOW):
+    """
+    하루 변화가 임계값 이상이고 전후 창 중앙값도 같은 방향으로 바뀐 위치 (일회성 튐 제외)
+    반환: 위치 배열 (변화 후 첫 행)
+    """
+    jumps = log_values[:-1] - log_values[1:]
+    candidates = np.flatnonzero(np.abs(jumps) >= threshold) + 1
+    if len(candidates) == 0:
+        return candidates
+    series = pd.Series(log_values)
+    before = series.rolling(window, min_periods=1).median().shift(1).to_numpy()
+    after = series[::-1].rolling(window, min_periods=1).median()[::-1].to_numpy()
+    steps = before[candidates] - after[candidates]
+    confirmed = (np.abs(steps) >= threshold) & (np.sign(steps) == np.sign(jumps[candidates - 1]))
+    return candidates[confirmed]
+
+
+def adjustment_splits(dates, close, adjusted_close):
+    """EODHD 수정 계수 (close / adjusted_close) 변화로 찾은 분할 -> (날짜, 비율) (2:1 분할 = 2)"""
+    dates, factor = _days(dates), close / adjusted_close
+    valid = np.isfinite(factor) & (factor > 0)
+    dates, log_factor = dates[valid], np.log(factor[valid])
+    at = _confirmed_steps(log_factor, np.log(SPLIT_MIN_RATIO))
+    return dates[at], np.exp(log_factor[at - 1] - log_factor[at])
+
+
+def column_splits(dates, splits):
+    """yfinance 'Stock Splits' 열의 분할 -> (날짜, 비율) (0과 1은 분할 없음)"""
+    splits = np.nan_to_num(splits, nan=0.0)
+    at = np.flatnonzero((splits > 0) & (splits != 1))
+    return _days(dates)[at], splits[at]
+
+
+def unadjusted_splits(dates, prices):
+    """
+    수정 가격 시계열에 남은 분할 모양의 가격 변화 -> (날짜, 비율)
+    분할이 반영되지 않아 이전 가격 전체가 비율만큼 어긋난 것으로 추정 (실제 급등락과 구분되지 않으므로 의심 이벤트)
+    """
+    dates, valid = _days(dates), np.isfinite(prices) & (prices > 0)
+    dates, log_prices = dates[valid], np.log(prices[valid])
+    at = _confirmed_steps(log_prices, np.log(min(SPLIT_RATIOS)) - RATIO_MATCH_TOLERANCE)
+    ratios = np.exp(log_prices[at - 1] - log_prices[at])
+    keep = _is_split_ratio(ratios)
+    return dates[at][keep], ratios[keep]
+
+
+def match_events(left, right, max_days=ACTION_DATE_TOLERANCE_DAYS):
+    """
+    정렬된 두 이벤트 날짜 배열을 가장 가까운 날짜끼리 1:1로 짝지음 (max_days 이내)
+    반환: (left 위치 배열, right 위치 배열)
+    """
+    if len(left) == 0 or len(right) == 0:
+        return np.array([], dtype=np.intp), np.array([], dtype=np.intp)
+    after = np.clip(np.searchsorted(right, left), 0, len(right) - 1)
+    before = np.clip(after - 1, 0, len(right) - 1)
+    gap_before = np.abs(left - right[before])
+    gap_after = np.abs(right[after] - left)
+    choice = np.where(gap_after < gap_before, after, before)
+    distance = np.minimum(gap_before, gap_after)
+
+    candidates = np.flatnonzero(distance <= np.timedelta64(max_days, 'D'))
+    # 같은 right 이벤트에 여러 left가 가까우면 가장 가까운 하나만
+    order = candidates[np.lexsort((distance[candidates], choice[candidates]))]
+    _, first = np.unique(choice[order], return_index=True)
+    kept = np.sort(order[first])
+    return kept, choice[kept]
+
+
+def reconcile_events(action, eodhd_events, yf_events, values_match, coverage):
+    """
+    한 종류 이벤트의 출처별 목록 대조
+    eodhd_events/yf_events: (날짜, 값, 근거 배열), values_match(a, b) -> bool 배열, coverage: (시작일, 종료일)
+    반환: 이벤트 행 목록 (영향 구간 제외)
+    """
+    start, end = coverage
+    sides = []
+    for dates, values, evidence in (eodhd_events, yf_events):
+        inside = (dates >= start) & (dates <= end)
+        order = np.argsort(dates[inside], kind='stable')
+        sides.append((dates[inside][order], values[inside][order], evidence[inside][order]))
+    (e_dates, e_values, e_evidence), (y_dates, y_values, y_evidence) = sides
+
+    e_at, y_at = match_events(e_dates, y_dates)
+    same_value = values_match(e_values[e_at], y_values[y_at])
+    unadjusted = np.char.endswith(e_evidence[e_at].astype(str), 'price_jump'), \
+        np.char.endswith(y_evidence[y_at].astype(str), 'price_jump')
+
+    rows = []
+    for i, j, value_ok, e_jump, y_jump in zip(e_at, y_at, same_value, *unadjusted):
+        if e_jump:
+            status = 'unadjusted_eodhd'
+        elif y_jump:
+            status = 'unadjusted_yfinance'
+        elif not value_ok:
+            status = 'value_mismatch'
+        elif e_dates[i] != y_dates[j]:
+            status = 'date_mismatch'
+        else:
+            status = 'matched'
+        rows.append((action, status, e_dates[i], y_dates[j], e_values[i], y_values[j],
+                     f"{e_evidence[i]}/{y_evidence[j]}"))
+
+    for dates, values, evidence, matched, status in ((e_dates, e_values, e_evidence, e_at, 'missing_yfinance'),
+                                                      (y_dates, y_values, y_evidence, y_at, 'missing_eodhd')):
+        missing = np.setdiff1d(np.arange(len(dates)), matched)
+        for i in missing:
+            if evidence[i].endswith('price_jump'):
+                # 다른 출처에 분할이 없으면 실제 급등락일 가능성이 크므로 보고하지 않음
+                continue
+            eodhd_side = status == 'missing_yfinance'
+            rows.append((action, status, dates[i] if eodhd_side else None, None if eodhd_side else dates[i],
+                         values[i] if eodhd_side else None, None if eodhd_side else values[i],
+                         f"{evidence[i]}/-" if eodhd_side else f"-/{evidence[i]}"))
+    return rows
+
+
+def cross_check_actions(eodhd_prices, yf_prices, eodhd_dividends, yf_dividends, tolerances, ticker=None,
+                        exchange='', currency=None):
+    """
+    두 출처의 분할/배당 이벤트를 전체 이력에서 한 번에 대조하고, 어긋난 이벤트가 오염시키는 가격 구간을 보고합니다.
+    eodhd_prices: Date, close, adjusted_close / yf_prices: Date, Close, Stock Splits (날짜 오름차순, 중복 없음)
+    eodhd_dividends: Date, value / yf_dividends: Date, Dividends (없으면 None)
+    explained_mismatches: 종가 ❌ 날짜를 그 뒤의 가장 가까운 어긋난 이벤트에 한 번씩만 배정한 수
+    (한 원인이 설명하는 하위 가격 불일치 수)
+    """
+    e_dates, y_dates = _days(eodhd_prices['Date']), _days(yf_prices['Date'])
+    e_close = as_float64_array(eodhd_prices['close'])
+    e_adjusted = as_float64_array(eodhd_prices['adjusted_close'])
+    y_close = as_float64_array(yf_prices['Close'])
+
+    # 공통 거래일의 종가 판정 (EODHD 수정종가 vs yfinance 종가, 비교 화면과 같은 허용 오차)
+    common, e_at, y_at = np.intersect1d(e_dates, y_dates, assume_unique=True, return_indices=True)
+    codes, _ = tolerances.classify('historical_ohlc', 'Close', e_adjusted[e_at], y_close[y_at], exchange, currency)
+    mismatched = common[codes == MISMATCH]
+
+    rows = []
+    if len(common):
+        # 분할: 가격 이력이 겹치는 기간만 비교
+        coverage = (max(e_dates[0], y_dates[0]), min(e_dates[-1], y_dates[-1]))
+        split_dates, split_ratios = adjustment_splits(e_dates, e_close, e_adjusted)
+        jump_dates, jump_ratios = unadjusted_splits(e_dates, e_adjusted)
+        eodhd_splits = (np.concatenate([split_dates, jump_dates]), np.concatenate([split_ratios, jump_ratios]),
+                        np.array(['adjustment'] * len(split_dates) + ['price_jump'] * len(jump_dates), dtype=object))
+        split_dates, split_ratios = column_splits(y_dates, as_float64_array(yf_prices['Stock Splits'])) \
+            if 'Stock Splits' in yf_prices.columns else (_NO_DATES, np.array([]))
+        jump_dates, jump_ratios = unadjusted_splits(y_dates, y_close)
+        yf_splits = (np.concatenate([split_dates, jump_dates]), np.concatenate([split_ratios, jump_ratios]),
+                     np.array(['split_column'] * len(split_dates) + ['price_jump'] * len(jump_dates), dtype=object))
+        rows += reconcile_events('split', eodhd_splits, yf_splits,
+                                 lambda a, b: np.abs(a / b - 1) <= RATIO_MATCH_TOLERANCE, coverage)
+
+    if eodhd_dividends is not None and yf_dividends is not None and len(eodhd_dividends) and len(yf_dividends):
+        # 배당: 두 배당 이력이 모두 있는 기간 (종료는 가격 이력 마지막 날짜, 최근 배당 누락도 보고)
+        e_div_dates, y_div_dates = _days(eodhd_dividends['Date']), _days(yf_dividends['Date'])
+        if len(e_dates) and len(y_dates):
+            end = min(e_dates[-1], y_dates[-1])
+        else:
+            end = min(e_div_dates.max(), y_div_dates.max())
+        coverage = (max(e_div_dates.min(), y_div_dates.min()), end)
+
+        def same_amount(a, b):
+            codes, _ = tolerances.classify('dividends', 'Dividends', as_float64_array(a), as_float64_array(b),
+                                           exchange, currency)
+            return codes == MATCH
+
+        rows += reconcile_events(
+            'dividend',
+            (e_div_dates, as_float64_array(eodhd_dividends['value']), np.full(len(e_div_dates), 'dividends_file')),
+            (y_div_dates, as_float64_array(yf_dividends['Dividends']), np.full(len(y_div_dates), 'dividends_file')),
+            same_amount, coverage)
+
+    if not rows:
+        return pd.DataFrame(columns=CORPORATE_ACTION_COLUMNS)
+
+    actions = pd.DataFrame(rows, columns=CORPORATE_ACTION_COLUMNS[1:8])
+    actions.insert(0, 'ticker', ticker)
+    return attach_affected_ranges(actions, common, mismatched)
+
+
+def attach_affected_ranges(actions, common, mismatched):
+    """
+    어긋난 이벤트마다 영향 받는 공통 거래일 구간과 설명되는 종가 불일치 수를 계산합니다.
+    date_mismatch는 두 날짜 사이, 그 외는 공통 이력 시작부터 이벤트 전날까지
+    """
+    eodhd_date = actions['eodhd_date'].to_numpy(dtype='datetime64[D]')
+    yf_date = actions['yfinance_date'].to_numpy(dtype='datetime64[D]')
+    event = np.where(np.isnat(eodhd_date), yf_date, np.where(np.isnat(yf_date), eodhd_date,
+                                                             np.maximum(eodhd_date, yf_date)))
+    problem = (actions['status'] != 'matched').to_numpy()
+    shifted = (actions['status'] == 'date_mismatch').to_numpy()
+
+    # 영향 구간 [lo, hi) (공통 거래일 위치)
+    hi = np.searchsorted(common, event, side='left')
+    lo = np.where(shifted, np.searchsorted(common, np.minimum(eodhd_date, yf_date), side='left'), 0)
+    lo, hi = np.where(problem, lo, 0), np.where(problem, hi, 0)
+    has_range = hi > lo
+
+    # 종가 ❌ 날짜는 한 이벤트에만 배정 (겹치는 구간 중복 집계 방지)
+    # 날짜 차이 구간(며칠)에 든 날짜는 그 이벤트, 나머지는 그 뒤의 가장 가까운 어긋난 이벤트
+    explained = np.zeros(len(actions), dtype=np.int64)
+    positions = np.searchsorted(common, mismatched)
+    remaining = np.ones(len(mismatched), dtype=bool)
+    for row in np.flatnonzero(shifted & has_range):
+        inside = remaining & (positions >= lo[row]) & (positions < hi[row])
+        explained[row] = int(inside.sum())
+        remaining &= ~inside
+    owners = np.flatnonzero(problem & ~shifted & has_range)
+    if len(owners) and remaining.any():
+        owners = owners[np.argsort(event[owners], kind='stable')]
+        owner = np.searchsorted(event[owners], mismatched[remaining], side='right')
+        explained += np.bincount(owners[owner[owner < len(owners)]], minlength=len(actions))
+
+    actions['affected_start'] = [str(common[a]) if ok else '' for a, ok in zip(lo, has_range)]
+    actions['affected_end'] = [str(common[b - 1]) if ok else '' for b, ok in zip(hi, has_range)]
+    actions['affected_bars'] = hi - lo
+    actions['explained_mismatches'] = explained
+    for column in ('eodhd_date', 'yfinance_date'):
+        actions[column] = pd.to_datetime(actions[column]).dt.strftime('%Y-%m-%d').fillna('')
+    # 어긋난 이벤트를 설명하는 불일치 수 순으로 먼저, 일치한 이벤트는 마지막
+    actions['matched'] = actions['status'] == 'matched'
+    actions = actions.sort_values(['matched', 'explained_mismatches', 'affected_bars'],
+                                  ascending=[True, False, False], kind='stable', ignore_index=True)
+    return actions.drop(columns=['matched'])
@@ -1,10 +1,37 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import json
 import os
 import glob
+import io
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import nullcontext
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from exporters import EXPORT_FORMATS, REPORT_CSV_COLUMNS, export_results
+from metrics_store import QualityMetricsStore
+from instrumentation import Instrumentation
+from anomaly import ANOMALY_WINDOW, ANOMALY_Z_THRESHOLD, detect_incidents
+from consensus import align_providers
+from corporate_actions import cross_check_actions
+from date_index import DateIndex, make_date_range, resolve_window
+from digests import DIGEST_FIELDS, DigestStore, diff_trees
+from payload_archive import decode_json, read_payload, resolve_payload
+from prewarm import Prewarmer, prewarm_workers
+from providers import BUILTIN_PROVIDERS, ProviderRegistry, builtin_providers, load_providers
+from result_cache import ResultCache
+from sampling import (DEFAULT_SAMPLE_PER_STRATUM, DEFAULT_TARGET_HALF_WIDTH, MAX_SAMPLING_ROUNDS, SAMPLING_FIELDS,
+                      StratifiedSampler)
+from statement_store import (STATEMENT_SECTIONS, StatementStore, eodhd_statement_frame, period_values,
+                             yfinance_statement_frame)
+from timeseries_store import TimeSeriesStore
+from tolerance import MATCH, MATCH_SYMBOLS, ToleranceRules, as_float64_array, load_tolerance_rules
+from trading_calendar import BAR_CATEGORIES, ExchangeCalendar, check_bars, ticker_exchange
 
 # 페이지 설정
 st.set_page_config(
@@ -67,6 +94,96 @@ all_fields_mapping = {
     'freeCashFlow': {'section': 'Cash_Flow', 'display': 'Free Cash Flow', 'yf_key': 'Free Cash Flow'},
 }
 
+# 보고서 템플릿 (프로세스당 한 번 컴파일)
+report_env = Environment(
+    loader=FileSystemLoader(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')),
+    autoescape=select_autoescape(['html']),
+    trim_blocks=True,
+    lstrip_blocks=True
+)
+final_report_template = report_env.get_template('final_report.html')
+
+# 화면 미리보기에 표시할 최대 행 수 / 렌더링 버퍼 크기 (템플릿 이벤트 단위)
+REPORT_PREVIEW_ROWS = 200
+REPORT_BUFFER_SIZE = 256
+
+MATCH_COLORS = {'✅': '#28a745', '⚠️': '#ffc107', '❌': '#dc3545'}
+
+# 결과 테이블 표시 컬럼 / 페이지 크기
+RESULT_DISPLAY_COLUMNS = {
+    'date': '날짜',
+    'field': '항목',
+    'category': '구분',
+    'eodhd_value': 'EODHD 값',
+    'yfinance_value': 'yfinance 값',
+    'match': '일치 여부',
+    'difference': '차이',
+    'existing_cause': '차이 원인',
+}
+RESULT_NUMERIC_COLUMNS = {'EODHD 값', 'yfinance 값', '차이'}
+
+# 결과 구분 (category 키가 없는 결과는 값 비교)
+RESULT_CATEGORY_LABELS = {'value': '값 비교', **BAR_CATEGORIES}
+RESULT_PAGE_SIZES = [50, 100, 500, 1000]
+
+# 공유 캐시에 보관할 최대 파일 수
+MAX_CACHED_FILES = 512
+
+# 공유 캐시에 보관할 최대 다중 출처 정렬 수 ((종목, 데이터 유형, 출처 목록)별)
+MAX_CACHED_ALIGNMENTS = 64
+
+# compare_detailed_data가 지원하는 데이터 유형
+COMPARISON_DATA_TYPES = ['historical_ohlc', 'dividends', 'fundamentals']
+
+# 검증할 데이터 수 기본값 (사이드바 슬라이더, 캐시 예열)
+DEFAULT_NUM_RECORDS = 10
+
+# 사이드바 최근 기간 선택지 (이동 기간 -> 표시 이름)
+RECENT_PERIODS = {'1M': '최근 1개월', '3M': '최근 3개월', '6M': '최근 6개월', '1Y': '최근 1년', '3Y': '최근 3년'}
+
+# 캐시 예열 진행 상황 사이드바 갱신 주기 (초)
+PREWARM_REFRESH_SECONDS = 2
+
+# _detailed_compare 항목 유형 -> 허용 오차 규칙의 (데이터 유형, 항목). 그 외 유형은 가격 항목 이름
+FIELD_TYPE_DATA_TYPES = {'financial': 'fundamentals', 'dividend': 'dividends'}
+FIELD_TYPE_FIELDS = {'financial': None, 'dividend': 'Dividends'}
+
+# 비교 로직이 바뀌면 올려서 저장된 비교 결과(result_cache)를 모두 무효화
+ENGINE_VERSION = 2
+
+# 가격/배당 CSV의 메모리 스키마 ((출처, 데이터 유형)별)
+# columns: 읽을 컬럼 (EODHD 파일의 이름 없는 인덱스 컬럼 등은 제외)
+# date_column: 로드 시 한 번만 거래일(datetime64, UTC 오프셋이 있으면 현지 날짜)로 변환하여 'Date' 컬럼으로 보관
+# float32_columns: 값 범위가 FLOAT32_PRICE_LIMIT 미만이고 float32 -> 최단 10진 표현으로 원본이 복원되면 float32로 보관
+# trading_date_column: 'YYYY-MM-DD HH:MM:SS±HH:MM' 문자열을 거래소 현지 거래일(datetime64)로 변환
+# volume_column: 결측이 없으면 int64로 보관
+FRAME_SCHEMAS = {
+    ('eodhd', 'historical_ohlc'): {
+        'columns': ['date', 'open', 'high', 'low', 'close', 'adjusted_close', 'volume'],
+        'date_column': 'date',
+        'float32_columns': ['open', 'high', 'low', 'close', 'adjusted_close'],
+        'volume_column': 'volume',
+    },
+    ('yfinance', 'historical_ohlc'): {
+        'columns': ['Date', 'Open', 'High', 'Low', 'Close', 'Volume', 'Dividends', 'Stock Splits'],
+        'trading_date_column': 'Date',
+        'float32_columns': ['Open', 'High', 'Low', 'Close', 'Dividends', 'Stock Splits'],
+        'volume_column': 'Volume',
+    },
+    ('eodhd', 'dividends'): {
+        'columns': ['date', 'value', 'dividend', 'unadjustedValue', 'currency'],
+        'date_column': 'date',
+    },
+    ('yfinance', 'dividends'): {
+        'columns': ['Date', 'Dividends', 'dividends'],
+        'trading_date_column': 'Date',
+    },
+}
+
+# float32 표현 오차(절대값 2**-24 배)가 가격 허용 오차 0.01의 1% 이하로 유지되는 최대 절대값
+FLOAT32_PRICE_LIMIT = 2 ** 10
+
+
 def get_mapped_value(df, mapping, provider="yf"):
     key = mapping.get(f"{provider}_key")
     if key and key in df.columns:
@@ -76,39 +193,201 @@ def get_mapped_value(df, mapping, provider="yf"):
 
 
 
+def file_signature(file_path):
+    """파일 변경 감지용 시그니처 (수정 시각, 크기). 파일이 없으면 None"""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+# 월별 일수 (평년)
+_DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+
+def parse_trading_dates(values):
+    """
+    yfinance 날짜 문자열 ('YYYY-MM-DD HH:MM:SS±HH:MM', 거래소 현지 시각)을 거래일(datetime64[ns])로 변환
+    앞 10바이트를 고정 위치 숫자로 직접 계산하고, 형식이 다른 행만 pd.to_datetime으로 처리합니다.
+    """
+    values = pd.Series(values)
+    try:
+        raw = values.to_numpy(dtype='S10')
+    except (UnicodeEncodeError, TypeError, ValueError):
+        raw = None
+
+    if raw is None or len(raw) == 0:
+        valid = np.zeros(len(values), dtype=bool)
+        days = np.zeros(len(values), dtype=np.int64)
+    else:
+        digits = raw.view(np.uint8).reshape(-1, 10).astype(np.int64) - ord('0')
+        number = digits[:, [0, 1, 2, 3, 5, 6, 8, 9]]
+        year = number[:, 0] * 1000 + number[:, 1] * 100 + number[:, 2] * 10 + number[:, 3]
+        month = number[:, 4] * 10 + number[:, 5]
+        day = number[:, 6] * 10 + number[:, 7]
+
+        valid = (((number >= 0) & (number <= 9)).all(axis=1)
+                 & (digits[:, 4] == ord('-') - ord('0')) & (digits[:, 7] == ord('-') - ord('0'))
+                 & (month >= 1) & (month <= 12) & (day >= 1))
+        leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+        month_days = _DAYS_IN_MONTH[np.clip(month, 1, 12) - 1] + (leap & (month == 2))
+        valid &= day <= month_days
+
+        # 그레고리력 날짜 -> 1970-01-01 기준 일수
+        shifted_year = year - (month <= 2)
+        era = shifted_year // 400
+        year_of_era = shifted_year - era * 400
+        day_of_year = (153 * ((month + 9) % 12) + 2) // 5 + day - 1
+        day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+        days = era * 146097 + day_of_era - 719468
+
+    dates = pd.Series(np.where(valid, days, 0).astype('datetime64[D]').astype('datetime64[ns]'), index=values.index)
+    if not valid.all():
+        # 형식이 다른 행: 공백 앞 날짜 부분만 일반 파서로 변환
+        fallback = values[~valid].astype(str).str.split().str[0]
+        dates[~valid] = pd.to_datetime(fallback, format='mixed', errors='coerce').dt.normalize()
+    return dates
+
+
+def float32_round_trips(values):
+    """float64 배열을 float32로 바꾼 뒤 최단 10진 표현(as_float64)으로 되돌렸을 때 원본과 정확히 같은지"""
+    restored = values.astype(np.float32).astype(str).astype(np.float64)
+    return np.array_equal(restored, values, equal_nan=True)
+
+
+def apply_frame_schema(df, schema):
+    """로드된 가격/배당 프레임에 메모리 스키마 적용 (날짜 1회 변환, float32/정수 다운캐스트)"""
+    date_column = schema.get('date_column')
+    if date_column and date_column in df.columns:
+        values = df.pop(date_column)
+        if isinstance(values.dtype, pd.DatetimeTZDtype):
+            values = values.dt.tz_localize(None)
+        # 문자열은 거래일 파서로 변환 ('YYYY-MM-DD HH:MM:SS±HH:MM'처럼 UTC 오프셋이 섞여 있어도 현지 날짜 유지)
+        dates = values.dt.normalize() if values.dtype.kind == 'M' else parse_trading_dates(values)
+        df.insert(0, 'Date', dates)
+        if dates.isna().any():
+            df = df[dates.notna()].reset_index(drop=True)
+
+    trading_date_column = schema.get('trading_date_column')
+    if trading_date_column and trading_date_column in df.columns:
+        dates = parse_trading_dates(df[trading_date_column])
+        df[trading_date_column] = dates
+        if dates.isna().any():
+            df = df[dates.notna()].reset_index(drop=True)
+
+    for column in schema.get('float32_columns', []):
+        if column in df.columns and df[column].dtype == np.float64:
+            values = df[column].to_numpy()
+            peak = np.nanmax(np.abs(values)) if len(values) and not np.isnan(values).all() else 0.0
+            # 최단 10진 표현을 거쳐 원본 값이 그대로 복원되는 열만 float32로 보관 (자릿수가 긴 값은 float64 유지)
+            if peak < FLOAT32_PRICE_LIMIT and float32_round_trips(values):
+                df[column] = values.astype(np.float32)
+
+    volume_column = schema.get('volume_column')
+    if volume_column in df.columns and df[volume_column].dtype.kind == 'f' and df[volume_column].notna().all():
+        df[volume_column] = df[volume_column].astype(np.int64)
+
+    return df
+
+
+def as_float64(value):
+    """숫자 변환 (float32 값은 최단 10진 표현을 거쳐 CSV 원본 값을 복원)"""
+    if isinstance(value, np.float32):
+        return float(str(value))
+    return float(value)
+
+
+def as_float64_values(values):
+    """비교 값 목록 -> (float64 배열, 숫자로 바꿀 수 없는 위치). 빈 값/NaN은 0으로 봄"""
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'fiu':
+        numbers = as_float64_array(values)
+        return np.where(np.isnan(numbers), 0.0, numbers), np.zeros(len(numbers), dtype=bool)
+
+    numbers = np.zeros(len(values))
+    invalid = np.zeros(len(values), dtype=bool)
+    for i, value in enumerate(values):
+        try:
+            numbers[i] = as_float64(value) if value != '' and pd.notna(value) else 0
+        except (ValueError, TypeError):
+            invalid[i] = True
+    return numbers, invalid
+
+
 class IssueTracker:
     def __init__(self):
         self.issues_file = "data_issues.json"
+        self._lock = threading.RLock()
+        self._signature = None
         self.load_issues()
 
     def load_issues(self):
         """저장된 이슈 로드"""
-        if os.path.exists(self.issues_file):
-            try:
-                with open(self.issues_file, 'r', encoding='utf-8') as f:
-                    self.issues = json.load(f)
-            except json.JSONDecodeError:
+        with self._lock:
+            self._signature = file_signature(self.issues_file)
+            if os.path.exists(self.issues_file):
+                try:
+                    with open(self.issues_file, 'r', encoding='utf-8') as f:
+                        self.issues = json.load(f)
+                except json.JSONDecodeError:
+                    self.issues = {}
+            else:
                 self.issues = {}
-        else:
-            self.issues = {}
+
+    def refresh(self):
+        """다른 세션/프로세스가 이슈 파일을 변경한 경우에만 다시 로드"""
+        if file_signature(self.issues_file) != self._signature:
+            self.load_issues()
 
     def save_issues(self):
         """이슈 저장"""
-        with open(self.issues_file, 'w', encoding='utf-8') as f:
-            json.dump(self.issues, f, ensure_ascii=False, indent=2)
+        with self._lock:
+            tmp_file = f"{self.issues_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.issues, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.issues_file)
+            self._signature = file_signature(self.issues_file)
 
     def add_issue(self, ticker, field, issue_data):
         """이슈 추가/업데이트"""
-        if ticker not in self.issues:
-            self.issues[ticker] = {}
-
-        issue_key = f"{field}_{issue_data.get('date', 'general')}"
-        self.issues[ticker][issue_key] = {
-            **issue_data,
-            'updated_at': datetime.now().isoformat(),
-            'status': issue_data.get('status', 'open')
-        }
-        self.save_issues()
+        with self._lock:
+            self.refresh()
+            if ticker not in self.issues:
+                self.issues[ticker] = {}
+
+            issue_key = f"{field}_{issue_data.get('date', 'general')}"
+            self.issues[ticker][issue_key] = {
+                **issue_data,
+                'updated_at': datetime.now().isoformat(),
+                'status': issue_data.get('status', 'open')
+            }
+            self.save_issues()
+
+    def get_issues(self, ticker=None):
+        """이슈 조회"""
+        self.refresh()
+        if ticker:
+            return self.issues.get(ticker, {})
+        return self.issues
+
+
+class IssueSnapshot:
+    """
+    이슈 읽기 전용 스냅샷 (배치 보고서 작업 프로세스용)
+    실행 시작 시점의 이슈를 그대로 사용하므로 실행 중 파일이 바뀌어도 모든 종목이 같은 이슈 기준으로 작성됩니다.
+    """
+
+    def __init__(self, issues):
+        self.issues = issues
+
+    def load_issues(self):
+        pass
+
+    def refresh(self):
+        pass
+
+    def add_issue(self, ticker, field, issue_data):
+        raise RuntimeError("이슈 스냅샷은 읽기 전용입니다.")
 
     def get_issues(self, ticker=None):
         """이슈 조회"""
@@ -119,9 +398,32 @@ class IssueTracker:
 
 class DataComparator:
     def __init__(self):
-        self.eodhd_dir = './data'
-        self.yfinance_dir = './yfinance_data'
+        # 출처 등록부: 기본 출처(eodhd, yfinance) + 설정 파일(providers.json)의 추가 출처
+        self.providers = ProviderRegistry(builtin_providers())
+        extra_providers, self.provider_error = load_providers()
+        for provider in extra_providers:
+            self.providers.register(provider)
+        # 허용 오차 규칙: 기본 규칙 + 설정 파일(tolerances.json)의 시장별 조정
+        extra_rules, self.tolerance_error = load_tolerance_rules()
+        self.tolerances = ToleranceRules(extra_rules)
         self.issue_tracker = IssueTracker()
+        self.metrics_store = QualityMetricsStore()
+        self.instrumentation = Instrumentation(enabled=os.environ.get('DQ_INSTRUMENTATION') == '1')
+        self.digest_store = DigestStore()
+        self.series_store = TimeSeriesStore()
+        self.statement_store = StatementStore()
+        self.result_cache = ResultCache(enabled=os.environ.get('DQ_RESULT_CACHE', '1') != '0')
+        self._calendar_cache = {}
+        # 다중 출처 정렬 캐시: (종목, 데이터 유형, 출처 목록) -> (파일 시그니처, ProviderAlignment)
+        self._alignment_cache = OrderedDict()
+        # 날짜 색인 캐시: (종목, 데이터 유형, 출처) -> (프레임, DateIndex). 프레임이 다시 로드되면 새로 만듦
+        self._index_cache = OrderedDict()
+        self.holdings_file = 'URTH_holdings_edit.csv'
+
+        # 파싱된 파일 캐시: 경로 -> (시그니처, 데이터). 파일이 바뀌면 해당 항목만 다시 읽음
+        self._file_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._ticker_list_cache = None
 
         self.exchange_mapping = {
             'United States-NASDAQ': 'US',
@@ -161,10 +463,52 @@ class DataComparator:
             "기타"
         ]
 
+    @property
+    def eodhd_dir(self):
+        return self.providers.get('eodhd').base_dir
+
+    @eodhd_dir.setter
+    def eodhd_dir(self, value):
+        self.providers.get('eodhd').base_dir = value
+
+    @property
+    def yfinance_dir(self):
+        return self.providers.get('yfinance').base_dir
+
+    @yfinance_dir.setter
+    def yfinance_dir(self, value):
+        self.providers.get('yfinance').base_dir = value
+
     def get_ticker_list(self):
-        """CSV에서 티커 목록 추출"""
+        """CSV에서 티커 목록 추출 (보유종목 파일이 바뀌지 않으면 캐시 사용)"""
+        signature = file_signature(self.holdings_file)
+        cached = self._ticker_list_cache
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        ticker_list, weights, currencies = self._read_ticker_list()
+        if ticker_list:
+            self._ticker_list_cache = (signature, ticker_list, weights, currencies)
+        return ticker_list
+
+    def ticker_weights(self):
+        """종목별 지수 비중 {종목: Weight (%)} (보유종목 파일 기준)"""
+        self.get_ticker_list()
+        cached = self._ticker_list_cache
+        return cached[2] if cached is not None else {}
+
+    def ticker_market(self, ticker):
+        """허용 오차 규칙 선택 키 (거래소 코드, 시장 통화). 유니버스 밖 종목은 통화 None"""
+        if not ticker:
+            return '', None
+        self.get_ticker_list()
+        cached = self._ticker_list_cache
+        return ticker_exchange(ticker), cached[3].get(ticker) if cached is not None else None
+
+    def _read_ticker_list(self):
+        """보유종목 CSV 파싱 -> (종목 목록, {종목: 비중}, {종목: 시장 통화})"""
         try:
-            df = pd.read_csv('URTH_holdings_edit.csv')
+            df = pd.read_csv(self.holdings_file)
             equity_df = df[df['Asset Class'] == 'Equity']
             equity_df['Weight (%)'] = equity_df['Weight (%)'].astype(float)
             top_stocks = equity_df.groupby('Exchange').apply(
@@ -172,12 +516,16 @@ class DataComparator:
             ).reset_index(drop=True)
 
             full_tickers = []
+            weights = {}
+            currencies = {}
             for _, row in top_stocks.iterrows():
                 key = f"{row['Location']}-{row['Exchange']}"
                 code = self.exchange_mapping.get(key, None)
                 if code:
                     full_ticker = f"{row['Ticker']}.{code}"
                     full_tickers.append((full_ticker, row['Exchange'], row['Location']))
+                    weights[full_ticker] = float(row['Weight (%)'])
+                    currencies[full_ticker] = row.get('Market Currency')
 
             # 특정 티커 추가
             specific_tickers = []
@@ -186,134 +534,575 @@ class DataComparator:
                     full_tickers.append((ticker, 'NASDAQ or NYSE' if '.US' in ticker else 'HKG',
                                          'United States' if '.US' in ticker else 'Hong Kong'))
 
-            return sorted(full_tickers, key=lambda x: x[0])
+            return sorted(full_tickers, key=lambda x: x[0]), weights, currencies
         except Exception as e:
             st.error(f"티커 목록 로드 오류: {e}")
-            return []
+            return [], {}, {}
 
     def load_data(self, ticker, data_type, source='both'):
-        """데이터 로드"""
-        results = {}
-
-        eodhd_ticker = ticker
-        yf_ticker = ticker.replace('.US', '') if '.US' in ticker else ticker
-        yf_ticker = yf_ticker.replace('.LSE', '.L') if '.LSE' in yf_ticker else yf_ticker
-
-        if source in ['both', 'eodhd']:
-            eodhd_file = self._get_file_path('eodhd', eodhd_ticker, data_type)
-            if os.path.exists(eodhd_file):
-                results['eodhd'] = self._load_file(eodhd_file, data_type)
-
-        if source in ['both', 'yfinance']:
-            yf_file = self._get_file_path('yfinance', yf_ticker, data_type)
-            if os.path.exists(yf_file):
-                results['yfinance'] = self._load_file(yf_file, data_type)
+        """데이터 로드 (source: 출처 이름, 'both' = eodhd + yfinance, 'all' = 등록된 전체 출처)"""
+        if source == 'both':
+            sources = list(BUILTIN_PROVIDERS)
+        elif source == 'all':
+            sources = self.providers.names()
+        else:
+            sources = [source]
 
+        results = {}
+        for name in sources:
+            file_path = resolve_payload(self.source_file_path(ticker, data_type, name))
+            if os.path.exists(file_path):
+                results[name] = self._load_file(file_path, data_type, name)
         return results
 
-    def _get_file_path(self, source, ticker, data_type):
-        """파일 경로 생성"""
-        base_dir = self.eodhd_dir if source == 'eodhd' else self.yfinance_dir
+    def source_file_path(self, ticker, data_type, source):
+        """출처별 파일 경로 (출처 표기로 티커 변환, 예: yfinance는 '.US' 제거, '.LSE' -> '.L')"""
+        provider = self.providers.get(source)
+        return provider.file_path(provider.symbol(ticker), data_type)
 
-        # 파일명 매핑
-        if source == 'eodhd':
-            file_names = {
-                'income_statement': f'income_statement_{ticker}.json',
-                'balance_sheet': f'balance_sheet_{ticker}.json',
-                'cash_flow': f'cash_flow_{ticker}.json',
-                'historical_ohlc': f'historical_ohlc_{ticker}.csv',
-                'dividends': f'dividends_{ticker}.csv',
-                'fundamentals': f'fundamentals_{ticker}.json'
-            }
-        else:
-            file_names = {
-                'income_statement': f'income_statement_{ticker}.csv',
-                'balance_sheet': f'balance_sheet_{ticker}.csv',
-                'cash_flow': f'cash_flow_{ticker}.csv',
-                'historical_ohlc': f'historical_ohlc_{ticker}.csv',
-                'dividends': f'dividends_{ticker}.csv',
-                'fundamentals': f'fundamentals_{ticker}.json'
-            }
+    def _get_file_path(self, source, ticker, data_type):
+        """파일 경로 생성 (ticker는 이미 출처 표기)"""
+        return self.providers.get(source).file_path(ticker, data_type)
 
-        file_name = file_names.get(data_type)
-        if not file_name:
-            # 기본값으로 티커 파일명 사용
-            file_name = f'data_{ticker}.json'
+    def series_signature(self, file_path, data_type, source=None):
+        """파일 시그니처 (append 시계열은 델타 세그먼트 포함)"""
+        if self.series_store.layout(source, data_type) is None:
+            return file_signature(file_path)
+        return self.series_store.signature(file_path)
 
-        return os.path.join(base_dir, file_name)
+    def _load_file(self, file_path, data_type, source=None, segmented=True):
+        """
+        파일 로드 (세션 간 공유 캐시)
+        반환된 객체는 여러 세션이 공유하므로 호출자는 수정하지 말고 필요한 경우 복사해서 사용해야 합니다.
+        델타 세그먼트가 있는 시계열은 기본 파일과 세그먼트를 파일별로 캐시하므로 새 세그먼트만 읽습니다.
+        """
+        signature = self.series_signature(file_path, data_type, source) if segmented else file_signature(file_path)
+        has_segments = signature is not None and len(signature) > 2
+        # 합친 시계열은 세그먼트 디렉터리 경로로 캐시 (기본 파일 경로는 기본 파일 단독 항목)
+        cache_key = self.series_store.segment_dir(file_path) if has_segments else file_path
+        with self._cache_lock:
+            cached = self._file_cache.get(cache_key)
+            if cached is not None and cached[0] == signature:
+                self._file_cache.move_to_end(cache_key)
+                self.instrumentation.count('cache.hits')
+                return cached[1]
+
+        self.instrumentation.count('cache.misses')
+        if has_segments:
+            data = self._read_segmented(file_path, data_type, source)
+        else:
+            data = self._read_file(file_path, data_type, source)
+
+        if data is not None and signature is not None:
+            with self._cache_lock:
+                self._file_cache[cache_key] = (signature, data)
+                self._file_cache.move_to_end(cache_key)
+                while len(self._file_cache) > MAX_CACHED_FILES:
+                    self._file_cache.popitem(last=False)
+        return data
+
+    def _read_segmented(self, file_path, data_type, source):
+        """기본 파일 + 델타 세그먼트를 하나의 시계열로 읽기"""
+        layout = self.series_store.layout(source, data_type)
+        if layout[0] != 'rows':
+            content = self.series_store.read(file_path, layout)
+            return decode_json(content) if file_path.endswith('.json') else pd.read_csv(io.BytesIO(content))
+
+        frames = []
+        for part in [file_path] + self.series_store.segment_paths(file_path):
+            # 세그먼트는 기본 파일과 같은 형식이므로 같은 스키마로 읽음
+            frame = self._load_file(part, data_type, source, segmented=False)
+            if frame is None:
+                return None
+            frames.append(frame)
+        return pd.concat(frames, ignore_index=True)
+
+    def invalidate_cache(self, file_path=None):
+        """파일 캐시 무효화 (경로 미지정 시 전체)"""
+        with self._cache_lock:
+            if file_path is None:
+                self._file_cache.clear()
+                self._ticker_list_cache = None
+                self.statement_store.clear()
+                self.result_cache.clear()
+                self._alignment_cache.clear()
+                self._index_cache.clear()
+            else:
+                self._file_cache.pop(file_path, None)
+                self._file_cache.pop(self.series_store.segment_dir(file_path), None)
+        self.issue_tracker.load_issues()
 
-    def _load_file(self, file_path, data_type):
-        """파일 로드"""
+    def _read_file(self, file_path, data_type, source=None):
+        """파일 읽기 (가격/배당 CSV는 FRAME_SCHEMAS 적용, JSON은 압축 보관 파일 포함)"""
         try:
-            if file_path.endswith('.csv'):
-                return pd.read_csv(file_path)
-            else:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+            with self.instrumentation.span('io.read_file'):
+                self.instrumentation.count('files_read')
+                self.instrumentation.add_bytes_read(file_path)
+                if file_path.endswith('.csv'):
+                    schema = FRAME_SCHEMAS.get((source, data_type)) or self.providers.schema(source, data_type)
+                    if schema is None:
+                        return pd.read_csv(file_path)
+                    columns = set(schema['columns'])
+                    df = pd.read_csv(file_path, usecols=lambda column: column in columns)
+                    with self.instrumentation.span('normalize.dates'):
+                        return apply_frame_schema(df, schema)
+                else:
+                    return read_payload(file_path)
         except Exception as e:
             st.error(f"파일 로드 오류 ({file_path}): {e}")
             return None
 
-    def get_ohlc_compare_data(self, eodhd_df, yf_df, num_records, ticker, order_type: str = 'ascending') -> list:
+    def get_ohlc_compare_data(self, eodhd_df, yf_df, num_records, ticker, order_type: str = 'ascending',
+                              indexes=None, window=(None, None)) -> list:
+        """
+        가격 비교 (ascending: yfinance 기준 처음 num_records개 날짜, descending: 양쪽 최근 num_records개 날짜 중 공통)
+        indexes: (EODHD, yfinance) DateIndex, window: (시작일, 종료일) 구간 안에서만 선택 (num_records가 None이면 구간 전체)
+        descending은 ascending 구간과 겹치는 날짜를 제외 (구간이 짧으면 두 구간이 겹쳐 같은 행이 두 번 나오지 않도록)
+        """
+        eodhd_index, yf_index = indexes or (DateIndex.from_frame(eodhd_df), DateIndex.from_frame(yf_df))
+
+        if order_type == 'ascending':
+            # yfinance 기준으로 초기 날짜 num_records 개 추출 후 EODHD에도 있는 날짜
+            yf_part = yf_index.head(num_records, *window)
+            dates = yf_index.dates[yf_part]
+            yf_positions = np.arange(yf_part.start, yf_part.stop)
+            eodhd_positions = eodhd_index.locate(dates)
+        else:
+            # 양쪽 최근 num_records 개 중 공통 날짜 (최신 순)
+            eodhd_part = eodhd_index.tail(num_records, *window)
+            dates = eodhd_index.dates[eodhd_part][::-1]
+            eodhd_positions = np.arange(eodhd_part.start, eodhd_part.stop)[::-1]
+            yf_positions = yf_index.locate(dates, yf_index.tail(num_records, *window))
+            yf_positions[np.isin(dates, yf_index.dates[yf_index.head(num_records, *window)])] = -1
+
+        found = (eodhd_positions >= 0) & (yf_positions >= 0)
+        dates = dates[found]
+        eodhd_rows = eodhd_df.iloc[eodhd_index.rows[eodhd_positions[found]]]
+        yf_rows = yf_df.iloc[yf_index.rows[yf_positions[found]]]
+
+        # 💡 비교 대상 행만 수정주가로 변환합니다. (공유 캐시의 원본 프레임은 수정하지 않음)
+        eodhd_rows = self._split_adjust(eodhd_rows)
+
+        with self.instrumentation.span('issues.lookup'):
+            existing_issues = self.issue_tracker.get_issues(ticker)
+
+        fields = [field for field in ['Open', 'High', 'Low', 'Close', 'Volume']
+                  if (field.lower() in eodhd_rows.columns or field in eodhd_rows.columns) and field in yf_rows.columns]
+        columns = {}
+        for field in fields:
+            eodhd_values = eodhd_rows[field.lower() if field.lower() in eodhd_rows.columns else field].to_numpy()
+            yf_values = yf_rows[field].to_numpy()
+            # 항목별로 기간의 모든 날짜를 한 번에 판정
+            columns[field] = (eodhd_values, yf_values, self._judge_values(eodhd_values, yf_values, field, ticker))
 
         comparison_results = []
+        for i, date_str in enumerate(np.datetime_as_string(dates, unit='D').tolist()):
+            for field in fields:
+                eodhd_values, yf_values, judged = columns[field]
+                eodhd_val, yf_val = eodhd_values[i], yf_values[i]
+                match_result, difference = judged[i]
 
-        # 💡 EODHD 데이터에 Adjusted_close 값이 있는 경우, OHLC 값을 수정주가로 변환합니다.
-        if 'adjusted_close' in eodhd_df.columns:
-            eodhd_df['split_factor'] = eodhd_df['close'] / eodhd_df['adjusted_close']
-            eodhd_df['open'] = eodhd_df['open'] / eodhd_df['split_factor']
-            eodhd_df['high'] = eodhd_df['high'] / eodhd_df['split_factor']
-            eodhd_df['low'] = eodhd_df['low'] / eodhd_df['split_factor']
-            eodhd_df['close'] = eodhd_df['close'] / eodhd_df['split_factor']
+                issue_key = f"{field}_{date_str}"
+                existing_cause = existing_issues.get(issue_key, {}).get('cause', '')
 
-        filter_eodhd_df = pd.DataFrame()
-        filter_yf_df = pd.DataFrame()
+                comparison_results.append({
+                    'date': date_str, 'field': field, 'eodhd_value': self._format_value(eodhd_val, field),
+                    'yfinance_value': self._format_value(yf_val, field), 'match': match_result,
+                    'difference': difference, 'existing_cause': existing_cause, 'ticker': ticker
+                })
 
-        if order_type == 'ascending':
-            # yfinance 기준으로 초기 날짜 num_records 개 추출
-            filter_yf_df = yf_df.sort_values('Date', ascending=True).head(num_records)
+        return comparison_results
+
+    @staticmethod
+    def _split_adjust(eodhd_df):
+        """EODHD 데이터에 adjusted_close 값이 있는 경우 OHLC 값을 수정주가로 변환한 새 프레임 반환"""
+        if 'adjusted_close' not in eodhd_df.columns:
+            return eodhd_df
+
+        # float32 컬럼은 10진 표현을 거쳐 float64로 복원한 뒤 계산 (비교 대상 행만이므로 비용이 작음)
+        prices = eodhd_df[['open', 'high', 'low', 'close', 'adjusted_close']].apply(
+            lambda column: column.astype(str).astype(np.float64) if column.dtype == np.float32 else column
+        )
+        split_factor = prices['close'] / prices['adjusted_close']
+        return eodhd_df.assign(
+            split_factor=split_factor,
+            open=prices['open'] / split_factor,
+            high=prices['high'] / split_factor,
+            low=prices['low'] / split_factor,
+            close=prices['close'] / split_factor,
+        )
 
-            # yfinance에서 추출한 날짜 리스트를 사용하여 EODHD 데이터 필터링
-            yf_dates = filter_yf_df['Date'].tolist()
-            filter_eodhd_df = eodhd_df[eodhd_df['Date'].isin(yf_dates)]
+    def compare_detailed_data(self, ticker, data_type='historical_ohlc', num_records=10, sample_per_stratum=None,
+                              seed=None, date_range=None):
+        """
+        상세 데이터 비교 (보고서용)
+        sample_per_stratum을 지정하면 처음/최근 num_records개 대신 (연도, 항목) 층화 무작위 표본을 비교합니다.
+        date_range(DateRange)를 지정하면 가격/배당은 그 기간 안에서 처음/최근 num_records개를 비교합니다.
+        (num_records가 None이면 기간 전체, 재무 데이터는 기간과 관계없이 최신 분기)
+        """
+        if sample_per_stratum and data_type in SAMPLING_FIELDS:
+            report, errors = self.estimate_quality([ticker], [data_type], sample_per_stratum, seed=seed)
+            if errors:
+                return None, errors[0][2]
+            return report.results, None
+
+        with self.instrumentation.span(f'compare.{data_type}'):
+            if not self.result_cache.enabled:
+                return self._compare_detailed_data(ticker, data_type, num_records, date_range)
+
+            # 입력 파일/기존 이슈가 같으면 저장된 결과 사용 (세션/프로세스 간 공유)
+            key = self.comparison_key(ticker, data_type, num_records, date_range)
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                self.instrumentation.count('result_cache.hits')
+                return cached, None
+
+            self.instrumentation.count('result_cache.misses')
+            results, error = self._compare_detailed_data(ticker, data_type, num_records, date_range)
+            if error is None and results is not None:
+                self.result_cache.put(key, results)
+            return results, error
+
+    def comparison_key(self, ticker, data_type, num_records=10, date_range=None):
+        """compare_detailed_data 결과 식별 키 (입력 파일 시그니처, 기존 이슈, 엔진 버전 해시)"""
+        # 기간은 지정한 경우에만 포함 (전체 이력 비교의 기존 캐시 키 유지)
+        window = () if date_range is None else (list(date_range),)
+        return self.result_cache.key('compare_detailed_data', ENGINE_VERSION, self.tolerances.digest,
+                                     ticker, data_type, num_records, *window,
+                                     self.comparison_inputs(ticker, data_type),
+                                     self.issue_tracker.get_issues(ticker))
+
+    def comparison_inputs(self, ticker, data_type):
+        """compare_detailed_data 결과가 의존하는 파일 [(경로, 시그니처)] (결과 캐시 키)"""
+        data_types = [data_type] + (list(STATEMENT_SECTIONS) if data_type == 'fundamentals' else [])
+        inputs = []
+        for input_type in data_types:
+            for source in ('eodhd', 'yfinance'):
+                path = resolve_payload(self.source_file_path(ticker, input_type, source))
+                inputs.append((path, self.series_signature(path, input_type, source)))
+        if data_type == 'historical_ohlc':
+            # 누락/휴장일 봉 검사는 같은 거래소 종목 전체로 만든 거래일 달력을 사용
+            _, paths, signature = self._calendar_members(ticker_exchange(ticker), [ticker])
+            inputs.extend(zip(paths, signature))
+        return inputs
 
+    def aligned_frame(self, ticker, data_type):
+        """두 출처의 공통 거래일로 정렬한 프레임 (표본 비교용, OHLC/배당)"""
+        data = self.load_data(ticker, data_type)
+        eodhd_df, yf_df = data.get('eodhd'), data.get('yfinance')
+        if eodhd_df is None or yf_df is None:
+            return None, "데이터 로드 실패: EODHD 또는 yfinance 파일이 없습니다."
+        if 'Date' not in eodhd_df.columns:
+            return None, "EODHD 데이터에 'date' 또는 'Date' 열이 없습니다."
+        if 'Date' not in yf_df.columns:
+            return None, "yfinance 데이터에 'Date' 열이 없습니다."
+
+        if data_type == 'dividends':
+            eodhd_column = 'value' if 'value' in eodhd_df.columns else 'dividend'
+            yf_column = 'Dividends' if 'Dividends' in yf_df.columns else 'dividends'
+            if eodhd_column not in eodhd_df.columns or yf_column not in yf_df.columns:
+                return None, "배당 금액 필드가 없습니다."
+            left = eodhd_df[['Date', eodhd_column]].rename(columns={eodhd_column: 'dividend'})
+            right = yf_df[['Date', yf_column]].rename(columns={yf_column: 'Dividends'})
         else:
-            filter_eodhd_df = eodhd_df.sort_values('Date', ascending=False).head(num_records)
-            filter_yf_df = yf_df.sort_values('Date', ascending=False).head(num_records)
+            left = eodhd_df[[c for c in ['Date', 'open', 'high', 'low', 'close', 'adjusted_close', 'volume']
+                             if c in eodhd_df.columns]]
+            right = yf_df[[c for c in ['Date', 'Open', 'High', 'Low', 'Close', 'Volume'] if c in yf_df.columns]]
 
-        for _, eodhd_row in filter_eodhd_df.iterrows():
-            date_str = eodhd_row['Date'].strftime('%Y-%m-%d')
+        aligned = left.drop_duplicates('Date').merge(right.drop_duplicates('Date'), on='Date', how='inner')
+        return aligned.sort_values('Date', ignore_index=True), None
 
-            yf_row = filter_yf_df[filter_yf_df['Date'].dt.strftime('%Y-%m-%d') == date_str]
+    def _compare_aligned_rows(self, ticker, data_type, aligned, requests, existing_issues):
+        """
+        공통 거래일 프레임에서 지정된 행만 비교합니다.
+        requests: [(항목, 행 위치 배열), ...] -> 같은 순서의 비교 결과 목록
+        """
+        union = np.unique(np.concatenate([positions for _, positions in requests]))
+        rows = aligned.iloc[union]
+        if data_type != 'dividends':
+            rows = self._split_adjust(rows)
+        date_strs = rows['Date'].dt.strftime('%Y-%m-%d').to_numpy()
+
+        batches = []
+        for field, positions in requests:
+            if data_type == 'dividends':
+                eodhd_field, yf_field, field_type = 'dividend', 'Dividends', 'dividend'
+            else:
+                eodhd_field, yf_field, field_type = field.lower(), field, field
+            if eodhd_field not in rows.columns or yf_field not in rows.columns:
+                batches.append([])
+                continue
+
+            idx = np.searchsorted(union, positions)
+            eodhd_values = rows[eodhd_field].to_numpy()[idx]
+            yf_values = rows[yf_field].to_numpy()[idx]
+            judged = self._judge_values(eodhd_values, yf_values, field_type, ticker)
+            results = []
+            for date_str, eodhd_val, yf_val, (match_result, difference) in zip(date_strs[idx], eodhd_values,
+                                                                               yf_values, judged):
+                results.append({
+                    'date': date_str, 'field': field, 'eodhd_value': self._format_value(eodhd_val, field_type),
+                    'yfinance_value': self._format_value(yf_val, field_type), 'match': match_result,
+                    'difference': difference,
+                    'existing_cause': existing_issues.get(f"{field}_{date_str}", {}).get('cause', ''),
+                    'ticker': ticker
+                })
+            batches.append(results)
+        return batches
+
+    def date_index(self, ticker, data_type, source):
+        """
+        출처 시계열과 정렬된 날짜 색인 -> (프레임, DateIndex) (파일이나 'Date' 열이 없으면 색인은 None)
+        색인은 로드된 프레임마다 한 번만 만들고 파일이 바뀌어 프레임이 다시 로드되면 새로 만듭니다.
+        """
+        frame = self.load_data(ticker, data_type, source).get(source)
+        if frame is None or 'Date' not in frame.columns:
+            return frame, None
+
+        key = (ticker, data_type, source)
+        with self._cache_lock:
+            cached = self._index_cache.get(key)
+            if cached is not None and cached[0] is frame:
+                self._index_cache.move_to_end(key)
+                return frame, cached[1]
+
+        with self.instrumentation.span('date_index.build'):
+            index = DateIndex.from_frame(frame)
+        with self._cache_lock:
+            self._index_cache[key] = (frame, index)
+            self._index_cache.move_to_end(key)
+            while len(self._index_cache) > MAX_CACHED_FILES:
+                self._index_cache.popitem(last=False)
+        return frame, index
+
+    @staticmethod
+    def date_window(date_range, *indexes):
+        """DateRange -> (시작일, 종료일) (이동 기간은 출처들의 마지막 날짜 중 가장 늦은 날 기준)"""
+        latest = max((index.last for index in indexes if index is not None and len(index)), default=None)
+        return resolve_window(date_range, latest)
+
+    def normalized_series(self, ticker, data_type, source):
+        """digest용 정규화 시계열 (Date + DIGEST_FIELDS 컬럼, EODHD OHLC는 수정주가)"""
+        return self._normalize_frame(self.load_data(ticker, data_type, source).get(source), data_type, source)
+
+    def normalized_segments(self, ticker, data_type, source, entries):
+        """델타 세그먼트(시그니처 항목 '이름:첫 날짜')만 읽은 정규화 시계열"""
+        segment_dir = self.series_store.segment_dir(self.source_file_path(ticker, data_type, source))
+        frames = [self._load_file(os.path.join(segment_dir, entry.split(':', 1)[0]), data_type, source,
+                                  segmented=False) for entry in entries]
+        if any(frame is None for frame in frames):
+            return None
+        return self._normalize_frame(pd.concat(frames, ignore_index=True), data_type, source)
 
-            if yf_row.empty: continue
-            yf_row = yf_row.iloc[0]
+    def _normalize_frame(self, df, data_type, source):
+        if df is None or 'Date' not in df.columns:
+            return None
+        if source not in BUILTIN_PROVIDERS:
+            # 추가 출처는 설정 파일의 컬럼 매핑 (가격은 수정주가로 제공된다고 봄)
+            return self.providers.get(source).normalize(df, data_type)
 
-            fields_to_compare = ['Open', 'High', 'Low', 'Close', 'Volume']
-            for field in fields_to_compare:
-                eodhd_field = field.lower() if field.lower() in eodhd_row else field
-                yf_field = field
+        if data_type == 'dividends':
+            column = ('value' if 'value' in df.columns else 'dividend') if source == 'eodhd' else \
+                ('Dividends' if 'Dividends' in df.columns else 'dividends')
+            return df[['Date', column]].rename(columns={column: 'Dividends'}) if column in df.columns else None
 
-                if eodhd_field in eodhd_row and yf_field in yf_row:
-                    eodhd_val = eodhd_row[eodhd_field]
-                    yf_val = yf_row[yf_field]
-                    match_result, difference = self._detailed_compare(eodhd_val, yf_val, field)
+        if source == 'eodhd':
+            df = self._split_adjust(df).rename(columns=str.capitalize)
+        fields = DIGEST_FIELDS[data_type]
+        if any(field not in df.columns for field in fields):
+            return None
+        return df[['Date'] + fields]
 
-                    existing_issues = self.issue_tracker.get_issues(ticker)
-                    issue_key = f"{field}_{date_str}"
-                    existing_cause = existing_issues.get(issue_key, {}).get('cause', '')
+    def digest_units(self, ticker, data_type):
+        """
+        digest 항목별 양자화 단위 [(항목, 단위)] = 종목 거래소/통화에 적용되는 허용 오차 규칙의 match_abs
+        양자화 값이 같으면 차이가 match_abs 미만이므로 ✅입니다. match_abs가 없는 항목은 단위 None (전체 비교)
+        """
+        exchange, currency = self.ticker_market(ticker)
+        units = []
+        for field in DIGEST_FIELDS[data_type]:
+            match_abs = self.tolerances.rule(data_type, field, exchange, currency).match_abs
+            units.append((field, match_abs if np.isfinite(match_abs) and match_abs > 0 else None))
+        return units
+
+    def digest_tree(self, ticker, data_type, source, units=None):
+        """출처별 digest 트리 (원본 파일과 양자화 단위가 그대로면 저장된 트리 사용)"""
+        signature = self.series_signature(self.source_file_path(ticker, data_type, source), data_type, source)
+        if signature is None:
+            return None
+        if units is None:
+            units = self.digest_units(ticker, data_type)
+        tree, rebuilt = self.digest_store.get(
+            source, ticker, data_type, list(signature), [(field, unit) for field, unit in units if unit is not None],
+            lambda: self.normalized_series(ticker, data_type, source),
+            lambda entries: self.normalized_segments(ticker, data_type, source, entries))
+        self.instrumentation.count('digest.rebuilt' if rebuilt else 'digest.reused')
+        return tree
+
+    def verify_digests(self, ticker, data_type):
+        """
+        digest 트리로 두 출처를 비교합니다.
+        같은 연/월 블록은 건너뛰고, digest가 다른 월의 공통 거래일만 값 단위로 비교합니다.
+        양자화 단위를 정할 수 없는 항목(digest_units가 None)은 공통 거래일 전체를 비교합니다.
+        루트 쌍이 이전 검증과 같으면 저장된 결과를 그대로 사용합니다.
+        반환: ({'ticker', 'data_type', 'identical', 'differing_months', 'one_sided_months',
+                'rows_compared', 'results'}, 오류 메시지)
+        """
+        if data_type not in DIGEST_FIELDS:
+            return None, f"digest 검증을 지원하지 않는 데이터 유형입니다: {data_type}"
+
+        with self.instrumentation.span('verify.digests'):
+            units = self.digest_units(ticker, data_type)
+            trees = {source: self.digest_tree(ticker, data_type, source, units) for source in ('eodhd', 'yfinance')}
+            if trees['eodhd'] is None or trees['yfinance'] is None:
+                return None, "데이터 로드 실패: EODHD 또는 yfinance 파일이 없습니다."
+
+            # 허용 오차 규칙이 바뀌면 저장된 검증 결과를 쓰지 않음
+            roots = [trees['eodhd']['root'], trees['yfinance']['root'], self.tolerances.digest]
+            verification = self.digest_store.get_verification(ticker, data_type, roots)
+
+        issues = self.issue_tracker.get_issues(ticker)
+        if verification is None:
+            differing, one_sided = diff_trees(trees['eodhd'], trees['yfinance'])
+            unquantized = [field for field, unit in units if unit is None]
+            verification = {'ticker': ticker, 'data_type': data_type, 'identical': not differing and not one_sided,
+                            'differing_months': differing, 'one_sided_months': one_sided,
+                            'rows_compared': 0, 'results': []}
+            if differing or unquantized:
+                with self.instrumentation.span('verify.compare'):
+                    aligned, error = self.aligned_frame(ticker, data_type)
+                    if error:
+                        return None, error
+                    months = aligned['Date'].dt.strftime('%Y-%m')
+                    positions = np.flatnonzero(months.isin(differing).to_numpy())
+                    every_row = np.arange(len(aligned))
+                    requests = [(field, positions if unit is not None else every_row) for field, unit in units]
+                    requests = [(field, rows) for field, rows in requests if len(rows)]
+                    batches = (self._compare_aligned_rows(ticker, data_type, aligned, requests, issues)
+                               if requests else [])
+                verification['rows_compared'] = int(sum(len(rows) for _, rows in requests))
+                verification['results'] = [row for rows in batches for row in rows if row['match'] != '✅']
+                if any(row['field'] in unquantized for row in verification['results']):
+                    verification['identical'] = False
+            self.digest_store.put_verification(ticker, data_type, roots, verification)
+        else:
+            self.instrumentation.count('digest.verification_reused')
+            # 저장 이후 바뀌었을 수 있는 이슈 원인은 현재 값으로 갱신
+            for row in verification['results']:
+                row['existing_cause'] = issues.get(f"{row['field']}_{row['date']}", {}).get('cause', '')
 
-                    comparison_results.append({
-                        'date': date_str, 'field': field, 'eodhd_value': self._format_value(eodhd_val, field),
-                        'yfinance_value': self._format_value(yf_val, field), 'match': match_result,
-                        'difference': difference, 'existing_cause': existing_cause, 'ticker': ticker
-                    })
+        return verification, None
 
-        return comparison_results
+    def provider_alignment(self, ticker, data_type, providers=None):
+        """
+        여러 출처(생략 시 등록된 전체)를 한 번에 정렬한 ProviderAlignment (OHLC/배당)
+        출처 쌍별 비교와 셀별 합의값은 같은 정렬 결과에서 계산하며, 원본 파일이 그대로면 저장된 정렬을 사용합니다.
+        파일이 없는 출처는 제외하고, 남은 출처가 2개 미만이면 오류를 반환합니다.
+        파일은 있으나 읽기/정규화에 실패한 출처가 있으면 출처를 줄여 비교하지 않고 오류를 반환합니다.
+        """
+        if data_type not in DIGEST_FIELDS:
+            return None, f"다중 출처 비교를 지원하지 않는 데이터 유형입니다: {data_type}"
+        names = list(providers or self.providers.names())
+        unknown = [name for name in names if name not in self.providers]
+        if unknown:
+            return None, f"등록되지 않은 출처: {', '.join(unknown)}"
+
+        signature = tuple(self.series_signature(resolve_payload(self.source_file_path(ticker, data_type, name)),
+                                                data_type, name) for name in names)
+        key = (ticker, data_type, tuple(names))
+        with self._cache_lock:
+            cached = self._alignment_cache.get(key)
+            if cached is not None and cached[0] == signature:
+                self._alignment_cache.move_to_end(key)
+                self.instrumentation.count('alignment.reused')
+                return cached[1], None
+
+        with self.instrumentation.span('align.providers'):
+            frames, failed = {}, []
+            for name in names:
+                frame = self.normalized_series(ticker, data_type, name)
+                if frame is not None:
+                    frames[name] = frame
+                elif os.path.exists(resolve_payload(self.source_file_path(ticker, data_type, name))):
+                    failed.append(name)
+            if failed:
+                return None, f"출처 데이터를 읽지 못했습니다: {', '.join(failed)}"
+            if len(frames) < 2:
+                return None, f"비교할 출처가 2개 미만입니다 (파일 있음: {', '.join(frames) or '-'})"
+            alignment = align_providers(data_type, frames, DIGEST_FIELDS[data_type],
+                                        self.tolerances, *self.ticker_market(ticker))
+
+        with self._cache_lock:
+            self._alignment_cache[key] = (signature, alignment)
+            self._alignment_cache.move_to_end(key)
+            while len(self._alignment_cache) > MAX_CACHED_ALIGNMENTS:
+                self._alignment_cache.popitem(last=False)
+        return alignment, None
+
+    def estimate_quality(self, tickers, data_types=None, per_stratum=DEFAULT_SAMPLE_PER_STRATUM,
+                         target_half_width=DEFAULT_TARGET_HALF_WIDTH, max_rounds=MAX_SAMPLING_ROUNDS, seed=None):
+        """
+        (거래소, 데이터 유형, 연도, 항목) 층화 무작위 표본으로 불일치율을 추정합니다.
+        반환: (SamplingReport, [(ticker, data_type, 오류 메시지), ...])
+        """
+        data_types = [d for d in (data_types or SAMPLING_FIELDS) if d in SAMPLING_FIELDS]
+        sampler = StratifiedSampler(per_stratum, target_half_width, max_rounds, seed)
+        aligned_frames = {}
+        errors = []
+
+        with self.instrumentation.span('sample.populate'):
+            for ticker in tickers:
+                for data_type in data_types:
+                    aligned, error = self.aligned_frame(ticker, data_type)
+                    if error:
+                        errors.append((ticker, data_type, error))
+                        continue
+                    aligned_frames[(ticker, data_type)] = aligned
+                    sampler.add_population(ticker_exchange(ticker), data_type, ticker,
+                                           aligned['Date'].dt.year.to_numpy(), np.arange(len(aligned)))
+
+        issues = self.issue_tracker.get_issues()
+
+        def evaluate(data_type, ticker, requests):
+            return self._compare_aligned_rows(ticker, data_type, aligned_frames[(ticker, data_type)], requests,
+                                              issues.get(ticker, {}))
+
+        with self.instrumentation.span('sample.compare'):
+            report = sampler.run(evaluate)
+        self.instrumentation.count('sample.rows', len(report.results))
+        return report, errors
+
+    def statement_frame(self, ticker, statement, source):
+        """
+        정규화 재무제표 프레임 (없으면 None)
+        EODHD는 재무제표 파일을 읽고, 없으면 펀더멘털 파일의 Financials 섹션을 사용합니다.
+        """
+        path = resolve_payload(self.source_file_path(ticker, statement, source))
+        if source == 'yfinance':
+            def load():
+                return yfinance_statement_frame(ticker, statement, self._read_file(path, statement, source))
+        elif os.path.exists(path):
+            def load():
+                return eodhd_statement_frame(ticker, statement, self._read_file(path, statement, source) or {})
+        else:
+            path = resolve_payload(self.source_file_path(ticker, 'fundamentals', source))
 
-    def compare_detailed_data(self, ticker, data_type='historical_ohlc', num_records=10):
-        """상세 데이터 비교 (보고서용)"""
-        data = self.load_data(ticker, data_type)
+            def load():
+                financials = (self._load_file(path, 'fundamentals', source) or {}).get('Financials') or {}
+                return eodhd_statement_frame(ticker, statement, financials.get(STATEMENT_SECTIONS[statement]) or {})
+
+        signature = file_signature(path)
+        if signature is None:
+            return None
+        return self.statement_store.get(source, ticker, statement, (path, signature), load)
+
+    def statement_values(self, ticker, statement, source, period_type='quarterly', period_end=None):
+        """재무제표 한 기준일(생략 시 최신)의 항목 값 -> (기준일, {항목: float 또는 None})"""
+        return period_values(self.statement_frame(ticker, statement, source), period_type, period_end)
+
+    def _compare_detailed_data(self, ticker, data_type, num_records, date_range=None):
+        with self.instrumentation.span('load_data'):
+            data = self.load_data(ticker, data_type)
 
         if 'eodhd' not in data or 'yfinance' not in data:
             return None, "데이터 로드 실패: EODHD 또는 yfinance 파일이 없습니다."
@@ -324,110 +1113,84 @@ class DataComparator:
         if eodhd_data is None or yf_data is None:
             return None, "데이터 없음: 파일은 존재하나 내용이 비어있습니다."
 
+        # num_records가 0/None이면 기간 전체
+        num_records = num_records or None
         comparison_results = []
 
         if data_type == 'historical_ohlc':
-            eodhd_df = eodhd_data.copy()
-            yf_df = yf_data.copy()
-
-            # EODHD 데이터: 'date' 또는 'Date' 열을 찾아 datetime 타입으로 변환
-            if 'date' in eodhd_df.columns:
-                eodhd_df['Date'] = pd.to_datetime(eodhd_df['date'], errors='coerce')
-            elif 'Date' in eodhd_df.columns:
-                eodhd_df['Date'] = pd.to_datetime(eodhd_df['Date'], errors='coerce')
-            else:
+            # EODHD 'Date'는 로드 시 datetime64로 변환되어 있으므로 복사하지 않음
+            eodhd_df = eodhd_data
+            if 'Date' not in eodhd_df.columns:
                 return None, "EODHD 데이터에 'date' 또는 'Date' 열이 없습니다."
-
-            # yfinance 데이터: 'Date' 열의 문자열에서 시간대 정보를 제거 후 datetime으로 변환
-            if 'Date' in yf_df.columns:
-                # 💡 최종 해결책: 공백을 기준으로 문자열을 분리하여 날짜 부분만 추출
-                yf_df['Date'] = yf_df['Date'].astype(str).str.split().str[0]
-                yf_df['Date'] = pd.to_datetime(yf_df['Date'], errors='coerce')
-
-                # 유효하지 않은 날짜(NaT)가 있는 행 제거
-                yf_df = yf_df.dropna(subset=['Date'])
-            else:
+            # yfinance 'Date'도 로드 시 거래일로 변환됨 (parse_trading_dates)
+            yf_df = yf_data
+            if 'Date' not in yf_df.columns:
                 return None, "yfinance 데이터에 'Date' 열이 없습니다."
 
-            # 두 데이터프레임의 날짜 형식을 'yyyy-mm-dd'로 통일 (시간 정보 제거)
-            eodhd_df['Date'] = eodhd_df['Date'].dt.normalize()
-            yf_df['Date'] = yf_df['Date'].dt.normalize()
+            # 정렬된 날짜 색인 (프레임마다 한 번 생성)에서 기간/처음·최근 구간을 slice로 선택
+            eodhd_df, eodhd_index = self.date_index(ticker, data_type, 'eodhd')
+            yf_df, yf_index = self.date_index(ticker, data_type, 'yfinance')
+            window = self.date_window(date_range, eodhd_index, yf_index)
 
-            eodhd_df = eodhd_df.dropna(subset=['Date'])
-            result1 = self.get_ohlc_compare_data(eodhd_df=eodhd_df, yf_df=yf_df, num_records=num_records, ticker=ticker,
-                                                 order_type='ascending')
-            result2 = self.get_ohlc_compare_data(eodhd_df=eodhd_df, yf_df=yf_df, num_records=num_records, ticker=ticker,
-                                                 order_type='descending')
+            with self.instrumentation.span('compare.rows'):
+                indexes = (eodhd_index, yf_index)
+                result1 = self.get_ohlc_compare_data(eodhd_df=eodhd_df, yf_df=yf_df, num_records=num_records,
+                                                     ticker=ticker, order_type='ascending', indexes=indexes,
+                                                     window=window)
+                # 기간 전체를 비교하면 최근 구간은 이미 포함됨
+                result2 = [] if num_records is None else self.get_ohlc_compare_data(
+                    eodhd_df=eodhd_df, yf_df=yf_df, num_records=num_records, ticker=ticker,
+                    order_type='descending', indexes=indexes, window=window)
 
-            comparison_results = result1 + result2
+            # 기간(기본: 전체 이력)의 누락/중복/휴장일 봉
+            bar_results, _ = self.check_trading_calendar(ticker, window)
+
+            comparison_results = result1 + result2 + (bar_results or [])
 
         elif data_type == 'dividends':
-            # 데이터 복사본 생성
-            eodhd_df = eodhd_data.copy()
-            yf_df = yf_data.copy()
-
-            # yfinance 데이터 처리
-            if 'Date' in yf_df.columns:
-                # 시간대 정보가 포함된 날짜 문자열에서 날짜 부분만 추출
-                yf_df['Date'] = yf_df['Date'].astype(str).str.split().str[0]
-                yf_df['Date'] = pd.to_datetime(yf_df['Date'], errors='coerce')
-                yf_df = yf_df.dropna(subset=['Date'])
-            else:
+            # 양쪽 'Date'는 로드 시 거래일로 변환됨
+            eodhd_df = eodhd_data
+            yf_df = yf_data
+            if 'Date' not in yf_df.columns:
                 return None, "yfinance 데이터에 'Date' 열이 없습니다."
-
-            # EODHD 데이터 처리
-            if 'date' in eodhd_df.columns:
-                eodhd_df['Date'] = pd.to_datetime(eodhd_df['date'], errors='coerce')
-                eodhd_df = eodhd_df.dropna(subset=['Date'])
-            elif 'Date' in eodhd_df.columns:
-                eodhd_df['Date'] = pd.to_datetime(eodhd_df['Date'], errors='coerce')
-                eodhd_df = eodhd_df.dropna(subset=['Date'])
-            else:
+            if 'Date' not in eodhd_df.columns:
                 return None, "EODHD 데이터에 'date' 또는 'Date' 열이 없습니다."
 
-            # 날짜 형식 통일 (시간 정보 제거)
-            yf_df['Date'] = yf_df['Date'].dt.normalize()
-            eodhd_df['Date'] = eodhd_df['Date'].dt.normalize()
-
             # 필요한 경우 배당 필드명 통일
-            if 'Dividends' not in yf_df.columns and 'dividends' in yf_df.columns:
-                yf_df['Dividends'] = yf_df['dividends']
+            yf_dividend_column = 'dividends' if 'Dividends' not in yf_df.columns else 'Dividends'
 
             if 'value' in eodhd_df.columns:
-                eodhd_df['dividend'] = eodhd_df['value']
-            elif 'dividend' not in eodhd_df.columns:
+                dividend_column = 'value'
+            elif 'dividend' in eodhd_df.columns:
+                dividend_column = 'dividend'
+            else:
                 return None, "EODHD 데이터에 배당 금액 필드('value' 또는 'dividend')가 없습니다."
 
-            # 데이터 정렬 (최신 순으로)
-            yf_df = yf_df.sort_values('Date', ascending=False)
-            eodhd_df = eodhd_df.sort_values('Date', ascending=False)
-
-            # 최근 num_records 개로 제한
-            if num_records:
-                yf_df = yf_df.head(num_records)
-                eodhd_df = eodhd_df.head(num_records)
+            # 기간 안의 최근 num_records 개 (최신 순), yfinance 날짜마다 EODHD 최근 구간에서 같은 날짜 검색
+            eodhd_df, eodhd_index = self.date_index(ticker, data_type, 'eodhd')
+            yf_df, yf_index = self.date_index(ticker, data_type, 'yfinance')
+            window = self.date_window(date_range, eodhd_index, yf_index)
+            yf_part = yf_index.tail(num_records, *window)
+            dates = yf_index.dates[yf_part][::-1]
+            yf_rows = yf_index.rows[yf_part][::-1]
+            eodhd_positions = eodhd_index.locate(dates, eodhd_index.tail(num_records, *window))
+            found = eodhd_positions >= 0
+            dates = dates[found]
+            eodhd_values = eodhd_df[dividend_column].to_numpy(dtype=object)[eodhd_index.rows[eodhd_positions[found]]]
+            if yf_dividend_column in yf_df.columns:
+                yf_values = yf_df[yf_dividend_column].to_numpy(dtype=object)[yf_rows[found]]
+            else:
+                yf_values = np.zeros(len(dates), dtype=object)
 
             comparison_results = []
-
-            # 각 데이터프레임을 순회하면서 공통 날짜 찾아서 비교
-            for _, yf_row in yf_df.iterrows():
-                yf_date = yf_row['Date']
-
-                # 같은 날짜의 EODHD 데이터 찾기
-                eodhd_match = eodhd_df[eodhd_df['Date'] == yf_date]
-
-                if not eodhd_match.empty:
-                    eodhd_row = eodhd_match.iloc[0]
-                    date_str = yf_date.strftime('%Y-%m-%d')
-
-                    # 배당금액 비교
-                    field = 'Dividends'
-                    yf_val = yf_row['Dividends'] if 'Dividends' in yf_row else 0
-                    eodhd_val = eodhd_row['dividend'] if 'dividend' in eodhd_row else 0
-
-                    match_result, difference = self._detailed_compare(eodhd_val, yf_val, 'dividend')
-
-                    existing_issues = self.issue_tracker.get_issues(ticker)
+            with self.instrumentation.span('issues.lookup'):
+                existing_issues = self.issue_tracker.get_issues(ticker)
+
+            with self.instrumentation.span('compare.rows'):
+                field = 'Dividends'
+                judged = self._judge_values(eodhd_values, yf_values, 'dividend', ticker)
+                for date_str, eodhd_val, yf_val, (match_result, difference) in zip(
+                        np.datetime_as_string(dates, unit='D').tolist(), eodhd_values, yf_values, judged):
                     issue_key = f"{field}_{date_str}"
                     existing_cause = existing_issues.get(issue_key, {}).get('cause', '')
 
@@ -445,71 +1208,35 @@ class DataComparator:
 
         elif data_type == 'fundamentals':
 
-            # EODHD 데이터에서 최신 재무년월 기준 데이터 추출
+            # 재무제표 저장소에서 섹션별 최신 분기 값 조회 (재무제표 표와 같은 데이터)
 
             eodhd_financials = {}
 
-            latest_financial_date = None
-
-            # Income Statement, Balance Sheet, Cash Flow에서 최신 재무년월 찾기
-
-            financial_sections = ['Income_Statement', 'Balance_Sheet', 'Cash_Flow']
+            yf_financials = {}
 
-            for section in financial_sections:
+            latest_financial_date = None
 
-                if section in eodhd_data.get('Financials', {}):
+            for statement, section in STATEMENT_SECTIONS.items():
 
-                    quarterly_data = eodhd_data['Financials'][section].get('quarterly', {})
+                latest_date, values = self.statement_values(ticker, statement, 'eodhd')
 
-                    if quarterly_data:
+                if values:
 
-                        # 최신 재무년월 찾기
+                    if latest_financial_date is None or latest_date > latest_financial_date:
+                        latest_financial_date = latest_date
 
-                        latest_date = max(quarterly_data.keys())
+                    eodhd_financials[section] = values
 
-                        if latest_financial_date is None or latest_date > latest_financial_date:
-                            latest_financial_date = latest_date
+                # yfinance는 CSV의 최신 분기 열
 
-                        # 해당 섹션의 최신 데이터 저장
+                _, yf_values = self.statement_values(ticker, statement, 'yfinance')
 
-                        eodhd_financials[section] = quarterly_data[latest_date]
+                if yf_values:
+                    yf_financials[section] = yf_values
 
             if not eodhd_financials or not latest_financial_date:
                 return None, "EODHD 데이터에 분기별 재무 데이터가 없습니다."
 
-            # yfinance 데이터를 각 CSV 파일에서 로드
-
-            yf_financials = {}
-
-            financial_file_mapping = {
-
-                'income_statement': 'Income_Statement',
-
-                'balance_sheet': 'Balance_Sheet',
-
-                'cash_flow': 'Cash_Flow'
-
-            }
-
-            for file_type, section in financial_file_mapping.items():
-
-                yf_data_section = self.load_data(ticker, file_type, source='yfinance').get('yfinance')
-
-                if yf_data_section is not None:
-
-                    # CSV의 첫 번째 데이터 컬럼(최신)을 사용
-
-                    if len(yf_data_section.columns) > 1:
-                        # 첫 번째 컬럼은 'index', 두 번째부터가 실제 데이터
-
-                        latest_column = yf_data_section.columns[1]
-
-                        # index 컬럼을 행 이름으로 설정하고 최신 분기 데이터만 추출
-
-                        yf_section_data = yf_data_section.set_index('index')[latest_column].to_dict()
-
-                        yf_financials[section] = yf_section_data
-
             if not yf_financials:
                 return None, "yfinance 재무제표 파일을 로드할 수 없습니다."
 
@@ -560,6 +1287,9 @@ class DataComparator:
 
             }
 
+            with self.instrumentation.span('issues.lookup'):
+                existing_issues = self.issue_tracker.get_issues(ticker)
+
             for eodhd_field, field_info in fields_mapping.items():
 
                 section = field_info['section']
@@ -572,21 +1302,9 @@ class DataComparator:
 
                 eodhd_val = None
 
-                if section in eodhd_financials and eodhd_field in eodhd_financials[section]:
-
-                    eodhd_val = eodhd_financials[section][eodhd_field]
-
-                    # 문자열인 경우 숫자로 변환 시도
-
-                    if isinstance(eodhd_val, str):
+                if section in eodhd_financials:
 
-                        try:
-
-                            eodhd_val = float(eodhd_val.replace(',', ''))
-
-                        except (ValueError, AttributeError):
-
-                            eodhd_val = None
+                    eodhd_val = eodhd_financials[section].get(eodhd_field)
 
                 # yfinance에서 값 가져오기 (CSV 행 이름으로 접근)
 
@@ -600,22 +1318,14 @@ class DataComparator:
 
                         if yf_key.lower() in row_name.lower() or row_name.lower() in yf_key.lower():
 
-                            try:
-
-                                yf_val = float(value) if pd.notna(value) else None
+                            yf_val = value
 
-                                break
-
-                            except (ValueError, TypeError):
-
-                                continue
+                            break
 
                 # 둘 다 값이 있는 경우에만 비교
 
                 if eodhd_val is not None and yf_val is not None:
-                    match_result, difference = self._detailed_compare(eodhd_val, yf_val, 'financial')
-
-                    existing_issues = self.issue_tracker.get_issues(ticker)
+                    match_result, difference = self._detailed_compare(eodhd_val, yf_val, 'financial', ticker, display_field)
 
                     issue_key = f"fundamentals_{eodhd_field}_{latest_financial_date}"
 
@@ -643,59 +1353,187 @@ class DataComparator:
 
         return comparison_results, None
 
-    def _detailed_compare(self, val1, val2, field_type):
-        """상세 비교"""
-        try:
-            num1 = float(val1) if val1 != '' and pd.notna(val1) else 0
-            num2 = float(val2) if val2 != '' and pd.notna(val2) else 0
+    def _calendar_members(self, exchange, tickers=()):
+        """거래소 달력에 들어가는 종목, 가격 파일 경로, 파일 시그니처"""
+        members = sorted({t[0] for t in self.get_ticker_list() if ticker_exchange(t[0]) == exchange} | set(tickers))
+        paths = [self.source_file_path(member, 'historical_ohlc', source)
+                 for member in members for source in ('eodhd', 'yfinance')]
+        signature = tuple(self.series_signature(path, 'historical_ohlc', source)
+                          for path, source in zip(paths, ('eodhd', 'yfinance') * len(members)))
+        return members, paths, signature
 
-            difference = abs(num1 - num2)
+    def trading_calendar(self, exchange, tickers=()):
+        """
+        거래소 거래일 인덱스 (유니버스에서 같은 거래소 코드를 가진 종목의 양쪽 출처 날짜 합집합)
+        소속 파일이 바뀌지 않으면 캐시된 인덱스를 사용합니다.
+        """
+        members, paths, signature = self._calendar_members(exchange, tickers)
+
+        cached = self._calendar_cache.get(exchange)
+        if cached is not None and cached[0] == (tuple(paths), signature):
+            return cached[1]
+
+        with self.instrumentation.span('calendar.build'):
+            series_dates = []
+            for member in members:
+                for df in self.load_data(member, 'historical_ohlc').values():
+                    if df is not None and 'Date' in df.columns:
+                        series_dates.append(df['Date'])
+            calendar = ExchangeCalendar(exchange, series_dates)
+        self._calendar_cache[exchange] = ((tuple(paths), signature), calendar)
+        return calendar
+
+    def check_trading_calendar(self, ticker, window=(None, None)):
+        """
+        기간(window: (시작일, 종료일), 기본 전체 이력)에서 누락 봉(한쪽 출처에 없는 거래일), 중복 날짜,
+        휴장일 봉을 찾아 결과 행으로 반환 (category: missing_bar / duplicate_bar / out_of_session)
+        """
+        _, eodhd_index = self.date_index(ticker, 'historical_ohlc', 'eodhd')
+        _, yf_index = self.date_index(ticker, 'historical_ohlc', 'yfinance')
+        if eodhd_index is None or yf_index is None:
+            return None, "데이터 로드 실패: EODHD 또는 yfinance 파일이 없습니다."
 
-            # 필드 타입별 허용 오차
-            if field_type in ['financial']:
-                # 재무 데이터는 수치가 크므로 1000 단위까지 허용
-                tolerance_abs = 1000
-                if difference <= tolerance_abs:
-                    return '✅', 0
-                else:
-                    return '❌', int(difference)
-            elif field_type == 'Volume':
-                tolerance_abs = 1
-                if difference <= tolerance_abs:
-                    return '✅', 0
-                else:
-                    return '❌', int(difference)
-            elif field_type == 'dividend':
-                if difference <= 0.001:
-                    return '✅', 0
-                else:
-                    return '⚠️', round(difference, 4)
-            else:  # 가격 데이터 (OHLC)
-                percentage_diff = (difference / max(abs(num1), abs(num2), 0.01)) * 100
-                if difference <= 0.01:
-                    return '✅', 0
-                elif percentage_diff <= 0.1:
-                    return '⚠️', round(difference, 4)
-                else:
-                    return '❌', round(difference, 4)
+        calendar = self.trading_calendar(ticker_exchange(ticker), [ticker])
+        with self.instrumentation.span('calendar.check'):
+            start, end = window
+            span = None
+            if (start is not None or end is not None) and len(eodhd_index) and len(yf_index):
+                # 누락 봉은 전체 이력에서 두 출처가 겹치는 기간과 비교 기간의 교집합에서만 검사
+                span = (max(eodhd_index.first, yf_index.first, *([start] if start is not None else [])),
+                        min(eodhd_index.last, yf_index.last, *([end] if end is not None else [])))
+            bars = check_bars(calendar, eodhd_index.window_days(start, end), yf_index.window_days(start, end), span)
+
+        existing_issues = self.issue_tracker.get_issues(ticker)
+        results = []
+        for date, eodhd_count, yf_count, category in bars.itertuples(index=False):
+            date_str = date.strftime('%Y-%m-%d')
+            results.append({
+                'date': date_str, 'field': 'Bar', 'category': category,
+                'eodhd_value': str(eodhd_count), 'yfinance_value': str(yf_count),
+                'match': '⚠️' if category == 'out_of_session' else '❌',
+                'difference': abs(int(eodhd_count) - int(yf_count)),
+                'existing_cause': existing_issues.get(f"Bar_{date_str}", {}).get('cause', ''),
+                'ticker': ticker
+            })
+        return results, None
+
+    def detect_price_anomalies(self, ticker, window=ANOMALY_WINDOW, threshold=ANOMALY_Z_THRESHOLD):
+        """전체 이력의 EODHD/yfinance 가격 비율에서 이상 구간 탐지 (심각도 순)"""
+        with self.instrumentation.span('anomaly.historical_ohlc'):
+            data = self.load_data(ticker, 'historical_ohlc')
+            if data.get('eodhd') is None or data.get('yfinance') is None:
+                return None, "데이터 로드 실패: EODHD 또는 yfinance 파일이 없습니다."
+            try:
+                return detect_incidents(data['eodhd'], data['yfinance'], ticker, window, threshold), None
+            except ValueError as e:
+                return None, str(e)
 
-        except (ValueError, TypeError):
-            if str(val1) == str(val2):
-                return '✅', 0
+    def check_corporate_actions(self, ticker):
+        """
+        전체 이력의 분할/배당 이벤트를 두 출처 간 대조 (누락/불일치 이벤트와 영향 받는 가격 구간)
+        가격과 배당 이력은 날짜 색인으로 정렬/중복 제거한 행만 사용합니다.
+        """
+        with self.instrumentation.span('corporate_actions'):
+            eodhd_df, eodhd_index = self.date_index(ticker, 'historical_ohlc', 'eodhd')
+            yf_df, yf_index = self.date_index(ticker, 'historical_ohlc', 'yfinance')
+            if eodhd_index is None or yf_index is None:
+                return None, "데이터 로드 실패: EODHD 또는 yfinance 파일이 없습니다."
+            if 'adjusted_close' not in eodhd_df.columns or 'Close' not in yf_df.columns:
+                return None, "EODHD 'adjusted_close' 또는 yfinance 'Close' 열이 없습니다."
+            eodhd_prices = eodhd_df.iloc[eodhd_index.rows]
+            yf_prices = yf_df.iloc[yf_index.rows]
+
+            dividends = []
+            for source, columns in (('eodhd', ['value', 'dividend']), ('yfinance', ['Dividends', 'dividends'])):
+                frame, index = self.date_index(ticker, 'dividends', source)
+                column = next((column for column in columns if frame is not None and column in frame.columns), None)
+                if index is None or column is None:
+                    dividends.append(None)
+                    continue
+                name = 'value' if source == 'eodhd' else 'Dividends'
+                dividends.append(frame.iloc[index.rows][['Date', column]].rename(columns={column: name}))
+
+            actions = cross_check_actions(eodhd_prices, yf_prices, *dividends, self.tolerances, ticker,
+                                          *self.ticker_market(ticker))
+        return actions, None
+
+    def iter_comparison_batches(self, tickers, data_types, num_records=10, date_range=None):
+        """(종목, 데이터 유형) 단위로 비교 결과 배치를 순차 생성"""
+        for ticker in tickers:
+            for data_type in data_types:
+                results, error = self.compare_detailed_data(ticker, data_type, num_records, date_range=date_range)
+                yield ticker, data_type, results or [], error
+
+    def _detailed_compare(self, val1, val2, field_type, ticker=None, field=None):
+        """상세 비교 (허용 오차는 tolerance 규칙, ticker의 거래소/통화별 규칙 포함)"""
+        return self._judge_values([val1], [val2], field_type, ticker, field)[0]
+
+    def _judge_values(self, values1, values2, field_type, ticker=None, fields=None):
+        """
+        값 쌍들을 허용 오차 규칙으로 한 번에 판정 -> [(일치 여부, 차이), ...]
+        field_type: 'financial', 'dividend' 또는 가격 항목 이름 (행마다 다르면 목록, 데이터 유형은 모두 같아야 함)
+        fields: 규칙을 고를 항목 이름 (생략 시 field_type에서 결정)
+        빈 값/NaN은 0으로 보고, 숫자로 바꿀 수 없는 값은 문자열이 같을 때만 ✅
+        """
+        single = isinstance(field_type, str)
+        first = field_type if single else (field_type[0] if len(field_type) else '')
+        data_type = FIELD_TYPE_DATA_TYPES.get(first, 'historical_ohlc')
+        if fields is None:
+            fields = FIELD_TYPE_FIELDS.get(field_type, field_type) if single else list(field_type)
+
+        left, left_invalid = as_float64_values(values1)
+        right, right_invalid = as_float64_values(values2)
+        codes, differences = self.tolerances.classify(data_type, fields, left, right, *self.ticker_market(ticker))
+
+        # 재무/거래량 차이는 정수, 그 외는 소수 4자리
+        integral = np.broadcast_to(np.isin(field_type, ['financial', 'Volume']), len(codes))
+        invalid = left_invalid | right_invalid
+        results = []
+        for i, (code, difference) in enumerate(zip(codes.tolist(), differences.tolist())):
+            if invalid[i]:
+                val1, val2 = values1[i], values2[i]
+                if str(val1) == str(val2):
+                    results.append(('✅', 0))
+                else:
+                    results.append(('❌', f"Type mismatch: {type(val1).__name__} vs {type(val2).__name__}"))
+            elif code == MATCH:
+                results.append(('✅', 0))
             else:
-                return '❌', f"Type mismatch: {type(val1).__name__} vs {type(val2).__name__}"
+                results.append((MATCH_SYMBOLS[code], int(difference) if integral[i] else round(difference, 4)))
+        return results
 
     def _format_value(self, value, field_type):
         """값 포맷팅"""
         try:
             if field_type in ['Volume', 'financial', 'dividend']:
-                return f"{float(value):,.4f}" if value != '' and pd.notna(value) else '0'
+                return f"{as_float64(value):,.4f}" if value != '' and pd.notna(value) else '0'
             else:
-                return f"{float(value):.2f}" if value != '' and pd.notna(value) else '0.00'
+                return f"{as_float64(value):.2f}" if value != '' and pd.notna(value) else '0.00'
         except:
             return str(value)
 
 
+@st.cache_resource(show_spinner=False)
+def get_comparator():
+    """
+    모든 세션이 공유하는 DataComparator
+    보유종목/데이터/이슈 파일은 변경 시그니처로 검사하므로 파일이 바뀌면 해당 항목만 다시 읽습니다.
+    """
+    return DataComparator()
+
+
+@st.cache_resource(show_spinner=False)
+def get_prewarmer():
+    """
+    앱과 함께 시작하는 캐시 예열 작업자 (서버 프로세스당 하나)
+    DQ_PREWARM=0이면 시작하지 않습니다.
+    """
+    prewarmer = Prewarmer(get_comparator(), num_records=DEFAULT_NUM_RECORDS, workers=prewarm_workers())
+    if os.environ.get('DQ_PREWARM', '1') != '0':
+        prewarmer.start()
+    return prewarmer
+
+
 def extract_tickers_from_files(directory):
     """
     지정된 디렉토리의 파일 이름에서 종목 코드를 추출하고 중복을 제거합니다.
@@ -744,7 +1582,7 @@ def main():
     </div>
     """, unsafe_allow_html=True)
 
-    comparator = DataComparator()
+    comparator = get_comparator()
     ticker_list = comparator.get_ticker_list()
 
     if not ticker_list:
@@ -762,11 +1600,30 @@ def main():
     data_type = st.sidebar.selectbox("데이터 유형:",
                                      ["historical_ohlc", "dividends", "financial_statements"])
 
+    sample_per_stratum = None
+    date_range = None
     if data_type in ['historical_ohlc', 'dividends']:
-        num_records = st.sidebar.slider("검증할 데이터 수", min_value=5, max_value=30, value=10)
+        sampling_mode = st.sidebar.radio("검증 방식:", ["처음/최근 N개", "층화 무작위 표본"], horizontal=True,
+                                         help="층화 무작위 표본: 연도 × 항목별로 무작위 추출하여 불일치율과 신뢰구간을 추정합니다.")
+        if sampling_mode == "층화 무작위 표본":
+            num_records = None
+            sample_per_stratum = st.sidebar.slider("층별 표본 수", min_value=2, max_value=20,
+                                                   value=DEFAULT_SAMPLE_PER_STRATUM)
+            if st.sidebar.button("🎲 새 표본 추출"):
+                st.session_state['sample_seed'] = int(np.random.default_rng().integers(2 ** 31))
+        else:
+            num_records = st.sidebar.slider("검증할 데이터 수", min_value=5, max_value=30, value=DEFAULT_NUM_RECORDS)
+            date_range, compare_all = select_date_range(comparator, selected_ticker, data_type)
+            if compare_all:
+                num_records = None
     else:
         num_records = None
 
+    show_batch_export(comparator, ticker_list, selected_ticker)
+
+    if st.sidebar.button("🔄 데이터 캐시 새로고침", help="파일을 외부에서 교체한 경우 모든 캐시를 비웁니다."):
+        comparator.invalidate_cache()
+
     # 메인 컨텐츠
     ticker_info = [t for t in ticker_list if t[0] == selected_ticker][0]
 
@@ -786,13 +1643,11 @@ def main():
         st.subheader("📋 재무 데이터 상세 비교")
 
         # 펀더멘탈 파일에서 업종/섹터 정보 로드
-        try:
-            with open(f"./yfinance_data/fundamentals_{selected_ticker.replace('.US', '')}.json", 'r',
-                      encoding='utf-8') as f:
-                yf_fundamentals = json.load(f)
+        yf_fundamentals = comparator.load_data(selected_ticker, 'fundamentals', source='yfinance').get('yfinance')
+        if yf_fundamentals:
             sector = yf_fundamentals.get('sectorDisp', 'Non-Financials')
             industry = yf_fundamentals.get('industryDisp', 'General')
-        except FileNotFoundError:
+        else:
             st.warning("yfinance 펀더멘탈 파일이 없어 업종 정보를 로드할 수 없습니다. 'Non-Financials'로 기본 설정합니다.")
             sector = 'Non-Financials'
             industry = 'General'
@@ -887,13 +1742,12 @@ def main():
                     eodhd_val_num = to_num(eodhd_val)
                     yf_val_num = to_num(yf_val)
 
-                    # 일치 여부
+                    # 일치 여부 (financial_statements 허용 오차 규칙, 값이 없으면 ❌)
                     match = "❌"
                     if eodhd_val_num is not None and yf_val_num is not None:
-                        if abs(eodhd_val_num - yf_val_num) / max(abs(eodhd_val_num), abs(yf_val_num), 1e-9) < 0.01:
-                            match = "✅"
-                        else:
-                            match = "⚠️"
+                        code, _ = comparator.tolerances.compare('financial_statements', display_name, eodhd_val_num,
+                                                                yf_val_num, *comparator.ticker_market(selected_ticker))
+                        match = MATCH_SYMBOLS[code]
 
                     table_data.append({
                         "항목": display_name,
@@ -907,34 +1761,9 @@ def main():
         def display_financial_table(title, data_type, mapping):
             st.markdown(f"**{title}**")
 
-            # EODHD 데이터 로드
-            eodhd_data = comparator.load_data(selected_ticker, data_type, source='eodhd').get('eodhd')
-
-            # yfinance 데이터 로드 (CSV)
-            yf_data = comparator.load_data(selected_ticker, data_type, source='yfinance').get('yfinance')
-
-            # EODHD 값 추출
-            eodhd_values = {}
-            if eodhd_data:
-                section_mapping = {
-                    'income_statement': 'Income_Statement',
-                    'balance_sheet': 'Balance_Sheet',
-                    'cash_flow': 'Cash_Flow'
-                }
-                section = section_mapping.get(data_type)
-                if section:
-                    quarterly_data = eodhd_data.get('quarterly', {})
-                    if quarterly_data:
-                        latest_financial_date = max(quarterly_data.keys())
-                        print('quarterly_data.keys() :::', quarterly_data.keys())
-                        print('latest_financial_date :::' , latest_financial_date)
-                        eodhd_values = quarterly_data[latest_financial_date]
-
-            # yfinance 값 추출
-            yf_values = {}
-            if yf_data is not None and len(yf_data.columns) > 1:
-                latest_column = yf_data.columns[1]
-                yf_values = yf_data.set_index('index')[latest_column].to_dict()
+            # 재무제표 저장소에서 최신 분기 값 조회 (펀더멘털 비교와 같은 데이터)
+            _, eodhd_values = comparator.statement_values(selected_ticker, data_type, 'eodhd')
+            _, yf_values = comparator.statement_values(selected_ticker, data_type, 'yfinance')
 
             # 비교 수행
             table_data = compare_financials(eodhd_values, yf_values, mapping, data_type)
@@ -960,10 +1789,18 @@ def main():
 
     else:  # 재무제표가 아닌 경우 (historical_ohlc, dividends, fundamentals)
         # 데이터 비교 실행
+        sampling_report = None
         with st.spinner("데이터 품질 검증 중..."):
-            comparison_results, error = comparator.compare_detailed_data(
-                selected_ticker, data_type, num_records
-            )
+            if sample_per_stratum:
+                # 같은 세션에서는 같은 표본을 유지 (새 표본 추출 버튼으로 변경)
+                seed = st.session_state.setdefault('sample_seed', 0)
+                sampling_report, errors = comparator.estimate_quality([selected_ticker], [data_type],
+                                                                      sample_per_stratum, seed=seed)
+                comparison_results, error = sampling_report.results, errors[0][2] if errors else None
+            else:
+                comparison_results, error = comparator.compare_detailed_data(
+                    selected_ticker, data_type, num_records, date_range=date_range
+                )
 
         if error:
             st.error(f"검증 실패: {error}")
@@ -973,18 +1810,158 @@ def main():
             st.warning("비교할 데이터가 없습니다. 파일이 존재하더라도 내부 데이터 구조가 예상과 다르거나, 비교할 항목이 없을 수 있습니다.")
             return
 
+        # 품질 지표 기록 (같은 세션에서 같은 조건의 재실행은 하루 한 번만 기록)
+        run_key = (selected_ticker, data_type, num_records, sample_per_stratum, date_range,
+                   datetime.now().strftime('%Y-%m-%d'))
+        recorded_runs = st.session_state.setdefault('recorded_runs', set())
+        if run_key not in recorded_runs:
+            comparator.metrics_store.record_run([(selected_ticker, data_type, comparison_results, None)])
+            recorded_runs.add(run_key)
+
         # 결과 표시
+        if sampling_report is not None:
+            show_sampling_estimate(sampling_report)
         show_quality_report(comparison_results, comparator, selected_ticker)
 
+        if data_type == 'historical_ohlc':
+            show_price_anomalies(comparator, selected_ticker)
+        if data_type in ('historical_ohlc', 'dividends'):
+            show_corporate_actions(comparator, selected_ticker)
+        if data_type in DIGEST_FIELDS and len(comparator.providers) > 2:
+            show_provider_consensus(comparator, selected_ticker, data_type)
+
+
+def select_date_range(comparator, ticker, data_type):
+    """사이드바: 비교 기간 선택 -> (DateRange 또는 None, 기간 전체 비교 여부)"""
+    mode = st.sidebar.radio("비교 기간:", ["전체 이력", "기간 지정", "최근 기간"], horizontal=True,
+                            help="기간을 정하면 그 안에서 처음/최근 N개(또는 전체)를 비교합니다.")
+    if mode == "전체 이력":
+        return None, False
+
+    if mode == "최근 기간":
+        last = st.sidebar.selectbox("기간:", list(RECENT_PERIODS), index=1, format_func=RECENT_PERIODS.get,
+                                    help="데이터의 마지막 날짜에서 거슬러 올라간 기간")
+        date_range = make_date_range(last=last)
+    else:
+        _, index = comparator.date_index(ticker, data_type, 'yfinance')
+        if index is not None and len(index):
+            first, latest = pd.Timestamp(index.first).date(), pd.Timestamp(index.last).date()
+        else:
+            first, latest = None, datetime.now().date()
+        default_start = latest - timedelta(days=90)
+        if first is not None:
+            default_start = max(first, default_start)
+        # 날짜를 하나만 고른 동안에는 시작일 이후 전체
+        selected = st.sidebar.date_input("시작일 ~ 종료일:", value=(default_start, latest),
+                                         min_value=first, max_value=latest)
+        date_range = make_date_range(*selected)
+
+    compare_all = st.sidebar.checkbox("기간 전체 비교", help="처음/최근 N개 대신 기간의 모든 날짜를 비교합니다.")
+    return date_range, compare_all
+
+
+def show_batch_export(comparator, ticker_list, selected_ticker):
+    """사이드바: 여러 종목/데이터 유형 결과 일괄 내보내기"""
+    with st.sidebar.expander("📦 결과 일괄 내보내기", expanded=False):
+        export_tickers = st.multiselect(
+            "내보낼 종목:",
+            options=[ticker[0] for ticker in ticker_list],
+            default=[selected_ticker],
+            key="export_tickers"
+        )
+        export_types = st.multiselect(
+            "내보낼 데이터 유형:",
+            options=COMPARISON_DATA_TYPES,
+            default=['historical_ohlc', 'dividends'],
+            key="export_types"
+        )
+        export_format = st.selectbox("파일 형식:", list(EXPORT_FORMATS.keys()), key="export_format")
+        export_records = st.slider("종목별 검증 데이터 수", min_value=5, max_value=30, value=10, key="export_records")
+
+        if st.button("📦 내보내기 실행", key="export_run", disabled=not export_tickers or not export_types):
+            export_buffer = io.BytesIO()
+            with st.spinner("결과 내보내는 중..."):
+                recorder = comparator.metrics_store.recorder()
+                row_count = export_results(
+                    recorder.observe(comparator.iter_comparison_batches(export_tickers, export_types, export_records)),
+                    export_format,
+                    export_buffer,
+                    comparator.issue_tracker.get_issues()
+                )
+                recorder.commit()
+
+            mime, extension = EXPORT_FORMATS[export_format]
+            st.download_button(
+                label=f"💾 다운로드 ({row_count:,}행)",
+                data=export_buffer,
+                file_name=f"data_quality_export_{datetime.now().strftime('%Y%m%d')}.{extension}",
+                mime=mime,
+                key="export_download"
+            )
+
+
+def build_results_frame(comparison_results):
+    """비교 결과를 표시용 컬럼형 DataFrame으로 변환"""
+    results_df = pd.DataFrame.from_records(comparison_results, columns=list(RESULT_DISPLAY_COLUMNS))
+    results_df['difference'] = results_df['difference'].where(results_df['difference'] != 0, '-')
+    results_df['existing_cause'] = results_df['existing_cause'].fillna('')
+    results_df['category'] = results_df['category'].fillna('value').map(RESULT_CATEGORY_LABELS)
+    return results_df.rename(columns=RESULT_DISPLAY_COLUMNS)
+
+
+def build_status_index(results_df):
+    """일치 여부별 행 위치 인덱스 (불일치 항목 빠른 조회용)"""
+    status = results_df['일치 여부'].to_numpy()
+    status_index = {symbol: np.flatnonzero(status == symbol) for symbol in MATCH_COLORS}
+    status_index['mismatch'] = np.flatnonzero((status == '⚠️') | (status == '❌'))
+    return status_index
+
+
+def _results_sort_key(series):
+    """정렬 키 (값/차이 컬럼은 숫자 기준)"""
+    if series.name in RESULT_NUMERIC_COLUMNS:
+        return pd.to_numeric(series.astype(str).str.replace(',', '', regex=False), errors='coerce')
+    return series.astype(str)
+
+
+def get_results_page(results_df, positions, sort_column, ascending, page, page_size):
+    """
+    결과 페이지의 행 위치를 반환합니다.
+    정렬은 선택된 컬럼의 키에만 적용하고, 실제 행은 현재 페이지 분량만 꺼냅니다.
+    """
+    if positions is None:
+        positions = np.arange(len(results_df))
+
+    if sort_column and len(positions):
+        sort_key = _results_sort_key(results_df[sort_column].iloc[positions])
+        sort_key.index = positions
+        positions = sort_key.sort_values(ascending=ascending, kind='stable', na_position='last').index.to_numpy()
+
+    start = page * page_size
+    return positions[start:start + page_size]
+
+
+def style_results_page(page_df):
+    """현재 페이지의 일치 여부 컬럼 스타일 (벡터 연산)"""
+    status = page_df['일치 여부'].to_numpy()
+    styles = np.select([status == symbol for symbol in MATCH_COLORS],
+                       [f'color: {color}; font-weight: bold;' for color in MATCH_COLORS.values()],
+                       default='')
+    return page_df.style.apply(lambda _: styles, subset=['일치 여부'])
+
 
 def show_quality_report(comparison_results, comparator, ticker):
     """품질 보고서 표시"""
 
+    with comparator.instrumentation.span('render.results_frame'):
+        results_df = build_results_frame(comparison_results)
+        status_index = build_status_index(results_df)
+
     # 요약 통계
-    total_items = len(comparison_results)
-    matches = len([r for r in comparison_results if r['match'] == '✅'])
-    warnings = len([r for r in comparison_results if r['match'] == '⚠️'])
-    errors = len([r for r in comparison_results if r['match'] == '❌'])
+    total_items = len(results_df)
+    matches = len(status_index['✅'])
+    warnings = len(status_index['⚠️'])
+    errors = len(status_index['❌'])
 
     st.subheader("📊 검증 결과 요약")
 
@@ -1001,39 +1978,34 @@ def show_quality_report(comparison_results, comparator, ticker):
     # 상세 비교 테이블
     st.subheader("🔍 상세 검증 결과")
 
-    # 테이블 데이터 준비
-    table_data = []
-
-    for i, result in enumerate(comparison_results):
-        # 차이 원인 입력 필드
-        cause_key = f"cause_{i}"
-        existing_cause = result.get('existing_cause', '')
-
-        table_data.append({
-            "날짜": result['date'],
-            "항목": result['field'],
-            "EODHD 값": result['eodhd_value'],
-            "yfinance 값": result['yfinance_value'],
-            "일치 여부": result['match'],
-            "차이": result['difference'] if result['difference'] != 0 else '-',
-            "차이 원인": existing_cause
-        })
-
-    # 편집 가능한 테이블로 표시
-    df_display = pd.DataFrame(table_data)
-
-    # 스타일링 함수
-    def highlight_matches(val):
-        if val == '✅':
-            return 'color: #28a745; font-weight: bold;'
-        elif val == '⚠️':
-            return 'color: #ffc107; font-weight: bold;'
-        elif val == '❌':
-            return 'color: #dc3545; font-weight: bold;'
-        return ''
-
-    styled_df = df_display.style.applymap(highlight_matches, subset=['일치 여부'])
-    st.dataframe(styled_df, use_container_width=True, height=400)
+    col1, col2, col3, col4 = st.columns([1, 2, 1, 1])
+    with col1:
+        mismatches_only = st.checkbox("불일치 항목만", key="results_mismatches_only")
+    with col2:
+        sort_column = st.selectbox("정렬 기준:", ["(기본 순서)"] + list(RESULT_DISPLAY_COLUMNS.values()),
+                                   key="results_sort_column")
+    with col3:
+        ascending = st.radio("정렬 방향:", ["오름차순", "내림차순"], horizontal=True,
+                             key="results_sort_order") == "오름차순"
+    with col4:
+        page_size = st.selectbox("페이지당 행 수:", RESULT_PAGE_SIZES, key="results_page_size")
+
+    positions = status_index['mismatch'] if mismatches_only else None
+    row_count = len(positions) if positions is not None else total_items
+    page_count = max((row_count - 1) // page_size + 1, 1)
+    page = st.number_input(f"페이지 (총 {page_count}쪽)", min_value=1, max_value=page_count, value=1,
+                           key="results_page") - 1
+
+    page_positions = get_results_page(
+        results_df, positions,
+        sort_column if sort_column != "(기본 순서)" else None,
+        ascending, page, page_size
+    )
+    page_df = results_df.iloc[page_positions]
+
+    st.caption(f"전체 {row_count:,}건 중 {page * page_size + 1 if row_count else 0:,}–"
+               f"{page * page_size + len(page_positions):,}건 표시")
+    st.dataframe(style_results_page(page_df), use_container_width=True, height=400)
 
     # 이슈 입력 섹션
     st.subheader("📝 이슈 원인 분석 및 기록")
@@ -1041,11 +2013,14 @@ def show_quality_report(comparison_results, comparator, ticker):
     with st.expander("차이 원인 입력 및 수정", expanded=False):
         st.info("💡 발견된 차이에 대한 원인을 분석하여 입력하세요. 이 정보는 품질 보고서에 포함됩니다.")
 
-        # 불일치 항목만 필터링
-        mismatch_results = [r for r in comparison_results if r['match'] in ['❌', '⚠️']]
+        # 현재 페이지의 불일치 항목만 입력 대상으로 표시
+        page_mismatches = [i for i in page_positions if comparison_results[i]['match'] in ['❌', '⚠️']]
 
-        if mismatch_results:
-            for i, result in enumerate(mismatch_results):
+        if len(status_index['mismatch']) and not page_mismatches:
+            st.info("현재 페이지에는 불일치 항목이 없습니다. '불일치 항목만'을 선택해 보세요.")
+        elif page_mismatches:
+            for i in page_mismatches:
+                result = comparison_results[i]
                 st.write(f"**{result['date']} - {result['field']}**")
 
                 col1, col2 = st.columns([3, 1])
@@ -1096,115 +2071,87 @@ def show_quality_report(comparison_results, comparator, ticker):
             st.success("🎉 모든 데이터가 일치합니다! 이슈가 발견되지 않았습니다.")
 
 
-def generate_final_report(results, ticker, client_name, report_date, analyst_name, report_type, comparator):
-    """최종 보고서 생성"""
+def summarize_results(results):
+    """검증 결과 통계 계산"""
+    counts = {'✅': 0, '⚠️': 0, '❌': 0}
+    total_items = 0
+    for result in results:
+        total_items += 1
+        if result['match'] in counts:
+            counts[result['match']] += 1
 
-    # 통계 계산
-    total_items = len(results)
-    matches = len([r for r in results if r['match'] == '✅'])
-    warnings = len([r for r in results if r['match'] == '⚠️'])
-    errors = len([r for r in results if r['match'] == '❌'])
-
-    accuracy_rate = (matches / total_items * 100) if total_items > 0 else 0
-
-    # 보고서 HTML 생성
-    report_html = f"""
-    <div style="max-width: 800px; margin: 0 auto; font-family: Arial, sans-serif;">
-        <div style="text-align: center; border-bottom: 2px solid #333; padding-bottom: 20px; margin-bottom: 30px;">
-            <h1 style="color: #333;">데이터 품질 검증 보고서</h1>
-            <h2 style="color: #666;">{ticker} 종목</h2>
-            <p><strong>고객:</strong> {client_name} | <strong>작성일:</strong> {report_date} | <strong>분석가:</strong> {analyst_name}</p>
-            <p><strong>보고서 유형:</strong> {report_type}</p>
-        </div>
-
-        <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px; margin-bottom: 30px;">
-            <h3>📊 검증 결과 요약</h3>
-            <div style="display: grid; grid-template-columns: repeat(4, 1fr); gap: 15px; text-align: center;">
-                <div>
-                    <h4 style="color: #007bff;">총 검증 항목</h4>
-                    <p style="font-size: 24px; font-weight: bold;">{total_items}</p>
-                </div>
-                <div>
-                    <h4 style="color: #28a745;">완전 일치</h4>
-                    <p style="font-size: 24px; font-weight: bold;">{matches}</p>
-                </div>
-                <div>
-                    <h4 style="color: #ffc107;">경미한 차이</h4>
-                    <p style="font-size: 24px; font-weight: bold;">{warnings}</p>
-                </div>
-                <div>
-                    <h4 style="color: #dc3545;">중대한 차이</h4>
-                    <p style="font-size: 24px; font-weight: bold;">{errors}</p>
-                </div>
-            </div>
-            <div style="text-align: center; margin-top: 20px;">
-                <h3 style="color: #333;">데이터 정확도: {accuracy_rate:.1f}%</h3>
-            </div>
-        </div>
-
-        <div style="margin-bottom: 30px;">
-            <h3>🔍 상세 검증 결과</h3>
-            <table style="width: 100%; border-collapse: collapse; margin-top: 15px;">
-                <thead>
-                    <tr style="background-color: #e9ecef;">
-                        <th style="border: 1px solid #dee2e6; padding: 12px; text-align: left;">날짜</th>
-                        <th style="border: 1px solid #dee2e6; padding: 12px; text-align: left;">항목</th>
-                        <th style="border: 1px solid #dee2e6; padding: 12px; text-align: right;">EODHD 값</th>
-                        <th style="border: 1px solid #dee2e6; padding: 12px; text-align: right;">yfinance 값</th>
-                        <th style="border: 1px solid #dee2e6; padding: 12px; text-align: center;">일치 여부</th>
-                        <th style="border: 1px solid #dee2e6; padding: 12px; text-align: left;">차이 원인</th>
-                    </tr>
-                </thead>
-                <tbody>
-    """
+    return {
+        'total': total_items,
+        'matches': counts['✅'],
+        'warnings': counts['⚠️'],
+        'errors': counts['❌'],
+        'accuracy_rate': (counts['✅'] / total_items * 100) if total_items > 0 else 0
+    }
+
+
+def iter_report_rows(results, issues, limit=None):
+    """보고서 테이블 행 생성 (기록된 차이 원인 포함)"""
+    for i, result in enumerate(results):
+        if limit is not None and i >= limit:
+            break
 
-    for result in results:
-        existing_issues = comparator.issue_tracker.get_issues(ticker)
         issue_key = f"{result['field']}_{result['date']}"
-        cause = existing_issues.get(issue_key, {}).get('cause', '-')
-
-        match_color = '#28a745' if result['match'] == '✅' else '#ffc107' if result['match'] == '⚠️' else '#dc3545'
-
-        report_html += f"""
-                    <tr>
-                        <td style="border: 1px solid #dee2e6; padding: 8px;">{result['date']}</td>
-                        <td style="border: 1px solid #dee2e6; padding: 8px;">{result['field']}</td>
-                        <td style="border: 1px solid #dee2e6; padding: 8px; text-align: right;">{result['eodhd_value']}</td>
-                        <td style="border: 1px solid #dee2e6; padding: 8px; text-align: right;">{result['yfinance_value']}</td>
-                        <td style="border: 1px solid #dee2e6; padding: 8px; text-align: center; color: {match_color}; font-weight: bold;">{result['match']}</td>
-                        <td style="border: 1px solid #dee2e6; padding: 8px;">{cause}</td>
-                    </tr>
-        """
+        yield {
+            'date': result['date'],
+            'field': result['field'],
+            'eodhd_value': result['eodhd_value'],
+            'yfinance_value': result['yfinance_value'],
+            'match': result['match'],
+            'match_color': MATCH_COLORS.get(result['match'], '#dc3545'),
+            'cause': issues.get(issue_key, {}).get('cause', '-')
+        }
 
-    report_html += f"""
-                </tbody>
-            </table>
-        </div>
 
-        <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px;">
-            <h3>📋 분석 결론</h3>
-            <p><strong>{ticker}</strong> 종목의 데이터 품질 검증 결과, 전체 {total_items}개 항목 중 {matches}개 항목이 완전히 일치하여 
-            <strong>{accuracy_rate:.1f}%</strong>의 정확도를 보였습니다.</p>
+def render_final_report(results, ticker, client_name, report_date, analyst_name, report_type, issues,
+                        row_limit=None):
+    """
+    최종 보고서 HTML을 청크 단위로 렌더링하는 스트림을 반환합니다.
+    전체 문자열을 만들지 않고 파일/버퍼에 바로 기록할 수 있습니다. (stream.dump)
+    """
+    summary = summarize_results(results)
+    omitted_rows = max(summary['total'] - row_limit, 0) if row_limit is not None else 0
+
+    stream = final_report_template.stream(
+        ticker=ticker,
+        client_name=client_name,
+        report_date=report_date,
+        analyst_name=analyst_name,
+        report_type=report_type,
+        summary=summary,
+        rows=iter_report_rows(results, issues, limit=row_limit),
+        omitted_rows=omitted_rows
+    )
+    stream.enable_buffering(REPORT_BUFFER_SIZE)
+    return stream
 
-            {'<p style="color: #28a745;"><strong>✅ 모든 데이터가 정상적으로 일치합니다.</strong></p>' if errors == 0 and warnings == 0 else ''}
 
-            {'<p style="color: #ffc107;"><strong>⚠️ 경미한 차이가 발견되었으나 허용 범위 내입니다.</strong></p>' if warnings > 0 and errors == 0 else ''}
+def write_final_report(path, results, ticker, client_name, report_date, analyst_name, report_type, issues):
+    """최종 보고서 HTML을 파일로 스트리밍 저장"""
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, 'wb') as f:
+        render_final_report(results, ticker, client_name, report_date, analyst_name, report_type,
+                            issues).dump(f, encoding='utf-8')
+    os.replace(tmp_path, path)
 
-            {'<p style="color: #dc3545;"><strong>❌ 중대한 차이가 발견되었습니다. 추가 검토가 필요합니다.</strong></p>' if errors > 0 else ''}
 
-            <p>본 보고서는 데이터 제공업체 간 품질 차이를 분석하여 투자 결정에 필요한 신뢰성 있는 정보를 제공하기 위해 작성되었습니다.</p>
-        </div>
+def generate_final_report(results, ticker, client_name, report_date, analyst_name, report_type, comparator):
+    """최종 보고서 생성"""
+
+    existing_issues = comparator.issue_tracker.get_issues(ticker)
 
-        <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #dee2e6; text-align: center; color: #6c757d;">
-            <p>본 보고서는 {analyst_name}에 의해 {report_date}에 작성되었습니다.</p>
-            <p>© 2024 Data Quality Assurance Team. All rights reserved.</p>
-        </div>
-    </div>
-    """
+    # 화면에는 앞부분만 미리보기로 표시
+    with comparator.instrumentation.span('render.report_preview'):
+        preview_html = ''.join(render_final_report(results, ticker, client_name, report_date, analyst_name,
+                                                   report_type, existing_issues, row_limit=REPORT_PREVIEW_ROWS))
 
     # HTML을 컨테이너에 표시
     st.markdown("### 📄 최종 보고서")
-    st.markdown(report_html, unsafe_allow_html=True)
+    st.markdown(preview_html, unsafe_allow_html=True)
 
     # 보고서 다운로드 기능
     st.markdown("---")
@@ -1213,39 +2160,27 @@ def generate_final_report(results, ticker, client_name, report_date, analyst_nam
     col1, col2 = st.columns(2)
 
     with col1:
-        # HTML 다운로드
-        html_bytes = report_html.encode('utf-8')
+        # HTML 다운로드 (전체 행, 청크 단위로 버퍼에 기록)
+        html_buffer = io.BytesIO()
+        with comparator.instrumentation.span('render.report_html'):
+            render_final_report(results, ticker, client_name, report_date, analyst_name, report_type,
+                                existing_issues).dump(html_buffer, encoding='utf-8')
         st.download_button(
             label="📄 HTML 보고서 다운로드",
-            data=html_bytes,
+            data=html_buffer,
             file_name=f"data_quality_report_{ticker}_{report_date.strftime('%Y%m%d')}.html",
             mime="text/html"
         )
 
     with col2:
         # CSV 다운로드
-        csv_data = []
-        for result in results:
-            existing_issues = comparator.issue_tracker.get_issues(ticker)
-            issue_key = f"{result['field']}_{result['date']}"
-            cause = existing_issues.get(issue_key, {}).get('cause', '')
-
-            csv_data.append({
-                '날짜': result['date'],
-                '항목': result['field'],
-                'EODHD_값': result['eodhd_value'],
-                'yfinance_값': result['yfinance_value'],
-                '일치_여부': result['match'],
-                '차이': result['difference'] if result['difference'] != 0 else '',
-                '차이_원인': cause
-            })
-
-        csv_df = pd.DataFrame(csv_data)
-        csv_string = csv_df.to_csv(index=False, encoding='utf-8-sig')
+        csv_buffer = io.BytesIO()
+        export_results([(ticker, None, results, None)], 'csv', csv_buffer,
+                       {ticker: existing_issues}, columns=REPORT_CSV_COLUMNS)
 
         st.download_button(
             label="📊 CSV 데이터 다운로드",
-            data=csv_string,
+            data=csv_buffer,
             file_name=f"data_quality_data_{ticker}_{report_date.strftime('%Y%m%d')}.csv",
             mime="text/csv"
         )
@@ -1275,11 +2210,282 @@ def generate_final_report(results, ticker, client_name, report_date, analyst_nam
         st.info("아직 기록된 이슈가 없습니다.")
 
 
+def show_debug_panel(comparator):
+    """사이드바: 단계별 성능 계측 디버그 패널"""
+    instrumentation = comparator.instrumentation
+
+    def toggle_instrumentation():
+        instrumentation.enabled = st.session_state['debug_instrumentation']
+
+    with st.sidebar.expander("🐞 성능 디버그", expanded=False):
+        st.checkbox("단계별 계측 사용", value=instrumentation.enabled, key="debug_instrumentation",
+                    on_change=toggle_instrumentation, help="계측은 모든 세션이 공유합니다.")
+        st.checkbox("다음 실행 프로파일링", key="debug_profile_next",
+                    help="다음 화면 갱신 한 번 동안 호출 스택을 샘플링하여 flame graph 입력 파일을 만들고 자동으로 해제됩니다.")
+
+        profile = st.session_state.get('debug_profile')
+        if profile:
+            st.download_button("🔥 프로파일 다운로드 (collapsed stacks)", profile, "dq_profile.txt", "text/plain",
+                               key="debug_profile_download")
+
+        if not instrumentation.enabled:
+            return
+
+        snapshot = instrumentation.snapshot()
+        if snapshot['spans']:
+            st.dataframe(pd.DataFrame.from_dict(snapshot['spans'], orient='index'), use_container_width=True)
+        for name, value in snapshot['counters'].items():
+            st.caption(f"{name}: {value:,}")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("JSON", instrumentation.to_json(), "dq_metrics.json", "application/json",
+                               key="debug_json_download")
+        with col2:
+            st.download_button("Prometheus", instrumentation.to_prometheus(), "dq_metrics.prom", "text/plain",
+                               key="debug_prom_download")
+        if st.button("계측 초기화", key="debug_reset"):
+            instrumentation.reset()
+            st.rerun()
+
+
+def show_prewarm_status(prewarmer):
+    """사이드바: 캐시 예열 진행 상황 (진행 중에는 PREWARM_REFRESH_SECONDS마다 갱신)"""
+    status = prewarmer.status()
+    if not status['total']:
+        return
+    with st.sidebar:
+        if status['finished']:
+            _render_prewarm_status(status)
+        else:
+            _prewarm_status_fragment(prewarmer)
+
+
+@st.fragment(run_every=PREWARM_REFRESH_SECONDS)
+def _prewarm_status_fragment(prewarmer):
+    status = prewarmer.status()
+    if status['finished']:
+        # 완료되면 전체를 한 번 다시 그려 주기적 갱신을 멈춤
+        st.rerun()
+    _render_prewarm_status(status)
+
+
+def _render_prewarm_status(status):
+    with st.expander("⚡ 캐시 예열", expanded=not status['finished']):
+        st.progress(status['done'] / status['total'],
+                    text=f"{status['done']:,} / {status['total']:,} 작업 ({status['elapsed']:.0f}초)")
+        st.caption(f"대기 {status['queued']:,} · 실행 중 {len(status['running'])} · 실패 {len(status['failed'])}")
+        for ticker, view in status['running']:
+            st.caption(f"▶ {ticker} {view}")
+        for ticker, view, error in status['failed'][:5]:
+            st.caption(f"❌ {ticker} {view}: {error}")
+
+
+def show_sampling_estimate(report):
+    """층화 표본 기반 불일치율 추정치와 95% 신뢰구간"""
+    st.subheader("🎯 표본 기반 불일치율 추정")
+    overall = report.estimate().iloc[0]
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("추정 불일치율", f"{overall['rate'] * 100:.1f}%")
+    with col2:
+        st.metric("95% 신뢰구간", f"{overall['ci_low'] * 100:.1f}% ~ {overall['ci_high'] * 100:.1f}%")
+    with col3:
+        st.metric("표본 / 모집단", f"{int(overall['sampled']):,} / {int(overall['population']):,}")
+
+    with st.expander("층별 추정 (연도 × 항목)", expanded=False):
+        by_field = report.estimate(['field'])
+        by_year = report.estimate(['year'])
+        percent = {'rate': '{:.1%}', 'ci_low': '{:.1%}', 'ci_high': '{:.1%}'}
+        st.dataframe(by_field.style.format(percent), use_container_width=True, hide_index=True)
+        st.dataframe(by_year.style.format(percent), use_container_width=True, hide_index=True)
+        st.caption(f"불일치가 관측되고 신뢰구간이 넓은 층은 표본을 늘려 추가 추출했습니다. (추출 {report.rounds}회)")
+
+
+# 이상 구간 표시용 컬럼명
+ANOMALY_DISPLAY_COLUMNS = {
+    'start_date': '시작일',
+    'end_date': '종료일',
+    'change_date': '변화 시점',
+    'points': '거래일 수',
+    'kind': '유형',
+    'peak_z': '최대 z-score',
+    'step_ratio': '변화 비율',
+    'median_ratio': 'EODHD/yfinance 비율',
+    'suspected_cause': '추정 원인',
+    'severity': '심각도',
+}
+ANOMALY_KIND_LABELS = {'level_shift': '수준 변화', 'spike': '일회성 튐'}
+
+
+def show_price_anomalies(comparator, ticker):
+    """전체 가격 이력의 이상 구간 (개별 ❌ 행 대신 구간 단위로 요약)"""
+    with st.expander("📉 가격 비율 이상 구간 (전체 이력)", expanded=False):
+        col1, col2 = st.columns(2)
+        with col1:
+            window = st.slider("롤링 창 (거래일)", min_value=5, max_value=63, value=ANOMALY_WINDOW,
+                               key="anomaly_window")
+        with col2:
+            threshold = st.slider("z-score 임계값", min_value=3.0, max_value=12.0, value=ANOMALY_Z_THRESHOLD,
+                                  step=0.5, key="anomaly_threshold")
+
+        incidents, error = comparator.detect_price_anomalies(ticker, window, threshold)
+        if error:
+            st.error(f"이상 구간 탐지 실패: {error}")
+            return
+        if incidents.empty:
+            st.success("임계값을 넘는 이상 구간이 없습니다.")
+            return
+
+        st.caption(f"EODHD 수정종가 / yfinance 종가 로그 비율 기준, 심각도 순 {len(incidents)}개 구간")
+        display_df = incidents.drop(columns=['ticker']).rename(columns=ANOMALY_DISPLAY_COLUMNS)
+        display_df['유형'] = display_df['유형'].map(ANOMALY_KIND_LABELS)
+        st.dataframe(display_df, use_container_width=True, hide_index=True)
+
+
+# 기업 이벤트 대조 표시용 컬럼명
+CORPORATE_ACTION_DISPLAY_COLUMNS = {
+    'action': '이벤트',
+    'status': '상태',
+    'eodhd_date': 'EODHD 날짜',
+    'yfinance_date': 'yfinance 날짜',
+    'eodhd_value': 'EODHD 값',
+    'yfinance_value': 'yfinance 값',
+    'evidence': '근거 (EODHD/yfinance)',
+    'affected_start': '영향 시작일',
+    'affected_end': '영향 종료일',
+    'affected_bars': '영향 거래일 수',
+    'explained_mismatches': '설명되는 종가 불일치',
+}
+CORPORATE_ACTION_LABELS = {'split': '분할', 'dividend': '배당'}
+CORPORATE_ACTION_STATUS_LABELS = {
+    'matched': '✅ 일치',
+    'date_mismatch': '⚠️ 날짜 다름',
+    'value_mismatch': '❌ 값 다름',
+    'missing_eodhd': '❌ EODHD 누락',
+    'missing_yfinance': '❌ yfinance 누락',
+    'unadjusted_eodhd': '❌ EODHD 미반영 (의심)',
+    'unadjusted_yfinance': '❌ yfinance 미반영 (의심)',
+}
+
+
+def show_corporate_actions(comparator, ticker):
+    """분할/배당 이벤트 대조 (어긋난 이벤트 하나가 설명하는 가격 불일치를 함께 표시)"""
+    with st.expander("🧾 기업 이벤트 대조 (분할/배당, 전체 이력)", expanded=False):
+        actions, error = comparator.check_corporate_actions(ticker)
+        if error:
+            st.error(f"기업 이벤트 대조 실패: {error}")
+            return
+        if actions.empty:
+            st.info("두 출처에서 비교할 분할/배당 이벤트가 없습니다.")
+            return
+
+        problems = actions[actions['status'] != 'matched']
+        if problems.empty:
+            st.success(f"분할/배당 이벤트 {len(actions)}개가 두 출처에서 모두 일치합니다.")
+        else:
+            st.caption(f"어긋난 이벤트 {len(problems)}개 / 전체 {len(actions)}개, "
+                       f"종가 불일치 {int(problems['explained_mismatches'].sum()):,}건을 이 이벤트들로 설명")
+        show_all = st.checkbox("일치한 이벤트도 표시", key="corporate_actions_all")
+        display_df = (actions if show_all else problems).drop(columns=['ticker'])
+        display_df = display_df.assign(action=display_df['action'].map(CORPORATE_ACTION_LABELS),
+                                       status=display_df['status'].map(CORPORATE_ACTION_STATUS_LABELS))
+        st.dataframe(display_df.rename(columns=CORPORATE_ACTION_DISPLAY_COLUMNS), use_container_width=True,
+                     hide_index=True)
+
+
+# 출처 쌍별 통계 표시용 컬럼명
+PAIRWISE_DISPLAY_COLUMNS = {
+    'field': '항목',
+    'left': '출처 A',
+    'right': '출처 B',
+    'compared': '공통 날짜',
+    'matches': '일치',
+    'warnings': '경미한 차이',
+    'mismatches': '중대한 차이',
+    'mismatch_rate': '불일치율',
+    'max_difference': '최대 차이',
+}
+
+
+def show_provider_consensus(comparator, ticker, data_type):
+    """등록된 전체 출처 비교 (출처 쌍별 통계와 합의값이 갈리는 셀)"""
+    with st.expander(f"🔀 다중 출처 비교 ({len(comparator.providers)}개 출처, 전체 이력)", expanded=False):
+        alignment, error = comparator.provider_alignment(ticker, data_type)
+        if error:
+            st.error(f"다중 출처 비교 실패: {error}")
+            return
+
+        labels = {name: comparator.providers.get(name).label for name in alignment.providers}
+        pairwise = alignment.pairwise()
+        pairwise[['left', 'right']] = pairwise[['left', 'right']].apply(lambda column: column.map(labels))
+        st.caption(f"출처 {', '.join(labels.values())} / 날짜 {len(alignment.dates):,}개 (출처별 날짜 합집합)")
+        st.dataframe(pairwise.rename(columns=PAIRWISE_DISPLAY_COLUMNS), use_container_width=True, hide_index=True)
+
+        cells = alignment.cells()
+        if cells.empty:
+            st.success("모든 출처 쌍이 허용 오차 안에서 일치합니다.")
+            return
+        st.caption(f"출처 간 차이가 있는 셀 {len(cells):,}개 (합의값 = 출처 값의 중앙값, "
+                   f"다른 출처는 값이 있는 출처가 3개 이상일 때 표시)")
+        cells['outliers'] = cells['outliers'].map(
+            lambda names: ', '.join(labels[name] for name in names.split(',') if name))
+        st.dataframe(cells.rename(columns={'date': '날짜', 'field': '항목', 'consensus': '합의값',
+                                           'providers': '출처 수', 'match': '일치 여부', 'outliers': '다른 출처',
+                                           **labels}),
+                     use_container_width=True, hide_index=True)
+
+
+def show_quality_trends():
+    """품질 추이 페이지"""
+    st.subheader("📈 데이터 품질 추이")
+
+    comparator = get_comparator()
+    store = comparator.metrics_store
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        granularity = st.radio("집계 단위:", ["daily", "weekly"], horizontal=True,
+                               format_func=lambda x: "일별" if x == "daily" else "주별")
+    with col2:
+        trend_types = st.multiselect("데이터 유형:", COMPARISON_DATA_TYPES, default=COMPARISON_DATA_TYPES)
+    with col3:
+        period = st.date_input("조회 기간:", value=(datetime.now().date() - timedelta(days=90), datetime.now().date()))
+
+    start, end = (period[0], period[-1]) if isinstance(period, (list, tuple)) and period else (None, None)
+    metrics_df = store.query(granularity, start=start, end=end, data_types=trend_types)
+
+    if metrics_df.empty:
+        st.info("기록된 품질 지표가 없습니다. 품질 검증을 실행하면 결과가 자동으로 기록됩니다.")
+        return
+
+    totals = metrics_df[['total', 'matches', 'warnings', 'errors']].sum()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("누적 검증 항목", f"{int(totals['total']):,}")
+    with col2:
+        st.metric("평균 정확도", f"{totals['matches'] / max(totals['total'], 1) * 100:.1f}%")
+    with col3:
+        st.metric("검증 종목 수", metrics_df['ticker'].nunique())
+    with col4:
+        st.metric("검증 실행 수", int(metrics_df.groupby('period')['runs'].max().sum()))
+
+    st.markdown("**데이터 유형별 정확도 (%)**")
+    st.line_chart(store.accuracy_trend(granularity, start=start, end=end, data_types=trend_types))
+
+    st.markdown("**종목별 정확도 (최근 기간, 낮은 순)**")
+    latest = metrics_df[metrics_df['period'] == metrics_df['period'].max()]
+    by_ticker = latest.groupby('ticker')[['total', 'matches', 'warnings', 'errors']].sum()
+    by_ticker['정확도 (%)'] = (by_ticker['matches'] / by_ticker['total'] * 100).round(1)
+    st.dataframe(by_ticker.sort_values('정확도 (%)'), use_container_width=True)
+
+
 def show_issue_management():
     """이슈 관리 페이지"""
     st.subheader("🛠️ 이슈 관리")
 
-    comparator = DataComparator()
+    comparator = get_comparator()
     all_issues = comparator.issue_tracker.get_issues()
 
     if not all_issues:
@@ -1351,12 +2557,31 @@ def show_issue_management():
 # 메인 실행
 if __name__ == "__main__":
     # 페이지 네비게이션
-    page = st.sidebar.selectbox("페이지 선택", ["품질 검증", "이슈 관리"])
+    page = st.sidebar.selectbox("페이지 선택", ["품질 검증", "품질 추이", "이슈 관리"])
+
+    comparator = get_comparator()
+    prewarmer = get_prewarmer()
+    if comparator.provider_error:
+        st.sidebar.warning(f"{comparator.provider_error} (기본 출처만 사용)")
+    if comparator.tolerance_error:
+        st.sidebar.warning(f"{comparator.tolerance_error} (기본 허용 오차 사용)")
+    profiling = st.session_state.get('debug_profile_next', False)
+
+    with comparator.instrumentation.profile() if profiling else nullcontext() as profiler:
+        if page == "품질 검증":
+            main()
+        elif page == "품질 추이":
+            show_quality_trends()
+        else:
+            show_issue_management()
 
-    if page == "품질 검증":
-        main()
-    else:
-        show_issue_management()
+    if profiler is not None:
+        st.session_state['debug_profile'] = profiler.collapsed()
+        # 한 번 실행만 프로파일링 (체크박스는 아래 디버그 패널에서 해제된 상태로 다시 그려짐)
+        st.session_state.pop('debug_profile_next', None)
+
+    show_debug_panel(comparator)
+    show_prewarm_status(prewarmer)
     # comparator = DataComparator()
     # ticker_list = comparator.get_ticker_list()
     # print(1)
@@ -0,0 +1,134 @@
+import re
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# 이동 기간 단위 (예: 30D, 12W, 6M, 1Y)
+PERIOD_UNITS = {'D': 'days', 'W': 'weeks', 'M': 'months', 'Y': 'years'}
+
+# 비교 기간: start/end는 'YYYY-MM-DD' (양끝 포함, None이면 열린 구간), last는 이동 기간 (예: '3M')
+# last를 지정하면 기간 끝(end, 없으면 데이터의 마지막 날짜)에서 거슬러 올라간 구간만 비교합니다.
+DateRange = namedtuple('DateRange', ['start', 'end', 'last'], defaults=(None, None, None))
+
+
+def parse_period(text):
+    """'30D', '12W', '6M', '1Y' -> pd.DateOffset (형식이 틀리면 ValueError)"""
+    match = re.fullmatch(r'\s*(\d+)\s*([DWMY])\s*', str(text).upper())
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"기간 형식 오류: {text!r} (예: 30D, 12W, 6M, 1Y)")
+    return pd.DateOffset(**{PERIOD_UNITS[match.group(2)]: int(match.group(1))})
+
+
+def to_day(value):
+    """날짜 값 (문자열, date, Timestamp, datetime64) -> datetime64[D] (None은 None)"""
+    if value is None or value == '':
+        return None
+    return np.datetime64(pd.Timestamp(value).date(), 'D')
+
+
+def make_date_range(start=None, end=None, last=None):
+    """
+    입력 값 검증 후 DateRange (모두 생략하면 None = 전체 이력)
+    날짜는 'YYYY-MM-DD' 문자열로 정규화하므로 결과 캐시 키에 그대로 사용할 수 있습니다.
+    """
+    start, end = to_day(start), to_day(end)
+    if start is not None and end is not None and start > end:
+        raise ValueError(f"시작일({start})이 종료일({end})보다 늦습니다.")
+    if last:
+        parse_period(last)
+        last = str(last).strip().upper()
+    if start is None and end is None and not last:
+        return None
+    return DateRange(None if start is None else str(start), None if end is None else str(end), last or None)
+
+
+def resolve_window(date_range, latest=None):
+    """
+    DateRange -> (시작일, 종료일) datetime64[D] (None이면 열린 구간)
+    latest: 이동 기간의 기준일 (종료일이 없을 때 데이터의 마지막 날짜)
+    """
+    if date_range is None:
+        return None, None
+    start, end = to_day(date_range.start), to_day(date_range.end)
+    if date_range.last:
+        anchor = end if end is not None else latest
+        if anchor is not None:
+            rolling = to_day(pd.Timestamp(anchor) - parse_period(date_range.last)) + np.timedelta64(1, 'D')
+            start = rolling if start is None else max(start, rolling)
+    return start, end
+
+
+class DateIndex:
+    """
+    시계열 프레임의 정렬된 날짜 색인 (로드된 프레임마다 한 번 생성)
+    days/order: 전체 행의 날짜 오름차순 (같은 날짜는 파일 순서)과 그 행 위치
+    dates/rows: 중복을 제거한 날짜와 날짜별 첫 행 위치
+    날짜 구간 조회는 searchsorted 슬라이스이므로 비용이 전체 이력 길이가 아니라 구간 크기에 비례합니다.
+    """
+
+    def __init__(self, dates):
+        days = np.asarray(dates).astype('datetime64[D]')
+        valid = np.flatnonzero(~np.isnat(days))
+        self.order = valid[np.argsort(days[valid], kind='stable')]
+        self.days = days[self.order]
+        self.dates, first = np.unique(self.days, return_index=True)
+        self.rows = self.order[first]
+
+    @classmethod
+    def from_frame(cls, df):
+        return cls(df['Date'].to_numpy())
+
+    def __len__(self):
+        return len(self.dates)
+
+    @property
+    def first(self):
+        return self.dates[0] if len(self.dates) else None
+
+    @property
+    def last(self):
+        return self.dates[-1] if len(self.dates) else None
+
+    def window(self, start=None, end=None):
+        """[start, end] 구간의 dates 위치 slice (양끝 포함)"""
+        lo = 0 if start is None else int(np.searchsorted(self.dates, start, side='left'))
+        hi = len(self.dates) if end is None else int(np.searchsorted(self.dates, end, side='right'))
+        return slice(lo, max(lo, hi))
+
+    def _day_bounds(self, start, end):
+        lo = 0 if start is None else int(np.searchsorted(self.days, start, side='left'))
+        hi = len(self.days) if end is None else int(np.searchsorted(self.days, end, side='right'))
+        return slice(lo, max(lo, hi))
+
+    def window_rows(self, start=None, end=None):
+        """[start, end] 구간의 전체 행 위치 (중복 날짜 포함, 날짜 오름차순)"""
+        return self.order[self._day_bounds(start, end)]
+
+    def window_days(self, start=None, end=None):
+        """[start, end] 구간의 전체 행 날짜 (중복 날짜 포함, 오름차순)"""
+        return self.days[self._day_bounds(start, end)]
+
+    def locate(self, dates, part=None):
+        """dates 각각의 dates 위치 (part slice 안에 없으면 -1)"""
+        if part is None:
+            part = slice(0, len(self.dates))
+        candidates = self.dates[part]
+        positions = np.searchsorted(candidates, dates)
+        found = positions < len(candidates)
+        found[found] = candidates[positions[found]] == dates[found]
+        return np.where(found, positions + part.start, -1)
+
+    def head(self, n, start=None, end=None):
+        """구간의 처음 n개 날짜 slice (n이 None이면 구간 전체)"""
+        window = self.window(start, end)
+        if n is None:
+            return window
+        return slice(window.start, min(window.stop, window.start + n))
+
+    def tail(self, n, start=None, end=None):
+        """구간의 마지막 n개 날짜 slice (n이 None이면 구간 전체)"""
+        window = self.window(start, end)
+        if n is None:
+            return window
+        return slice(max(window.start, window.stop - n), window.stop)
@@ -0,0 +1,260 @@
+import hashlib
+import json
+import os
+import uuid
+
+import numpy as np
+
+# 저장 형식/정규화 방식이 바뀌면 올려서 기존 digest를 모두 다시 계산
+DIGEST_VERSION = 3
+
+# 데이터 유형별 digest 대상 항목
+# 양자화 단위는 항목마다 종목 거래소/통화의 허용 오차 규칙 match_abs를 씁니다 (DataComparator.digest_units).
+# 두 출처의 양자화 값이 같으면 차이가 단위(match_abs) 미만이므로 그 항목의 판정은 ✅입니다.
+# match_abs가 없는 항목(상대 오차 규칙만 있는 경우)은 digest에서 빼고 공통 거래일 전체를 비교합니다.
+# 단위는 트리에 함께 저장하므로 규칙이 바뀌어 단위가 달라지면 트리를 다시 계산합니다.
+DIGEST_FIELDS = {
+    'historical_ohlc': ['Open', 'High', 'Low', 'Close', 'Volume'],
+    'dividends': ['Dividends'],
+}
+
+# 결측값 양자화 표시
+_MISSING = np.iinfo(np.int64).min
+
+# 행 해시 lane별 초기값 (lane 2개 = 128비트)
+_LANE_SEEDS = (np.uint64(0x9E3779B97F4A7C15), np.uint64(0xC2B2AE3D27D4EB4F))
+_MASK64 = (1 << 64) - 1
+
+
+def _hash(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _mix64(x):
+    """splitmix64 finalizer (uint64 배열, 오버플로는 2^64 나머지)"""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def row_hashes(quantized):
+    """양자화 행렬의 행별 128비트 해시 ([행 수, 2] uint64)"""
+    values = quantized.view(np.uint64)
+    lanes = np.empty((len(values), 2), dtype=np.uint64)
+    for lane, seed in enumerate(_LANE_SEEDS):
+        h = np.full(len(values), seed, dtype=np.uint64)
+        for column in range(values.shape[1]):
+            h = _mix64(h ^ values[:, column])
+        lanes[:, lane] = h
+    return lanes
+
+
+def _month_sums(quantized):
+    """월별 행 해시 합계 {YYYY-MM: (lane0, lane1)} (행은 날짜순 정렬 가정)"""
+    if len(quantized) == 0:
+        return {}
+    months = quantized[:, 0].astype('datetime64[D]').astype('datetime64[M]')
+    starts = np.concatenate(([0], np.flatnonzero(months[1:] != months[:-1]) + 1))
+    sums = np.add.reduceat(row_hashes(quantized), starts, axis=0)
+    return {str(months[start]): (int(total[0]), int(total[1])) for start, total in zip(starts, sums)}
+
+
+def _month_digest(lanes):
+    return f"{lanes[0]:016x}{lanes[1]:016x}"
+
+
+def quantize_series(series, units):
+    """
+    정규화된 시계열 (Date + DIGEST_FIELDS 컬럼)을 [일수, 양자화 값...] int64 행렬로 변환
+    units: [[항목, 양자화 단위], ...] (digest 대상 항목만), Date는 1970-01-01 기준 일수, 값은 round(값 / 단위)
+    """
+    series = series.sort_values('Date')
+    columns = [series['Date'].to_numpy().astype('datetime64[D]').astype(np.int64)]
+    for field, unit in units:
+        values = series[field].to_numpy(dtype=np.float64)
+        quantized = np.full(len(values), _MISSING, dtype=np.int64)
+        finite = np.isfinite(values)
+        quantized[finite] = np.round(values[finite] / unit).astype(np.int64)
+        columns.append(quantized)
+    return np.ascontiguousarray(np.column_stack(columns))
+
+
+def _assemble(years, previous_years):
+    """월 digest {연: {월: digest}} -> 연/루트 digest 트리 (월 digest가 모두 같은 연도는 기존 연 digest 재사용)"""
+    tree_years = {}
+    changed_months = 0
+    for year, month_digests in sorted(years.items()):
+        old = previous_years.get(year)
+        if old is not None and old['months'] == month_digests:
+            tree_years[year] = old
+            continue
+        old_months = old['months'] if old else {}
+        changed_months += sum(1 for key, digest in month_digests.items() if old_months.get(key) != digest)
+        tree_years[year] = {
+            'digest': _hash(''.join(month_digests[key] for key in sorted(month_digests)).encode()),
+            'months': month_digests,
+        }
+
+    root = _hash(''.join(f"{year}:{tree_years[year]['digest']}" for year in sorted(tree_years)).encode())
+    return tree_years, root, changed_months
+
+
+def build_tree(quantized, units, previous=None):
+    """
+    연 -> 월 -> 일 digest 트리
+    월 digest는 해당 월 행 해시의 합(2^64 나머지, lane 2개)이므로 행을 추가하면 합에 더하기만 하면 됩니다.
+    연/루트 digest는 하위 digest를 이어 붙인 해시입니다.
+    previous 트리가 있으면 월 digest가 모두 같은 연도는 기존 연 digest를 재사용합니다.
+    units는 양자화 단위로 트리에 함께 저장합니다.
+    """
+    years = {}
+    for month, lanes in _month_sums(quantized).items():
+        years.setdefault(month[:4], {})[month] = _month_digest(lanes)
+
+    tree_years, root, changed_months = _assemble(years, (previous or {}).get('years', {}))
+    return {'version': DIGEST_VERSION, 'units': units, 'root': root, 'years': tree_years,
+            'rows': int(len(quantized)), 'changed_months': changed_months}
+
+
+def extend_tree(previous, quantized):
+    """
+    기존 트리에 추가된 행(quantized)만 반영한 트리 (append된 델타 세그먼트용)
+    해당 월 digest에 새 행 해시 합을 더하고, 바뀐 연도와 루트만 다시 계산합니다.
+    """
+    years = {year: dict(node['months']) for year, node in previous['years'].items()}
+    for month, lanes in _month_sums(quantized).items():
+        months = years.setdefault(month[:4], {})
+        old = months.get(month)
+        if old is not None:
+            lanes = ((int(old[:16], 16) + lanes[0]) & _MASK64, (int(old[16:], 16) + lanes[1]) & _MASK64)
+        months[month] = _month_digest(lanes)
+
+    tree_years, root, changed_months = _assemble(years, previous['years'])
+    return {'version': DIGEST_VERSION, 'units': previous['units'], 'root': root, 'years': tree_years,
+            'rows': int(previous['rows'] + len(quantized)), 'changed_months': changed_months}
+
+
+def diff_trees(left, right):
+    """
+    두 digest 트리 비교
+    루트가 같으면 바로 끝나고, 연 digest가 같은 연도는 하위 월을 보지 않습니다.
+    반환: (양쪽에 모두 있으나 digest가 다른 월 목록, 한쪽에만 있는 월 수)
+    """
+    if left['root'] == right['root']:
+        return [], 0
+
+    differing = []
+    one_sided = 0
+    left_years, right_years = left['years'], right['years']
+    for year in sorted(set(left_years) | set(right_years)):
+        left_year, right_year = left_years.get(year), right_years.get(year)
+        if left_year is None or right_year is None:
+            one_sided += len((left_year or right_year)['months'])
+            continue
+        if left_year['digest'] == right_year['digest']:
+            continue
+        left_months, right_months = left_year['months'], right_year['months']
+        for month in sorted(set(left_months) | set(right_months)):
+            if month not in left_months or month not in right_months:
+                one_sided += 1
+            elif left_months[month] != right_months[month]:
+                differing.append(month)
+    return differing, one_sided
+
+
+class DigestStore:
+    """
+    출처별 정규화 시계열의 digest 트리 저장소
+    <base_dir>/<source>/<data_type>/<ticker>.json 에 원본 파일 시그니처와 함께 저장하며,
+    원본 파일이 바뀌지 않았으면 CSV를 읽지 않고 저장된 트리를 사용합니다.
+    <base_dir>/verified/<data_type>/<ticker>.json 에는 두 출처 루트 쌍별 검증 결과를 저장합니다.
+    """
+
+    def __init__(self, base_dir='./digest_cache'):
+        self.base_dir = base_dir
+        self._memory = {}
+
+    def _path(self, source, ticker, data_type):
+        return os.path.join(self.base_dir, source, data_type, f"{ticker}.json")
+
+    def _read(self, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, path, tree):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(tree, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def get(self, source, ticker, data_type, signature, units, load_series, load_appended=None):
+        """
+        저장된 트리 반환 (원본 시그니처나 양자화 단위가 다르면 load_series()로 다시 계산하여 갱신)
+        units: [[항목, 양자화 단위], ...] (digest 대상 항목)
+        load_series: 정규화 시계열 (Date + DIGEST_FIELDS 컬럼)을 반환하는 함수, 실패 시 None
+        load_appended: 저장된 시그니처 뒤에 추가된 항목(델타 세그먼트) 목록 -> 추가된 행만의 정규화 시계열
+                       기본 파일이 같고 세그먼트만 늘었으면 이 행들만 기존 트리에 더합니다.
+        반환: (트리 또는 None, 다시 계산했는지 여부)
+        """
+        path = self._path(source, ticker, data_type)
+        signature = list(signature) if signature is not None else None
+        units = [[field, float(unit)] for field, unit in units]
+
+        stored = self._memory.get(path)
+        if stored is None:
+            stored = self._read(path)
+        if stored is not None and (stored.get('version') != DIGEST_VERSION or stored.get('units') != units):
+            stored = None
+        if stored is not None and stored.get('signature') == signature:
+            self._memory[path] = stored
+            return stored, False
+
+        if stored is not None and load_appended is not None:
+            appended = self._appended(stored.get('signature'), signature)
+            if appended:
+                series = load_appended(appended)
+                if series is not None:
+                    tree = extend_tree(stored, quantize_series(series, units))
+                    tree['signature'] = signature
+                    self._write(path, tree)
+                    self._memory[path] = tree
+                    return tree, True
+
+        series = load_series()
+        if series is None:
+            return None, False
+
+        tree = build_tree(quantize_series(series, units), units, previous=stored)
+        tree['signature'] = signature
+        self._write(path, tree)
+        self._memory[path] = tree
+        return tree, True
+
+    @staticmethod
+    def _appended(stored, current):
+        """현재 시그니처가 저장된 시그니처 뒤에 항목만 추가된 것이면 추가된 항목 목록 (기본 파일 부분은 앞 2개)"""
+        if not stored or current is None or len(current) <= len(stored) or len(stored) < 2:
+            return None
+        if current[:len(stored)] != stored:
+            return None
+        return current[len(stored):]
+
+    def get_verification(self, ticker, data_type, roots):
+        """두 출처 루트가 같을 때 저장된 검증 결과 (없으면 None)"""
+        stored = self._read(self._path('verified', ticker, data_type))
+        if stored is not None and stored.get('version') == DIGEST_VERSION and stored.get('roots') == list(roots):
+            return stored['verification']
+        return None
+
+    def put_verification(self, ticker, data_type, roots, verification):
+        """검증 결과를 두 출처 루트와 함께 저장"""
+        self._write(self._path('verified', ticker, data_type),
+                    {'version': DIGEST_VERSION, 'roots': list(roots), 'verification': verification})
+
+    def clear(self):
+        """메모리 캐시 비우기 (디스크 파일은 유지)"""
+        self._memory.clear()
@@ -0,0 +1,245 @@
+import csv
+import io
+import os
+import uuid
+from abc import ABC, abstractmethod
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import xlsxwriter
+
+# 내보내기 컬럼 정의 (결과 키, 출력 헤더)
+EXPORT_COLUMNS = [
+    ('ticker', '종목'),
+    ('data_type', '데이터_유형'),
+    ('date', '날짜'),
+    ('field', '항목'),
+    ('category', '구분'),
+    ('eodhd_value', 'EODHD_값'),
+    ('yfinance_value', 'yfinance_값'),
+    ('match', '일치_여부'),
+    ('difference', '차이'),
+    ('cause', '차이_원인'),
+]
+
+# 단일 종목 보고서용 CSV 컬럼 (기존 다운로드 형식 유지)
+REPORT_CSV_COLUMNS = [c for c in EXPORT_COLUMNS if c[0] not in ('ticker', 'data_type')]
+
+# Parquet row group 크기 / XLSX 시트당 최대 행 수
+PARQUET_ROW_GROUP_SIZE = 50_000
+XLSX_MAX_ROWS = 1_048_576
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'parquet': ('application/octet-stream', 'parquet'),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+}
+
+
+def iter_export_rows(batches, issues):
+    """
+    비교 엔진의 (ticker, data_type, results, error) 배치를 내보내기 행으로 변환합니다.
+    issues는 IssueTracker.get_issues() 전체 딕셔너리입니다.
+    """
+    for ticker, data_type, results, error in batches:
+        if not results:
+            continue
+
+        ticker_issues = issues.get(ticker, {})
+        rows = []
+        for result in results:
+            issue_key = f"{result['field']}_{result['date']}"
+            cause = ticker_issues.get(issue_key, {}).get('cause', '') or result.get('existing_cause', '')
+            rows.append({
+                'ticker': ticker,
+                'data_type': data_type,
+                'date': result['date'],
+                'field': result['field'],
+                'category': result.get('category', 'value'),
+                'eodhd_value': result['eodhd_value'],
+                'yfinance_value': result['yfinance_value'],
+                'match': result['match'],
+                'difference': result['difference'],
+                'cause': cause,
+            })
+        yield rows
+
+
+def _numeric_difference(value):
+    """차이 값을 숫자로 변환 (타입 불일치 메시지 등은 None)"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return None
+
+
+class ResultExporter(ABC):
+    """비교 결과를 배치 단위로 기록하는 내보내기 기본 클래스 (open/write_batch/_finish를 구현해야 생성 가능)"""
+
+    def __init__(self, target, columns=None):
+        self.target = target
+        self.columns = columns or EXPORT_COLUMNS
+        self.row_count = 0
+        self._owns_file = isinstance(target, (str, os.PathLike))
+        self._tmp_path = f"{target}.{uuid.uuid4().hex}.tmp" if self._owns_file else None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(commit=exc_type is None)
+        return False
+
+    def _output(self):
+        """출력 대상 (파일 경로면 임시 파일, 아니면 전달된 버퍼)"""
+        return self._tmp_path if self._owns_file else self.target
+
+    @abstractmethod
+    def open(self):
+        """출력 열기 (헤더 기록 포함)"""
+
+    @abstractmethod
+    def write_batch(self, rows):
+        """행 배치 기록"""
+
+    @abstractmethod
+    def _finish(self):
+        """남은 데이터 기록 후 출력 닫기"""
+
+    def close(self, commit=True):
+        self._finish()
+        if self._owns_file:
+            if commit:
+                os.replace(self._tmp_path, self.target)
+            elif os.path.exists(self._tmp_path):
+                os.remove(self._tmp_path)
+
+
+class CsvResultExporter(ResultExporter):
+    """CSV 내보내기 (utf-8-sig, 행 단위 스트리밍)"""
+
+    def open(self):
+        if self._owns_file:
+            self._file = open(self._output(), 'w', encoding='utf-8-sig', newline='')
+        else:
+            self._file = io.TextIOWrapper(self.target, encoding='utf-8-sig', newline='', write_through=True)
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([header for _, header in self.columns])
+
+    def write_batch(self, rows):
+        keys = [key for key, _ in self.columns]
+        for row in rows:
+            values = [row.get(key, '') for key in keys]
+            if 'difference' in keys:
+                idx = keys.index('difference')
+                values[idx] = values[idx] if values[idx] != 0 else ''
+            self._writer.writerow(values)
+        self.row_count += len(rows)
+
+    def _finish(self):
+        if self._owns_file:
+            self._file.close()
+        else:
+            # 호출자의 버퍼는 닫지 않음
+            self._file.flush()
+            self._file.detach()
+
+
+class ParquetResultExporter(ResultExporter):
+    """Parquet 내보내기 (row group 단위로 누적 후 기록)"""
+
+    def open(self):
+        fields = []
+        for key, _ in self.columns:
+            fields.append(pa.field(key, pa.float64() if key == 'difference' else pa.string()))
+        self._schema = pa.schema(fields)
+        self._writer = pq.ParquetWriter(self._output(), self._schema, compression='zstd')
+        self._buffer = {key: [] for key, _ in self.columns}
+        self._buffered = 0
+
+    def write_batch(self, rows):
+        for row in rows:
+            for key in self._buffer:
+                value = row.get(key)
+                if key == 'difference':
+                    value = _numeric_difference(value)
+                elif value is not None:
+                    value = str(value)
+                self._buffer[key].append(value)
+        self._buffered += len(rows)
+        self.row_count += len(rows)
+
+        if self._buffered >= PARQUET_ROW_GROUP_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffered:
+            return
+        table = pa.Table.from_pydict(self._buffer, schema=self._schema)
+        self._writer.write_table(table)
+        self._buffer = {key: [] for key in self._buffer}
+        self._buffered = 0
+
+    def _finish(self):
+        self._flush()
+        self._writer.close()
+
+
+class XlsxResultExporter(ResultExporter):
+    """XLSX 내보내기 (xlsxwriter constant_memory 모드, 시트당 최대 행 초과 시 새 시트)"""
+
+    def open(self):
+        self._workbook = xlsxwriter.Workbook(self._output(), {'constant_memory': True})
+        self._header_format = self._workbook.add_format({'bold': True, 'bg_color': '#e9ecef'})
+        self._sheet_index = 0
+        self._new_sheet()
+
+    def _new_sheet(self):
+        self._sheet_index += 1
+        self._sheet = self._workbook.add_worksheet(f"results_{self._sheet_index}")
+        for col, (_, header) in enumerate(self.columns):
+            self._sheet.write_string(0, col, header, self._header_format)
+        self._row = 1
+
+    def write_batch(self, rows):
+        keys = [key for key, _ in self.columns]
+        for row in rows:
+            if self._row >= XLSX_MAX_ROWS:
+                self._new_sheet()
+            for col, key in enumerate(keys):
+                value = row.get(key)
+                if key == 'difference':
+                    number = _numeric_difference(value)
+                    if number is not None:
+                        self._sheet.write_number(self._row, col, number)
+                    elif value not in (None, ''):
+                        self._sheet.write_string(self._row, col, str(value))
+                elif value not in (None, ''):
+                    self._sheet.write_string(self._row, col, str(value))
+            self._row += 1
+        self.row_count += len(rows)
+
+    def _finish(self):
+        self._workbook.close()
+
+
+_EXPORTERS = {
+    'csv': CsvResultExporter,
+    'parquet': ParquetResultExporter,
+    'xlsx': XlsxResultExporter,
+}
+
+
+def open_exporter(fmt, target, columns=None):
+    """형식에 맞는 내보내기 객체 생성 (target: 파일 경로 또는 바이너리 버퍼)"""
+    if fmt not in _EXPORTERS:
+        raise ValueError(f"지원하지 않는 내보내기 형식입니다: {fmt}")
+    return _EXPORTERS[fmt](target, columns=columns)
+
+
+def export_results(batches, fmt, target, issues, columns=None):
+    """비교 결과 배치를 순차적으로 내보내고 기록된 행 수를 반환"""
+    with open_exporter(fmt, target, columns=columns) as exporter:
+        for rows in iter_export_rows(batches, issues):
+            exporter.write_batch(rows)
+    return exporter.row_count
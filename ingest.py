@@ -0,0 +1,557 @@
+import asyncio
+import json
+import os
+import random
+import time
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+import pandas as pd
+
+from payload_archive import ARCHIVE_SUFFIXES, archive_suffix, encode_archive
+from timeseries_store import TimeSeriesStore
+from trading_calendar import yfinance_symbol
+
+EODHD_BASE_URL = 'https://eodhd.com/api'
+YAHOO_BASE_URL = 'https://query2.finance.yahoo.com'
+YAHOO_COOKIE_URL = 'https://fc.yahoo.com'
+
+# 동시 요청 수 / 초당 요청 수 / 순간 허용 요청 수 (EODHD 기본 한도 1,000회/분 이내)
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RATE = 15.0
+DEFAULT_BURST = 15
+
+# 재시도: 최대 시도 횟수, 지수 백오프 기준/상한 (초), 재시도 대상 HTTP 상태
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+REQUEST_TIMEOUT = 30.0
+
+INGEST_SOURCES = ['eodhd', 'yfinance']
+INGEST_DATA_TYPES = ['historical_ohlc', 'dividends', 'fundamentals', 'company_overview',
+                     'income_statement', 'balance_sheet', 'cash_flow', 'market_cap']
+
+# 데이터 유형 -> 요청 엔드포인트 (같은 엔드포인트의 유형은 한 번의 요청으로 받음)
+ENDPOINTS = {
+    'eodhd': {
+        'historical_ohlc': 'eod',
+        'dividends': 'div',
+        'market_cap': 'historical-market-cap',
+        'fundamentals': 'fundamentals',
+        'company_overview': 'fundamentals',
+        'income_statement': 'fundamentals',
+        'balance_sheet': 'fundamentals',
+        'cash_flow': 'fundamentals',
+    },
+    'yfinance': {
+        'historical_ohlc': 'chart_history',
+        'dividends': 'chart_dividends',
+        'fundamentals': 'info',
+        'company_overview': 'info',
+        'market_cap': 'info',
+        'income_statement': 'timeseries_income_statement',
+        'balance_sheet': 'timeseries_balance_sheet',
+        'cash_flow': 'timeseries_cash_flow',
+    },
+}
+
+# 시작일(from/period1)을 지정해 일부 구간만 받을 수 있는 엔드포인트 (증분 수집)
+RANGE_ENDPOINTS = {'eod', 'div', 'historical-market-cap', 'chart_history', 'chart_dividends'}
+
+# EODHD fundamentals 응답 안의 재무제표 위치
+EODHD_STATEMENTS = {
+    'income_statement': 'Income_Statement',
+    'balance_sheet': 'Balance_Sheet',
+    'cash_flow': 'Cash_Flow',
+}
+
+# yfinance 수집 설정 (yfinance Ticker.history(period='5y') / quarterly 재무제표 / info와 같은 형식)
+YF_HISTORY_RANGE = '5y'
+YF_INFO_MODULES = ['financialData', 'quoteType', 'defaultKeyStatistics', 'assetProfile', 'summaryDetail']
+YF_OVERVIEW_KEYS = ['symbol', 'longName', 'sector', 'industry', 'country', 'website', 'longBusinessSummary']
+YF_STATEMENTS = {
+    # 데이터 유형: (yfinance.const.fundamentals_keys 키, 항목명 변환 시 약어)
+    'income_statement': ('financials', ['EBIT', 'EBITDA', 'EPS', 'NI']),
+    'balance_sheet': ('balance-sheet', ['PPE']),
+    'cash_flow': ('cash-flow', ['PPE']),
+}
+YF_TIMESCALE = 'quarterly'
+
+
+class IngestError(Exception):
+    """재시도하지 않는 수집 오류 (4xx 응답, 응답 형식 오류 등)"""
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지고 최대 burst개까지 쌓이는 토큰 버킷 (요청 1건 = 토큰 1개)"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def write_atomic(path, content):
+    """같은 디렉터리의 임시 파일에 쓴 뒤 교체 (읽는 쪽은 이전 파일 또는 새 파일만 봄)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def json_bytes(data):
+    return json.dumps(data, indent=4, ensure_ascii=False).encode('utf-8')
+
+
+def csv_bytes(df, **kwargs):
+    return df.to_csv(**kwargs).encode('utf-8')
+
+
+# ---- EODHD 응답 -> 파일 ----
+
+def eodhd_files(endpoint, payload, data_types):
+    """EODHD 응답을 데이터 유형별 파일 내용으로 변환 (기존 ./data 파일과 같은 형식)"""
+    if endpoint in ('eod', 'div'):
+        if not isinstance(payload, list):
+            raise IngestError(f"EODHD {endpoint} 응답 형식 오류")
+        return {data_types[0]: csv_bytes(pd.DataFrame(payload))}
+    if endpoint == 'historical-market-cap':
+        if not isinstance(payload, dict):
+            raise IngestError("EODHD historical-market-cap 응답 형식 오류")
+        return {'market_cap': csv_bytes(pd.DataFrame(payload))}
+
+    if not isinstance(payload, dict) or 'General' not in payload:
+        raise IngestError("EODHD fundamentals 응답 형식 오류")
+    files = {}
+    for data_type in data_types:
+        if data_type == 'fundamentals':
+            files[data_type] = json_bytes(payload)
+        elif data_type == 'company_overview':
+            files[data_type] = json_bytes(payload['General'])
+        else:
+            statement = payload.get('Financials', {}).get(EODHD_STATEMENTS[data_type])
+            if statement is not None:
+                files[data_type] = json_bytes(statement)
+    return files
+
+
+# ---- Yahoo 응답 -> 파일 (yfinance 저장 형식) ----
+
+def _chart_result(payload):
+    try:
+        return payload['chart']['result'][0]
+    except (KeyError, IndexError, TypeError):
+        raise IngestError("Yahoo chart 응답 형식 오류")
+
+
+def _local_dates(timestamps, tz):
+    """epoch 초 -> 거래소 현지 자정 (yfinance 일봉 인덱스와 같음)"""
+    return pd.to_datetime(timestamps, unit='s', utc=True).tz_convert(tz).normalize()
+
+
+def chart_history_frame(payload):
+    """chart 응답 -> yfinance history(auto_adjust=True) 프레임 (Date 인덱스)"""
+    result = _chart_result(payload)
+    tz = result['meta'].get('exchangeTimezoneName') or 'UTC'
+    timestamps = result.get('timestamp') or []
+    quote = result['indicators']['quote'][0]
+    adjclose = result['indicators'].get('adjclose', [{}])[0].get('adjclose')
+
+    frame = pd.DataFrame({field: pd.to_numeric(pd.Series(quote[field], dtype=object), errors='coerce')
+                          for field in ('open', 'high', 'low', 'close', 'volume')})
+    ratio = (pd.to_numeric(pd.Series(adjclose, dtype=object), errors='coerce') / frame['close']
+             if adjclose is not None else 1.0)
+
+    dates = _local_dates(timestamps, tz)
+    history = pd.DataFrame({
+        'Open': frame['open'] * ratio,
+        'High': frame['high'] * ratio,
+        'Low': frame['low'] * ratio,
+        'Close': frame['close'] * ratio,
+        'Volume': frame['volume'].fillna(0).astype('int64'),
+        'Dividends': 0.0,
+        'Stock Splits': 0.0,
+    })
+    history.index = pd.Index(dates, name='Date')
+    history = history[history[['Open', 'High', 'Low', 'Close']].notna().any(axis=1)]
+
+    events = result.get('events', {})
+    for event in events.get('dividends', {}).values():
+        day = _local_dates([event['date']], tz)[0]
+        if day in history.index:
+            history.loc[day, 'Dividends'] = float(event['amount'])
+    for event in events.get('splits', {}).values():
+        day = _local_dates([event['date']], tz)[0]
+        if day in history.index:
+            history.loc[day, 'Stock Splits'] = event['numerator'] / event['denominator']
+    return history
+
+
+def chart_dividends_frame(payload):
+    """chart 응답의 배당 이벤트 -> yfinance dividends 시리즈 (Date, Dividends)"""
+    result = _chart_result(payload)
+    tz = result['meta'].get('exchangeTimezoneName') or 'UTC'
+    events = sorted(result.get('events', {}).get('dividends', {}).values(), key=lambda event: event['date'])
+    dividends = pd.Series([float(event['amount']) for event in events], name='Dividends', dtype='float64')
+    dividends.index = pd.Index(_local_dates([event['date'] for event in events], tz), name='Date')
+    return dividends
+
+
+def flatten_info(payload):
+    """quoteSummary/quote 응답 -> yfinance Ticker.info 형식 dict (모듈 한 단계 평탄화, raw 값 사용)"""
+    info = {}
+    for key in ('quoteSummary', 'quoteResponse'):
+        results = (payload.get(key) or {}).get('result') or []
+        for result in results:
+            for name, value in result.items():
+                if isinstance(value, dict):
+                    info.update({k: v for k, v in value.items() if v is not None})
+                elif value is not None:
+                    info[name] = value
+
+    def _raw(value):
+        if isinstance(value, dict) and 'raw' in value:
+            return value['raw']
+        if isinstance(value, list):
+            return [_raw(item) for item in value]
+        if isinstance(value, dict):
+            return {k: _raw(v) for k, v in value.items()}
+        if isinstance(value, str):
+            return value.replace('\xa0', ' ')
+        return value
+
+    return {key: _raw(value) for key, value in info.items()}
+
+
+def info_files(info, data_types, as_of=None):
+    """info -> fundamentals / company_overview / market_cap 파일 내용"""
+    files = {}
+    for data_type in data_types:
+        if data_type == 'fundamentals':
+            files[data_type] = json_bytes(info)
+        elif data_type == 'company_overview':
+            files[data_type] = json_bytes({key: info.get(key) for key in YF_OVERVIEW_KEYS})
+        elif data_type == 'market_cap' and info.get('marketCap') is not None:
+            as_of = as_of or datetime.now(timezone.utc).strftime('%Y-%m-%d')
+            files[data_type] = json_bytes([{'date': as_of, 'marketCap': info['marketCap']}])
+    return files
+
+
+def statement_keys(data_type):
+    """재무제표 유형별 Yahoo 시계열 키 목록 (yfinance가 쓰는 순서)"""
+    from yfinance.const import fundamentals_keys
+    return list(dict.fromkeys(fundamentals_keys[YF_STATEMENTS[data_type][0]]))
+
+
+def statement_titles(data_type, keys):
+    """시계열 키 -> yfinance 재무제표 항목명 (예: TotalRevenue -> Total Revenue)"""
+    from yfinance.utils import camel2title
+    return camel2title(keys, sep=' ', acronyms=YF_STATEMENTS[data_type][1])
+
+
+def timeseries_frame(payload, data_type, keys):
+    """fundamentals-timeseries 응답 -> yfinance quarterly 재무제표 프레임 (항목 x 기준일, 최신일 우선)"""
+    try:
+        results = payload['timeseries']['result']
+    except (KeyError, TypeError):
+        raise IngestError("Yahoo timeseries 응답 형식 오류")
+
+    rows = {}
+    for result in results:
+        for name, values in result.items():
+            if name in ('meta', 'timestamp') or not name.startswith(YF_TIMESCALE):
+                continue
+            rows[name[len(YF_TIMESCALE):]] = {
+                pd.Timestamp(value['asOfDate']): float(value['reportedValue']['raw'])
+                for value in values or [] if value is not None
+            }
+
+    ordered = [key for key in keys if key in rows]
+    frame = pd.DataFrame([rows[key] for key in ordered], index=ordered, dtype='float64')
+    frame = frame[sorted(frame.columns, reverse=True)]
+    # yfinance 저장 파일의 열 이름은 Timestamp 문자열 ('2025-06-30 00:00:00')
+    frame.columns = [str(column) for column in frame.columns]
+    frame.index = statement_titles(data_type, ordered) if ordered else frame.index
+    return frame
+
+
+class IngestReport:
+    """수집 결과 (파일 단위 행 + 요청 통계)"""
+
+    # status: ok(전체 교체) / appended(델타 추가) / unchanged(새 행 없음) / restated(과거 값 변경 -> 전체 교체)
+    #         / missing(응답에 데이터 없음) / error
+    COLUMNS = ['source', 'ticker', 'data_type', 'path', 'status', 'rows', 'bytes', 'error']
+
+    def __init__(self):
+        self.rows = []
+        self.requests = 0
+        self.retries = 0
+        self.elapsed = 0.0
+
+    def add(self, source, ticker, data_type, path=None, status='ok', size=0, error=None, rows=None):
+        self.rows.append({'source': source, 'ticker': ticker, 'data_type': data_type, 'path': path,
+                          'status': status, 'rows': rows, 'bytes': size, 'error': error})
+
+    def frame(self):
+        return pd.DataFrame(self.rows, columns=self.COLUMNS)
+
+    def counts(self):
+        frame = self.frame()
+        return frame['status'].value_counts().to_dict() if not frame.empty else {}
+
+
+class Ingestor:
+    """
+    EODHD/yfinance 원본 파일 동시 수집기
+    하나의 httpx.AsyncClient(연결 풀)를 공유하고, 동시 요청 수(semaphore)와 초당 요청 수(토큰 버킷)를 제한합니다.
+    429/5xx/연결 오류는 지수 백오프(Retry-After 우선)로 재시도하며, 파일은 임시 파일 -> os.replace로 교체합니다.
+    파일 경로는 comparator.source_file_path를 사용하므로 대시보드가 읽는 위치와 같습니다.
+    append=True이면 시계열(가격/배당/시가총액)은 high-water mark 근처부터만 받아 델타 세그먼트로 추가합니다.
+    archive=True이면 시계열이 아닌 JSON(펀더멘털/재무제표)은 압축 보관 형식(.json.zst 또는 .json.gz)으로 저장합니다.
+    """
+
+    def __init__(self, comparator, api_token=None, eodhd_base_url=EODHD_BASE_URL, yahoo_base_url=YAHOO_BASE_URL,
+                 yahoo_cookie_url=YAHOO_COOKIE_URL, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE,
+                 burst=DEFAULT_BURST, max_attempts=MAX_ATTEMPTS, timeout=REQUEST_TIMEOUT, transport=None,
+                 append=False, archive=False):
+        self.comparator = comparator
+        self.series_store = getattr(comparator, 'series_store', None) or TimeSeriesStore()
+        self.append = append
+        self.archive = archive
+        self.api_token = api_token or os.environ.get('EODHD_API_TOKEN', '')
+        self.eodhd_base_url = eodhd_base_url.rstrip('/')
+        self.yahoo_base_url = yahoo_base_url.rstrip('/')
+        self.yahoo_cookie_url = yahoo_cookie_url
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.transport = transport
+
+    def run(self, tickers, data_types=INGEST_DATA_TYPES, sources=INGEST_SOURCES):
+        """동기 진입점 (배치 실행기용)"""
+        return asyncio.run(self.ingest(tickers, data_types, sources))
+
+    async def ingest(self, tickers, data_types=INGEST_DATA_TYPES, sources=INGEST_SOURCES):
+        report = IngestReport()
+        started = time.perf_counter()
+        self._report = report
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._bucket = TokenBucket(self.rate, self.burst)
+        self._crumb = None
+        self._crumb_lock = asyncio.Lock()
+
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        headers = {'User-Agent': 'Mozilla/5.0 (data-quality-report ingest)'}
+        async with httpx.AsyncClient(limits=limits, timeout=self.timeout, headers=headers,
+                                     transport=self.transport, follow_redirects=True) as client:
+            self._client = client
+            jobs = []
+            for source in sources:
+                groups = {}
+                for data_type in data_types:
+                    groups.setdefault(ENDPOINTS[source][data_type], []).append(data_type)
+                for ticker in tickers:
+                    for endpoint, group in groups.items():
+                        jobs.append((source, ticker, endpoint, group))
+            outcomes = await asyncio.gather(*(self._run_job(*job) for job in jobs), return_exceptions=True)
+
+        # 예상하지 못한 오류도 해당 요청만 실패로 기록 (다른 종목의 수집 결과는 유지)
+        for (source, ticker, _, group), outcome in zip(jobs, outcomes):
+            if isinstance(outcome, Exception):
+                for data_type in group:
+                    report.add(source, ticker, data_type, status='error', error=f"{type(outcome).__name__}: {outcome}")
+
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    async def _run_job(self, source, ticker, endpoint, data_types):
+        """요청 1건(+변환) -> 데이터 유형별 파일 교체. 실패해도 기존 파일은 그대로 둠"""
+        since = None
+        if self.append and endpoint in RANGE_ENDPOINTS:
+            path = self.comparator.source_file_path(ticker, data_types[0], source)
+            since = await asyncio.to_thread(self.series_store.fetch_start, path,
+                                            self.series_store.layout(source, data_types[0]))
+
+        try:
+            files = await self._fetch(source, ticker, endpoint, data_types, since)
+        except (IngestError, httpx.HTTPError) as e:
+            for data_type in data_types:
+                self._report.add(source, ticker, data_type, status='error', error=str(e) or type(e).__name__)
+            return
+
+        for data_type in data_types:
+            content = files.get(data_type)
+            if content is None:
+                self._report.add(source, ticker, data_type, status='missing', error="응답에 데이터 없음")
+                continue
+            path = self.comparator.source_file_path(ticker, data_type, source)
+            layout = self.series_store.layout(source, data_type)
+            if layout is None:
+                path, size = await asyncio.to_thread(self._write_payload, path, content)
+                self._report.add(source, ticker, data_type, path=path, size=size)
+                continue
+            if not self.append:
+                await asyncio.to_thread(self.series_store.write_base, path, content)
+                self._report.add(source, ticker, data_type, path=path, size=len(content))
+                continue
+
+            status, rows = await asyncio.to_thread(self.series_store.append, path, content, layout)
+            if status == 'restated' and since is not None:
+                # 겹치는 구간의 과거 값이 바뀜 (분할/배당으로 수정주가 재계산 등) -> 전체 이력을 다시 받아 교체
+                try:
+                    content = (await self._fetch(source, ticker, endpoint, [data_type], None)).get(data_type)
+                except (IngestError, httpx.HTTPError) as e:
+                    self._report.add(source, ticker, data_type, status='error', error=str(e) or type(e).__name__)
+                    continue
+                if content is None:
+                    self._report.add(source, ticker, data_type, status='missing', error="응답에 데이터 없음")
+                    continue
+                await asyncio.to_thread(self.series_store.write_base, path, content)
+            elif status == 'restated':
+                await asyncio.to_thread(self.series_store.write_base, path, content)
+            self._report.add(source, ticker, data_type, path=path,
+                             status='ok' if status == 'created' else status, size=len(content), rows=rows)
+
+    def _write_payload(self, path, content):
+        """시계열이 아닌 파일 교체 (보관 모드면 압축 형식으로 쓰고, 다른 형식으로 남은 같은 파일은 삭제)"""
+        target = path
+        if self.archive and path.endswith('.json'):
+            target, content = path + archive_suffix(), encode_archive(json.loads(content))
+        write_atomic(target, content)
+        for stale in [path] + [path + suffix for suffix in ARCHIVE_SUFFIXES]:
+            if stale != target and os.path.exists(stale):
+                os.remove(stale)
+        return target, len(content)
+
+    async def _fetch(self, source, ticker, endpoint, data_types, since=None):
+        """요청 + 파일 내용 변환 (응답 구조가 예상과 다르면 IngestError)"""
+        try:
+            if source == 'eodhd':
+                return await self._fetch_eodhd(ticker, endpoint, data_types, since)
+            return await self._fetch_yahoo(yfinance_symbol(ticker), endpoint, data_types, since)
+        except (IngestError, httpx.HTTPError):
+            raise
+        except (KeyError, IndexError, TypeError, AttributeError, ValueError, ZeroDivisionError) as e:
+            # 빈 목록/None 등 형식이 어긋난 응답을 변환하다 난 오류
+            raise IngestError(f"{source} {endpoint} 응답 형식 오류: {type(e).__name__}: {e}") from e
+
+    async def _request(self, url, params=None):
+        """제한/재시도를 거친 GET 요청 (재시도 불가 상태는 IngestError)"""
+        for attempt in range(1, self.max_attempts + 1):
+            delay = None
+            await self._bucket.acquire()
+            async with self._semaphore:
+                self._report.requests += 1
+                try:
+                    response = await self._client.get(url, params=params)
+                except httpx.TransportError as e:
+                    if attempt == self.max_attempts:
+                        raise IngestError(f"연결 오류: {type(e).__name__} ({url})")
+                else:
+                    if response.status_code < 400:
+                        return response
+                    if response.status_code not in RETRY_STATUSES or attempt == self.max_attempts:
+                        raise IngestError(f"HTTP {response.status_code} ({url})")
+                    delay = self._retry_after(response)
+
+            if delay is None:
+                # full jitter: 0 ~ 기준 * 2^(시도-1)
+                delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1)))
+            self._report.retries += 1
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _retry_after(response):
+        value = response.headers.get('Retry-After')
+        try:
+            return min(BACKOFF_MAX, max(0.0, float(value))) if value is not None else None
+        except ValueError:
+            return None
+
+    async def _get_json(self, url, params=None):
+        response = await self._request(url, params)
+        try:
+            return response.json()
+        except ValueError:
+            raise IngestError(f"JSON 응답이 아닙니다 ({url})")
+
+    async def _fetch_eodhd(self, ticker, endpoint, data_types, since=None):
+        params = {'api_token': self.api_token, 'fmt': 'json'}
+        if since is not None:
+            params['from'] = since
+        payload = await self._get_json(f"{self.eodhd_base_url}/{endpoint}/{ticker}", params)
+        return eodhd_files(endpoint, payload, data_types)
+
+    async def _yahoo_crumb(self):
+        """quoteSummary용 crumb (실행당 한 번, 쿠키는 클라이언트가 유지)"""
+        async with self._crumb_lock:
+            if self._crumb is None:
+                if self.yahoo_cookie_url:
+                    try:
+                        await self._client.get(self.yahoo_cookie_url)
+                    except httpx.HTTPError:
+                        pass
+                response = await self._request(f"{self.yahoo_base_url}/v1/test/getcrumb")
+                self._crumb = response.text.strip()
+            return self._crumb
+
+    async def _fetch_yahoo(self, symbol, endpoint, data_types, since=None):
+        base = self.yahoo_base_url
+        if endpoint in ('chart_history', 'chart_dividends'):
+            history = endpoint == 'chart_history'
+            params = {'interval': '1d', 'events': 'div,splits', 'includeAdjustedClose': 'true'}
+            if since is not None:
+                params['period1'] = int(pd.Timestamp(since, tz='UTC').timestamp())
+                params['period2'] = int(pd.Timestamp.now(tz='UTC').ceil('D').timestamp())
+            else:
+                params['range'] = YF_HISTORY_RANGE if history else 'max'
+            payload = await self._get_json(f"{base}/v8/finance/chart/{symbol}", params)
+            if history:
+                return {'historical_ohlc': csv_bytes(chart_history_frame(payload))}
+            return {'dividends': csv_bytes(chart_dividends_frame(payload))}
+
+        if endpoint == 'info':
+            crumb = await self._yahoo_crumb()
+            summary = await self._get_json(f"{base}/v10/finance/quoteSummary/{symbol}",
+                                           {'modules': ','.join(YF_INFO_MODULES), 'formatted': 'false',
+                                            'symbol': symbol, 'crumb': crumb})
+            quote = await self._get_json(f"{base}/v7/finance/quote",
+                                         {'symbols': symbol, 'formatted': 'false', 'crumb': crumb})
+            info = flatten_info({**summary, **quote})
+            if not info:
+                raise IngestError(f"Yahoo info 응답에 데이터 없음 ({symbol})")
+            return info_files(info, data_types)
+
+        data_type = data_types[0]
+        keys = statement_keys(data_type)
+        period2 = int(pd.Timestamp.now(tz='UTC').ceil('D').timestamp())
+        params = {'symbol': symbol, 'type': ','.join(YF_TIMESCALE + key for key in keys),
+                  'period1': int(datetime(2016, 12, 31, tzinfo=timezone.utc).timestamp()), 'period2': period2}
+        payload = await self._get_json(f"{base}/ws/fundamentals-timeseries/v1/finance/timeseries/{symbol}", params)
+        frame = timeseries_frame(payload, data_type, keys)
+        if frame.empty:
+            return {}
+        return {data_type: csv_bytes(frame, index_label='index')}
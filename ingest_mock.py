@@ -0,0 +1,256 @@
+"""
+수집기(ingest.py) 오프라인 테스트용 목 서버
+./data, ./yfinance_data 의 기존 파일을 EODHD / Yahoo API 응답 형식으로 되돌려 제공합니다.
+--latency, --fail-rate 로 응답 지연과 429/503 오류를 흉내 내어 재시도/동시성 동작을 확인할 수 있습니다.
+
+    python ingest_mock.py --port 8765
+    python batch_runner.py ingest --eodhd-url http://127.0.0.1:8765/api --yahoo-url http://127.0.0.1:8765 \
+        --eodhd-dir /tmp/ingest/data --yfinance-dir /tmp/ingest/yfinance_data
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+
+import numpy as np
+import pandas as pd
+import tornado.web
+
+from ingest import EODHD_STATEMENTS, YF_STATEMENTS, YF_TIMESCALE, statement_keys, statement_titles
+from payload_archive import read_payload, resolve_payload
+
+# Yahoo 티커 접미사 -> 거래소 시간대 (실제 API는 chart meta에 포함)
+EXCHANGE_TIMEZONES = {
+    '': 'America/New_York',
+    'AS': 'Europe/Amsterdam',
+    'AX': 'Australia/Sydney',
+    'BR': 'Europe/Brussels',
+    'CO': 'Europe/Copenhagen',
+    'DE': 'Europe/Berlin',
+    'HK': 'Asia/Hong_Kong',
+    'L': 'Europe/London',
+    'LS': 'Europe/Lisbon',
+    'MC': 'Europe/Madrid',
+    'MI': 'Europe/Rome',
+    'NZ': 'Pacific/Auckland',
+    'OL': 'Europe/Oslo',
+    'PA': 'Europe/Paris',
+    'SI': 'Asia/Singapore',
+    'ST': 'Europe/Stockholm',
+    'SW': 'Europe/Zurich',
+    'T': 'Asia/Tokyo',
+    'TA': 'Asia/Jerusalem',
+    'TO': 'America/Toronto',
+    'VI': 'Europe/Vienna',
+}
+
+
+def _records(df):
+    """NaN -> None, numpy 스칼라 -> 파이썬 값"""
+    return json.loads(df.to_json(orient='records', double_precision=15))
+
+
+def _epoch(dates):
+    """yfinance 날짜 문자열 (현지 시각 + 오프셋) -> epoch 초"""
+    return (pd.to_datetime(dates, utc=True).astype('int64') // 10**9).tolist()
+
+
+class MockHandler(tornado.web.RequestHandler):
+    def initialize(self, settings):
+        self.mock = settings
+
+    async def prepare(self):
+        if self.mock['latency']:
+            await asyncio.sleep(self.mock['latency'])
+        if random.random() < self.mock['fail_rate']:
+            status = random.choice([429, 503])
+            if status == 429:
+                self.set_header('Retry-After', '0.1')
+            self.send_error(status)
+
+    def path_for(self, source, symbol, data_type):
+        """API 심볼의 원본 파일 경로 (파일명 규칙은 DataComparator와 같음, 압축 보관 파일 포함)"""
+        base_dir = self.mock['eodhd_dir'] if source == 'eodhd' else self.mock['yfinance_dir']
+        file_name = os.path.basename(self.mock['comparator']._get_file_path(source, symbol, data_type))
+        return resolve_payload(os.path.join(base_dir, file_name))
+
+    def read_json(self, path):
+        if not os.path.exists(path):
+            raise tornado.web.HTTPError(404)
+        return read_payload(path)
+
+    def read_csv(self, path, **kwargs):
+        if not os.path.exists(path):
+            raise tornado.web.HTTPError(404)
+        return pd.read_csv(path, float_precision='round_trip', **kwargs)
+
+    def write_json(self, data):
+        self.set_header('Content-Type', 'application/json')
+        self.finish(json.dumps(data, allow_nan=False))
+
+
+class EodhdHandler(MockHandler):
+    def get(self, endpoint, symbol):
+        if not self.get_query_argument('api_token', None):
+            raise tornado.web.HTTPError(401)
+        since = self.get_query_argument('from', '')
+        if endpoint in ('eod', 'div'):
+            data_type = 'historical_ohlc' if endpoint == 'eod' else 'dividends'
+            df = self.read_csv(self.path_for('eodhd', symbol, data_type), index_col=0)
+            self.write_json(_records(df[df['date'] >= since]))
+        elif endpoint == 'historical-market-cap':
+            df = self.read_csv(self.path_for('eodhd', symbol, 'market_cap'), index_col=0)
+            columns = [column for column in df.columns if df.at['date', column] >= since]
+            self.write_json({str(i): {'date': df.at['date', column], 'value': int(df.at['value', column])}
+                             for i, column in enumerate(columns)})
+        elif endpoint == 'fundamentals':
+            fundamentals = self.read_json(self.path_for('eodhd', symbol, 'fundamentals'))
+            for data_type, key in EODHD_STATEMENTS.items():
+                path = self.path_for('eodhd', symbol, data_type)
+                if os.path.exists(path):
+                    fundamentals.setdefault('Financials', {})[key] = self.read_json(path)
+            self.write_json(fundamentals)
+        else:
+            raise tornado.web.HTTPError(404)
+
+
+class ChartHandler(MockHandler):
+    def get(self, symbol):
+        suffix = symbol.rsplit('.', 1)[-1] if '.' in symbol else ''
+        meta = {'symbol': symbol, 'exchangeTimezoneName': EXCHANGE_TIMEZONES.get(suffix, 'UTC')}
+
+        history_path = self.path_for('yfinance', symbol, 'historical_ohlc')
+        dividends_path = self.path_for('yfinance', symbol, 'dividends')
+        if not os.path.exists(history_path) and not os.path.exists(dividends_path):
+            raise tornado.web.HTTPError(404)
+
+        result = {'meta': meta, 'timestamp': [], 'events': {},
+                  'indicators': {'quote': [{'open': [], 'high': [], 'low': [], 'close': [], 'volume': []}],
+                                 'adjclose': [{'adjclose': []}]}}
+        # period1이 있으면 그 이후 구간만 (증분 수집)
+        period1 = int(self.get_query_argument('period1', '0'))
+        if os.path.exists(history_path):
+            history = pd.read_csv(history_path, float_precision='round_trip')
+            history = history[np.array(_epoch(history['Date']), dtype=np.int64) >= period1]
+            # 파일 값은 이미 수정주가이므로 adjclose = close (보정 비율 1)
+            close = history['Close'].replace({np.nan: None}).tolist()
+            result['timestamp'] = _epoch(history['Date'])
+            result['indicators'] = {
+                'quote': [{'open': history['Open'].replace({np.nan: None}).tolist(),
+                           'high': history['High'].replace({np.nan: None}).tolist(),
+                           'low': history['Low'].replace({np.nan: None}).tolist(),
+                           'close': close,
+                           'volume': history['Volume'].astype('int64').tolist()}],
+                'adjclose': [{'adjclose': close}],
+            }
+            splits = history[history['Stock Splits'] > 0]
+            result['events']['splits'] = {
+                str(ts): {'date': ts, 'numerator': float(ratio), 'denominator': 1.0}
+                for ts, ratio in zip(_epoch(splits['Date']), splits['Stock Splits'])
+            }
+
+        if os.path.exists(dividends_path):
+            dividends = pd.read_csv(dividends_path, float_precision='round_trip')
+        else:
+            dividends = history.loc[history['Dividends'] > 0, ['Date', 'Dividends']]
+        dividends = dividends[np.array(_epoch(dividends['Date']), dtype=np.int64) >= period1]
+        result['events']['dividends'] = {
+            str(ts): {'date': ts, 'amount': float(amount)}
+            for ts, amount in zip(_epoch(dividends['Date']), dividends['Dividends'])
+        }
+        self.write_json({'chart': {'result': [result], 'error': None}})
+
+
+class QuoteSummaryHandler(MockHandler):
+    def get(self, symbol):
+        info = self.read_json(self.path_for('yfinance', symbol, 'fundamentals'))
+        self.write_json({'quoteSummary': {'result': [{'assetProfile': info}], 'error': None}})
+
+
+class QuoteHandler(MockHandler):
+    def get(self):
+        self.write_json({'quoteResponse': {'result': [], 'error': None}})
+
+
+class CrumbHandler(MockHandler):
+    def get(self):
+        self.finish('mock-crumb')
+
+
+class TimeseriesHandler(MockHandler):
+    def get(self, symbol):
+        requested = set(self.get_query_argument('type', '').split(','))
+        results = []
+        for data_type in YF_STATEMENTS:
+            keys = statement_keys(data_type)
+            if not requested & {YF_TIMESCALE + key for key in keys}:
+                continue
+            path = self.path_for('yfinance', symbol, data_type)
+            if not os.path.exists(path):
+                continue
+            frame = pd.read_csv(path, index_col=0, float_precision='round_trip')
+            key_by_title = dict(zip(statement_titles(data_type, keys), keys))
+            timestamps = _epoch(pd.Series(frame.columns).str[:10])
+            for title, values in frame.iterrows():
+                key = key_by_title.get(title)
+                if key is None:
+                    continue
+                name = YF_TIMESCALE + key
+                results.append({
+                    'meta': {'symbol': [symbol], 'type': [name]},
+                    'timestamp': timestamps,
+                    name: [{'asOfDate': column[:10], 'periodType': '3M', 'reportedValue': {'raw': float(value)}}
+                           for column, value in values.items() if pd.notna(value)],
+                })
+        self.write_json({'timeseries': {'result': results, 'error': None}})
+
+
+class CookieHandler(MockHandler):
+    def get(self):
+        self.set_cookie('A3', 'mock')
+        self.finish('')
+
+
+def make_app(comparator, eodhd_dir=None, yfinance_dir=None, latency=0.0, fail_rate=0.0):
+    """목 서버 앱 (eodhd_dir/yfinance_dir 생략 시 comparator 경로 사용)"""
+    settings = {
+        'comparator': comparator,
+        'eodhd_dir': eodhd_dir or comparator.eodhd_dir,
+        'yfinance_dir': yfinance_dir or comparator.yfinance_dir,
+        'latency': latency,
+        'fail_rate': fail_rate,
+    }
+    args = {'settings': settings}
+    return tornado.web.Application([
+        (r'/api/([a-z\-]+)/([^/]+)', EodhdHandler, args),
+        (r'/v8/finance/chart/([^/]+)', ChartHandler, args),
+        (r'/v10/finance/quoteSummary/([^/]+)', QuoteSummaryHandler, args),
+        (r'/v7/finance/quote', QuoteHandler, args),
+        (r'/v1/test/getcrumb', CrumbHandler, args),
+        (r'/ws/fundamentals-timeseries/v1/finance/timeseries/([^/]+)', TimeseriesHandler, args),
+        (r'/', CookieHandler, args),
+    ])
+
+
+async def serve(args):
+    from dashboard import DataComparator
+    app = make_app(DataComparator(), args.eodhd_dir, args.yfinance_dir, args.latency, args.fail_rate)
+    app.listen(args.port, address=args.host)
+    print(f"목 서버 실행: http://{args.host}:{args.port} (EODHD: /api, Yahoo: /)")
+    await asyncio.Event().wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="수집기 오프라인 테스트용 EODHD/Yahoo 목 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--eodhd-dir', help="EODHD 파일 디렉터리 (기본: ./data)")
+    parser.add_argument('--yfinance-dir', help="yfinance 파일 디렉터리 (기본: ./yfinance_data)")
+    parser.add_argument('--latency', type=float, default=0.0, help="응답 지연 (초)")
+    parser.add_argument('--fail-rate', type=float, default=0.0, help="429/503 응답 비율 (0~1)")
+    asyncio.run(serve(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
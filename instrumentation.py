@@ -0,0 +1,189 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+
+class _NullSpan:
+    """비활성 상태에서 사용하는 빈 span (할당/시간 측정 없음)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, owner, name):
+        self.owner = owner
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.owner._record_span(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Instrumentation:
+    """
+    DataComparator 단계별 계측 (span 소요시간, 카운터, 읽은 바이트 수)
+    enabled=False이면 span()/count()는 속성 확인 한 번으로 끝납니다.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._spans = {}
+            self._counters = Counter()
+            self._started_at = time.time()
+
+    def span(self, name):
+        """소요시간 측정 구간"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def _record_span(self, name, elapsed):
+        with self._lock:
+            stats = self._spans.get(name)
+            if stats is None:
+                self._spans[name] = [1, elapsed, elapsed]
+            else:
+                stats[0] += 1
+                stats[1] += elapsed
+                stats[2] = max(stats[2], elapsed)
+
+    def count(self, name, value=1):
+        """카운터 증가"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] += value
+
+    def add_bytes_read(self, file_path):
+        """파일 크기만큼 읽은 바이트 수 누적"""
+        if not self.enabled:
+            return
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            return
+        self.count('bytes_read', size)
+
+    def snapshot(self):
+        """현재까지의 계측 결과"""
+        with self._lock:
+            spans = {
+                name: {'count': count, 'total_s': round(total, 6), 'max_s': round(max_s, 6),
+                       'mean_ms': round(total / count * 1000, 3)}
+                for name, (count, total, max_s) in sorted(self._spans.items())
+            }
+            counters = dict(sorted(self._counters.items()))
+        return {'since': self._started_at, 'spans': spans, 'counters': counters}
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self, prefix='dq'):
+        """Prometheus 텍스트 형식"""
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_span_seconds_total Total time spent in each stage.",
+            f"# TYPE {prefix}_span_seconds_total counter",
+        ]
+        for name, stats in snapshot['spans'].items():
+            lines.append(f'{prefix}_span_seconds_total{{span="{name}"}} {stats["total_s"]}')
+        lines += [
+            f"# HELP {prefix}_span_calls_total Number of times each stage ran.",
+            f"# TYPE {prefix}_span_calls_total counter",
+        ]
+        for name, stats in snapshot['spans'].items():
+            lines.append(f'{prefix}_span_calls_total{{span="{name}"}} {stats["count"]}')
+        lines += [
+            f"# HELP {prefix}_span_max_seconds Slowest single run of each stage.",
+            f"# TYPE {prefix}_span_max_seconds gauge",
+        ]
+        for name, stats in snapshot['spans'].items():
+            lines.append(f'{prefix}_span_max_seconds{{span="{name}"}} {stats["max_s"]}')
+        for name, value in snapshot['counters'].items():
+            metric = f"{prefix}_{name.replace('.', '_')}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """확장자에 따라 JSON(.json) 또는 Prometheus 텍스트로 저장"""
+        content = self.to_json() if path.endswith('.json') else self.to_prometheus()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    @contextmanager
+    def profile(self, interval=0.005):
+        """
+        블록 실행 동안 현재 스레드를 샘플링합니다. (opt-in)
+        결과는 SamplingProfiler.collapsed()로 flame graph 입력 형식을 얻을 수 있습니다.
+        """
+        with SamplingProfiler(threading.get_ident(), interval) as profiler:
+            yield profiler
+
+
+class SamplingProfiler:
+    """대상 스레드의 호출 스택을 주기적으로 샘플링 (flamegraph.pl / speedscope collapsed 형식)"""
+
+    def __init__(self, thread_id=None, interval=0.005):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='dq-sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.samples[';'.join(reversed(stack))] += 1
+
+    def collapsed(self):
+        """'a;b;c 횟수' 형식 문자열"""
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common()) + "\n"
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.collapsed())
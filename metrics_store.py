@@ -0,0 +1,232 @@
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 스레드 잠금만 사용
+    fcntl = None
+
+METRIC_SCHEMA = pa.schema([
+    ('run_id', pa.string()),
+    ('run_at', pa.timestamp('s')),
+    ('ticker', pa.string()),
+    ('data_type', pa.string()),
+    ('field', pa.string()),
+    ('total', pa.int32()),
+    ('matches', pa.int32()),
+    ('warnings', pa.int32()),
+    ('errors', pa.int32()),
+])
+
+ROLLUP_SCHEMA = pa.schema([
+    ('period', pa.date32()),
+    ('ticker', pa.string()),
+    ('data_type', pa.string()),
+    ('field', pa.string()),
+    ('runs', pa.int32()),
+    ('total', pa.int64()),
+    ('matches', pa.int64()),
+    ('warnings', pa.int64()),
+    ('errors', pa.int64()),
+])
+
+ROLLUP_KEYS = ['period', 'ticker', 'data_type', 'field']
+COUNT_COLUMNS = ['total', 'matches', 'warnings', 'errors']
+GRANULARITIES = ('daily', 'weekly')
+
+# 집계 디렉터리별 프로세스 간 잠금 파일 (대시보드, 배치 실행, 보고서 묶음이 같은 저장소에 기록)
+ROLLUP_LOCK_FILE = '.lock'
+
+_STATUS_COLUMNS = {'✅': 'matches', '⚠️': 'warnings', '❌': 'errors'}
+
+
+def aggregate_results(ticker, data_type, results):
+    """비교 결과를 (종목, 데이터 유형, 항목) 단위 건수로 집계"""
+    by_field = {}
+    for result in results:
+        counts = by_field.setdefault(result['field'], {'total': 0, 'matches': 0, 'warnings': 0, 'errors': 0})
+        counts['total'] += 1
+        status_column = _STATUS_COLUMNS.get(result['match'])
+        if status_column:
+            counts[status_column] += 1
+
+    return [{'ticker': ticker, 'data_type': data_type, 'field': field, **counts}
+            for field, counts in by_field.items()]
+
+
+def period_start(value, granularity):
+    """집계 기간 시작일 (일별: 당일, 주별: 해당 주 월요일)"""
+    day = value.date() if isinstance(value, datetime) else value
+    if granularity == 'weekly':
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+class QualityMetricsStore:
+    """
+    검증 실행별 품질 지표 저장소
+
+    runs/    : 실행 단위 원본 집계 (추가 전용, 실행당 Parquet 파일 1개)
+    daily/   : 일별 누적 집계 (기간당 파티션 파일 1개)
+    weekly/  : 주별 누적 집계
+    """
+
+    def __init__(self, base_dir='./quality_metrics'):
+        self.base_dir = base_dir
+        self._lock = threading.Lock()
+
+    def _dir(self, name):
+        path = os.path.join(self.base_dir, name)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    @contextmanager
+    def _rollup_lock(self, granularity):
+        """
+        집계 파티션 읽기-병합-교체 구간의 프로세스 간 잠금 (fcntl.flock)
+        겹쳐 실행된 두 실행이 같은 파티션을 읽고 서로의 교체로 건수를 잃지 않도록 합니다.
+        """
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self._dir(granularity), ROLLUP_LOCK_FILE), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _write_atomic(table, path):
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        pq.write_table(table, tmp_path, compression='zstd')
+        os.replace(tmp_path, path)
+
+    def record_run(self, batches, run_id=None, run_at=None):
+        """
+        비교 결과 배치 (ticker, data_type, results, error)를 하나의 실행으로 기록합니다.
+        기록된 행이 없으면 None을 반환합니다.
+        """
+        rows = []
+        for ticker, data_type, results, error in batches:
+            if results:
+                rows.extend(aggregate_results(ticker, data_type, results))
+        return self.write_run(rows, run_id, run_at)
+
+    def recorder(self, run_id=None):
+        """스트리밍 경로용: 배치를 그대로 전달하면서 지표를 누적하는 기록기"""
+        return RunRecorder(self, run_id)
+
+    def write_run(self, rows, run_id=None, run_at=None):
+        """집계 행을 실행 파일로 기록하고 일별/주별 집계를 갱신"""
+        if not rows:
+            return None
+
+        run_id = run_id or f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        run_at = (run_at or datetime.now()).replace(microsecond=0)
+
+        run_df = pd.DataFrame(rows)
+        run_df.insert(0, 'run_at', run_at)
+        run_df.insert(0, 'run_id', run_id)
+
+        with self._lock:
+            run_table = pa.Table.from_pandas(run_df, schema=METRIC_SCHEMA, preserve_index=False)
+            self._write_atomic(run_table, os.path.join(self._dir('runs'), f"run_{run_id}.parquet"))
+
+            for granularity in GRANULARITIES:
+                with self._rollup_lock(granularity):
+                    self._update_rollup(granularity, run_df, period_start(run_at, granularity))
+
+        return run_id
+
+    def _update_rollup(self, granularity, run_df, period):
+        """해당 기간 파티션만 다시 계산하여 기록"""
+        path = os.path.join(self._dir(granularity), f"{period.isoformat()}.parquet")
+
+        delta = run_df.groupby(['ticker', 'data_type', 'field'], as_index=False)[COUNT_COLUMNS].sum()
+        delta['runs'] = 1
+        delta.insert(0, 'period', period)
+
+        if os.path.exists(path):
+            existing = pq.read_table(path).to_pandas()
+            existing['period'] = period
+            delta = pd.concat([existing, delta], ignore_index=True)
+            delta = delta.groupby(ROLLUP_KEYS, as_index=False)[['runs'] + COUNT_COLUMNS].sum()
+
+        self._write_atomic(pa.Table.from_pandas(delta, schema=ROLLUP_SCHEMA, preserve_index=False), path)
+
+    def query(self, granularity='daily', start=None, end=None, tickers=None, data_types=None):
+        """
+        기간별 집계 조회 (사전 집계 파티션만 읽음)
+        반환 컬럼: period, ticker, data_type, field, runs, total, matches, warnings, errors
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"지원하지 않는 집계 단위입니다: {granularity}")
+
+        rollup_dir = os.path.join(self.base_dir, granularity)
+        files = []
+        if os.path.isdir(rollup_dir):
+            # 파일명(기간 시작일)으로 먼저 파티션을 걸러냄
+            for file_name in sorted(os.listdir(rollup_dir)):
+                if not file_name.endswith('.parquet'):
+                    continue
+                period = date.fromisoformat(file_name[:-len('.parquet')])
+                if start is not None and period < period_start(start, granularity):
+                    continue
+                if end is not None and period > end:
+                    continue
+                files.append(os.path.join(rollup_dir, file_name))
+
+        if not files:
+            return pd.DataFrame(columns=ROLLUP_SCHEMA.names)
+
+        dataset = ds.dataset(files, format='parquet', schema=ROLLUP_SCHEMA)
+
+        condition = None
+        filters = []
+        if tickers:
+            filters.append(ds.field('ticker').isin(list(tickers)))
+        if data_types:
+            filters.append(ds.field('data_type').isin(list(data_types)))
+        for f in filters:
+            condition = f if condition is None else condition & f
+
+        return dataset.to_table(filter=condition).to_pandas()
+
+    def accuracy_trend(self, granularity='daily', start=None, end=None, tickers=None, data_types=None,
+                       by='data_type'):
+        """기간 × 구분(by)별 정확도(%) 추이"""
+        df = self.query(granularity, start, end, tickers, data_types)
+        if df.empty:
+            return pd.DataFrame()
+
+        grouped = df.groupby(['period', by])[COUNT_COLUMNS].sum()
+        grouped['accuracy'] = grouped['matches'] / grouped['total'].where(grouped['total'] > 0) * 100
+        return grouped['accuracy'].unstack(by).sort_index()
+
+
+class RunRecorder:
+    """배치 스트림을 통과시키며 실행 지표를 모은 뒤 commit()으로 기록"""
+
+    def __init__(self, store, run_id=None):
+        self.store = store
+        self.run_id = run_id
+        self.rows = []
+
+    def observe(self, batches):
+        for batch in batches:
+            ticker, data_type, results, error = batch
+            if results:
+                self.rows.extend(aggregate_results(ticker, data_type, results))
+            yield batch
+
+    def commit(self):
+        return self.store.write_run(self.rows, self.run_id)
@@ -0,0 +1,134 @@
+import gzip
+import json
+import os
+import uuid
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성: 없으면 gzip으로 보관 (.zst 파일은 읽을 수 없음)
+    zstandard = None
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성: 없으면 표준 json 디코더 사용
+    orjson = None
+
+# 보관 파일 = 원본 '.json' 경로 + 접미사. 쓰기는 zstandard가 있으면 .zst, 없으면 .gz
+ZSTD_SUFFIX = '.zst'
+GZIP_SUFFIX = '.gz'
+ARCHIVE_SUFFIXES = (ZSTD_SUFFIX, GZIP_SUFFIX)
+
+# 보관은 한 번 쓰고 여러 번 읽으므로 압축률 위주 (해제 속도는 레벨과 무관)
+ZSTD_LEVEL = 19
+GZIP_LEVEL = 9
+
+
+def _orjson_loads(content):
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        # NaN/Infinity, BOM, 64비트를 넘는 정수 등 orjson이 거부하는 입력은 표준 json으로
+        return json.loads(content)
+
+
+# 이름 -> bytes/str를 받아 파이썬 객체를 반환하는 함수 (DQ_JSON_DECODER 환경 변수로 선택)
+JSON_DECODERS = {'json': json.loads}
+if orjson is not None:
+    JSON_DECODERS['orjson'] = _orjson_loads
+
+_decoder = JSON_DECODERS.get(os.environ.get('DQ_JSON_DECODER', ''), JSON_DECODERS.get('orjson', json.loads))
+
+
+def set_json_decoder(name):
+    """JSON 디코더 선택 (설치되지 않은 디코더면 ValueError)"""
+    global _decoder
+    if name not in JSON_DECODERS:
+        raise ValueError(f"사용할 수 없는 JSON 디코더: {name} (가능: {', '.join(JSON_DECODERS)})")
+    _decoder = JSON_DECODERS[name]
+
+
+def decode_json(content):
+    return _decoder(content)
+
+
+def archive_suffix():
+    return ZSTD_SUFFIX if zstandard is not None else GZIP_SUFFIX
+
+
+def is_archived(path):
+    return path.endswith(ARCHIVE_SUFFIXES)
+
+
+def resolve_payload(path):
+    """원본 JSON이 없으면 보관 파일 경로 (둘 다 없으면 원본 경로)"""
+    if os.path.exists(path):
+        return path
+    for suffix in ARCHIVE_SUFFIXES:
+        if os.path.exists(path + suffix):
+            return path + suffix
+    return path
+
+
+def encode_archive(data):
+    """JSON 객체 -> 공백 없는 JSON을 압축한 bytes (null 포함 원본 구조 그대로 보관)"""
+    content = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(content)
+    return gzip.compress(content, GZIP_LEVEL, mtime=0)
+
+
+def read_payload(path):
+    """JSON 파일 읽기 (보관 파일은 압축 해제 후 디코딩)"""
+    with open(path, 'rb') as f:
+        content = f.read()
+    if path.endswith(ZSTD_SUFFIX):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard 패키지가 없어 보관 파일을 읽을 수 없습니다: {path}")
+        content = zstandard.ZstdDecompressor().decompress(content)
+    elif path.endswith(GZIP_SUFFIX):
+        content = gzip.decompress(content)
+    return decode_json(content)
+
+
+def _write_atomic(path, content):
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def _canonical(data):
+    return json.dumps(data, ensure_ascii=False)
+
+
+def archive_file(path):
+    """
+    원본 JSON -> 보관 파일로 교체
+    보관 파일을 다시 읽어 원본과 같은 객체인지 확인한 뒤에만 원본을 삭제합니다.
+    반환: (보관 파일 경로, 원본 크기, 보관 크기)
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    data = json.loads(raw)
+    content = encode_archive(data)
+    target = path + archive_suffix()
+    _write_atomic(target, content)
+    if _canonical(read_payload(target)) != _canonical(data):
+        os.remove(target)
+        raise ValueError(f"보관 파일 검증 실패: {path}")
+    os.remove(path)
+    return target, len(raw), len(content)
+
+
+def restore_file(path):
+    """
+    보관 파일 -> 원본 JSON (수집기와 같은 4칸 들여쓰기)
+    반환: (원본 경로, 보관 크기, 원본 크기)
+    """
+    data = read_payload(path)
+    target = path[:-len(next(suffix for suffix in ARCHIVE_SUFFIXES if path.endswith(suffix)))]
+    content = json.dumps(data, indent=4, ensure_ascii=False).encode('utf-8')
+    _write_atomic(target, content)
+    archived_size = os.path.getsize(path)
+    os.remove(path)
+    return target, archived_size, len(content)
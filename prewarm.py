@@ -0,0 +1,121 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from statement_store import STATEMENT_SECTIONS
+
+# 예열 스레드 수 (대화형 요청과 CPU를 나눠 쓰므로 작게 유지, DQ_PREWARM_WORKERS 환경 변수로 변경)
+DEFAULT_PREWARM_WORKERS = 2
+
+# 대시보드에서 고를 수 있는 데이터 유형 (financial_statements는 재무제표 저장소만 채움)
+PREWARM_VIEWS = ['historical_ohlc', 'dividends', 'financial_statements']
+
+
+def prewarm_workers():
+    try:
+        return max(1, int(os.environ.get('DQ_PREWARM_WORKERS', DEFAULT_PREWARM_WORKERS)))
+    except ValueError:
+        return DEFAULT_PREWARM_WORKERS
+
+
+class Prewarmer:
+    """
+    캐시 예열 작업자
+    유니버스 종목을 지수 비중(Weight (%)) 내림차순으로, 데이터 유형마다 미리 비교하여
+    결과 캐시(디스크)와 파일/재무제표 캐시(메모리)를 채웁니다.
+    작업은 크기가 제한된 스레드 풀에서 비중 순서대로 실행되며, 진행 상황은 status()로 조회합니다.
+    """
+
+    def __init__(self, comparator, views=PREWARM_VIEWS, num_records=10, workers=DEFAULT_PREWARM_WORKERS):
+        self.comparator = comparator
+        self.views = list(views)
+        self.num_records = num_records
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._executor = None
+        self._jobs = []
+        self._done = 0
+        self._failed = []
+        self._running = set()
+        self._started = None
+        self._finished = None
+
+    def jobs(self, tickers=None):
+        """(종목, 데이터 유형) 작업 목록 (비중 내림차순, 비중이 없는 종목은 마지막)"""
+        weights = self.comparator.ticker_weights()
+        if tickers is None:
+            tickers = [ticker[0] for ticker in self.comparator.get_ticker_list()]
+        ordered = sorted(tickers, key=lambda ticker: (-weights.get(ticker, 0.0), ticker))
+        return [(ticker, view) for ticker in ordered for view in self.views]
+
+    def start(self, tickers=None):
+        """백그라운드 예열 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._executor is not None:
+                return
+            self._jobs = self.jobs(tickers)
+            self._started = time.perf_counter()
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='dq-prewarm')
+            for ticker, view in self._jobs:
+                self._executor.submit(self._run_job, ticker, view)
+            if not self._jobs:
+                self._finished = self._started
+
+    def run(self, tickers=None, progress=None):
+        """예열을 끝까지 실행 (배치용). progress(status)는 작업이 끝날 때마다 호출"""
+        self.start(tickers)
+        self.wait(progress)
+        return self.status()
+
+    def wait(self, progress=None, interval=0.5):
+        while not self.status()['finished']:
+            time.sleep(interval)
+            if progress:
+                progress(self.status())
+
+    def stop(self):
+        """대기 중인 작업 취소 (실행 중인 작업은 끝까지 실행)"""
+        with self._lock:
+            executor = self._executor
+            if self._finished is None:
+                self._finished = time.perf_counter()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run_job(self, ticker, view):
+        with self._lock:
+            self._running.add((ticker, view))
+        error = None
+        try:
+            if view == 'financial_statements':
+                for statement in STATEMENT_SECTIONS:
+                    for source in ('eodhd', 'yfinance'):
+                        self.comparator.statement_frame(ticker, statement, source)
+                self.comparator.load_data(ticker, 'fundamentals', source='yfinance')
+            else:
+                _, error = self.comparator.compare_detailed_data(ticker, view, self.num_records)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        with self._lock:
+            self._running.discard((ticker, view))
+            self._done += 1
+            if error:
+                self._failed.append((ticker, view, error))
+            if self._done == len(self._jobs) and self._finished is None:
+                self._finished = time.perf_counter()
+
+    def status(self):
+        """진행 상황: total, done, failed, running, queued(대기 작업 수), elapsed, finished"""
+        with self._lock:
+            started = self._started
+            end = self._finished or time.perf_counter()
+            return {
+                'total': len(self._jobs),
+                'done': self._done,
+                'failed': list(self._failed),
+                'running': sorted(self._running),
+                'queued': len(self._jobs) - self._done - len(self._running),
+                'elapsed': end - started if started is not None else 0.0,
+                'finished': self._finished is not None,
+            }
@@ -0,0 +1,181 @@
+import json
+import os
+
+from trading_calendar import yfinance_symbol
+
+# 기본 출처 파일명 (데이터 유형 -> 템플릿, {symbol}은 출처 표기 티커)
+EODHD_FILE_NAMES = {
+    'income_statement': 'income_statement_{symbol}.json',
+    'balance_sheet': 'balance_sheet_{symbol}.json',
+    'cash_flow': 'cash_flow_{symbol}.json',
+    'historical_ohlc': 'historical_ohlc_{symbol}.csv',
+    'dividends': 'dividends_{symbol}.csv',
+    'fundamentals': 'fundamentals_{symbol}.json',
+    'company_overview': 'company_overview_{symbol}.json',
+    'market_cap': 'market_cap_{symbol}.csv',
+}
+
+YFINANCE_FILE_NAMES = {
+    'income_statement': 'income_statement_{symbol}.csv',
+    'balance_sheet': 'balance_sheet_{symbol}.csv',
+    'cash_flow': 'cash_flow_{symbol}.csv',
+    'historical_ohlc': 'historical_ohlc_{symbol}.csv',
+    'dividends': 'dividends_{symbol}.csv',
+    'fundamentals': 'fundamentals_{symbol}.json',
+    'company_overview': 'company_overview_{symbol}.json',
+    'market_cap': 'market_cap_{symbol}.json',
+}
+
+# 파일명 매핑에 없는 데이터 유형의 기본 파일명
+DEFAULT_FILE_NAME = 'data_{symbol}.json'
+
+# 기본 출처 (항상 등록, 두 출처 비교 화면/보고서의 eodhd_value/yfinance_value)
+BUILTIN_PROVIDERS = ('eodhd', 'yfinance')
+
+# 추가 출처 설정 파일 (DQ_PROVIDERS 환경 변수로 변경, 없으면 기본 출처만 사용)
+PROVIDERS_FILE = 'providers.json'
+
+# 추가 출처 가격/배당 파일에서 매핑할 수 있는 정규화 항목 (Date는 필수)
+PROVIDER_FIELDS = {
+    'historical_ohlc': ['Date', 'Open', 'High', 'Low', 'Close', 'Volume'],
+    'dividends': ['Date', 'Dividends'],
+}
+
+
+def symbol_rules(rules):
+    """[(찾을 문자열, 바꿀 문자열), ...] -> 티커 표기 변환 함수 (순서대로 적용)"""
+    rules = [tuple(rule) for rule in rules]
+
+    def convert(ticker):
+        for old, new in rules:
+            ticker = ticker.replace(old, new)
+        return ticker
+
+    return convert
+
+
+class Provider:
+    """
+    데이터 출처 정의
+    name: 출처 이름 (load_data/비교 결과의 키), base_dir: 파일 디렉터리
+    file_names: {데이터 유형: 파일명 템플릿}, symbol: 티커 -> 출처 표기 변환 함수
+    columns: {데이터 유형: {정규화 항목: 원본 컬럼}} (추가 출처용, 기본 출처는 FRAME_SCHEMAS로 읽음)
+    """
+
+    def __init__(self, name, base_dir, file_names, symbol=None, columns=None, label=None):
+        self.name = name
+        self.base_dir = base_dir
+        self.file_names = dict(file_names)
+        self.symbol = symbol or (lambda ticker: ticker)
+        self.columns = columns or {}
+        self.label = label or name
+
+    def file_path(self, symbol, data_type):
+        """출처 표기 티커의 파일 경로"""
+        template = self.file_names.get(data_type, DEFAULT_FILE_NAME)
+        return os.path.join(self.base_dir, template.format(symbol=symbol))
+
+    def schema(self, data_type):
+        """
+        추가 출처 CSV 메모리 스키마 (FRAME_SCHEMAS 형식, 매핑이 없으면 None)
+        날짜 컬럼은 로드 시 'Date'(datetime64)로 한 번만 변환합니다.
+        """
+        mapping = self.columns.get(data_type)
+        if not mapping:
+            return None
+        return {'columns': list(mapping.values()), 'date_column': mapping['Date']}
+
+    def normalize(self, df, data_type):
+        """로드된 프레임 -> Date + 정규화 항목 컬럼 (매핑 컬럼이 없으면 None)"""
+        mapping = self.columns.get(data_type) or {}
+        renames = {raw: field for field, raw in mapping.items() if field != 'Date'}
+        if df is None or 'Date' not in df.columns or any(raw not in df.columns for raw in renames):
+            return None
+        return df[['Date'] + list(renames)].rename(columns=renames)
+
+    @classmethod
+    def from_config(cls, config, root='.'):
+        """
+        설정 항목 -> Provider
+        {"name", "base_dir", "label", "files": {데이터 유형: 템플릿},
+         "symbol": [[찾을 문자열, 바꿀 문자열], ...], "columns": {데이터 유형: {정규화 항목: 원본 컬럼}}}
+        """
+        name = config.get('name')
+        if not name or name in ('both', 'all'):
+            raise ValueError(f"출처 이름이 올바르지 않습니다: {name!r}")
+        if not config.get('base_dir') or not config.get('files'):
+            raise ValueError(f"{name}: base_dir와 files는 필수입니다.")
+        columns = config.get('columns') or {}
+        for data_type, mapping in columns.items():
+            allowed = PROVIDER_FIELDS.get(data_type)
+            if allowed is None:
+                raise ValueError(f"{name}: 컬럼 매핑을 지원하지 않는 데이터 유형입니다: {data_type}")
+            unknown = set(mapping) - set(allowed)
+            if unknown or 'Date' not in mapping:
+                raise ValueError(f"{name}/{data_type}: 'Date'가 필요하며 항목은 {', '.join(allowed)} 중에서 "
+                                 f"지정해야 합니다 (알 수 없는 항목: {', '.join(sorted(unknown)) or '-'})")
+        return cls(name, os.path.join(root, config['base_dir']), config['files'],
+                   symbol_rules(config.get('symbol', [])), columns, config.get('label'))
+
+
+class ProviderRegistry:
+    """등록된 출처 (등록 순서 유지, 기본 출처가 앞)"""
+
+    def __init__(self, providers=()):
+        self._providers = {}
+        for provider in providers:
+            self.register(provider)
+
+    def register(self, provider):
+        """출처 등록 (같은 이름이면 교체)"""
+        self._providers[provider.name] = provider
+
+    def get(self, name):
+        provider = self._providers.get(name)
+        if provider is None:
+            raise KeyError(f"등록되지 않은 출처: {name} (등록: {', '.join(self._providers)})")
+        return provider
+
+    def names(self):
+        return list(self._providers)
+
+    def schema(self, name, data_type):
+        provider = self._providers.get(name)
+        return provider.schema(data_type) if provider is not None else None
+
+    def __contains__(self, name):
+        return name in self._providers
+
+    def __iter__(self):
+        return iter(self._providers.values())
+
+    def __len__(self):
+        return len(self._providers)
+
+
+def builtin_providers(eodhd_dir='./data', yfinance_dir='./yfinance_data'):
+    return [
+        Provider('eodhd', eodhd_dir, EODHD_FILE_NAMES, label='EODHD'),
+        Provider('yfinance', yfinance_dir, YFINANCE_FILE_NAMES, symbol=yfinance_symbol, label='yfinance'),
+    ]
+
+
+def load_providers(path=None):
+    """
+    설정 파일의 추가 출처 목록 (파일이 없으면 빈 목록)
+    반환: ([Provider], 오류 메시지)
+    """
+    path = path or os.environ.get('DQ_PROVIDERS', PROVIDERS_FILE)
+    if not os.path.exists(path):
+        return [], None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            configs = json.load(f)
+        root = os.path.dirname(os.path.abspath(path))
+        providers = [Provider.from_config(config, root) for config in configs]
+    except (OSError, ValueError, TypeError, AttributeError) as e:
+        return [], f"출처 설정 파일 오류 ({path}): {e}"
+    for provider in providers:
+        if provider.name in BUILTIN_PROVIDERS:
+            return [], f"출처 설정 파일 오류 ({path}): 기본 출처 이름은 사용할 수 없습니다: {provider.name}"
+    return providers, None
@@ -0,0 +1,264 @@
+"""
+비교 결과 조회용 HTTP 서비스 (Streamlit 화면 없이 다른 시스템에서 검증 결과를 JSON으로 조회)
+
+    python query_service.py --port 8780 --workers 4
+    curl http://127.0.0.1:8780/compare/AAPL.US/historical_ohlc?num_records=10
+
+엔드포인트 (모두 GET)
+    /health                                  상태, 작업자 수, 진행 중인 작업 수
+    /tickers                                 유니버스 종목 (비중 포함)
+    /compare/<종목>/<데이터 유형>            compare_detailed_data 결과
+                                             (num_records, 기간: start/end=YYYY-MM-DD, last=3M 등)
+    /summary/<종목>/<데이터 유형>            결과 통계 (summarize_results)
+    /issues, /issues/<종목>                  기록된 이슈
+
+비교는 크기가 제한된 스레드 풀에서 실행하고, 같은 요청이 진행 중이면 새로 실행하지 않고 그 결과를 함께 기다립니다.
+비교 응답의 ETag는 결과 캐시 키(입력 파일 시그니처 + 기존 이슈 + 엔진 버전)이므로
+If-None-Match가 같으면 비교 없이 304를 반환합니다.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import tornado.web
+
+from dashboard import COMPARISON_DATA_TYPES, DEFAULT_NUM_RECORDS, DataComparator, summarize_results
+from date_index import make_date_range
+
+# 비교 작업 스레드 수 (DQ_QUERY_WORKERS 환경 변수 또는 --workers로 변경)
+DEFAULT_QUERY_WORKERS = 4
+
+# 직렬화된 응답 메모리 캐시 항목 수 ((종류, ETag) -> JSON bytes)
+MAX_CACHED_RESPONSES = 1024
+
+# num_records 허용 범위 (대시보드 슬라이더와 같음)
+MIN_NUM_RECORDS = 5
+MAX_NUM_RECORDS = 30
+
+
+def query_workers():
+    try:
+        return max(1, int(os.environ.get('DQ_QUERY_WORKERS', DEFAULT_QUERY_WORKERS)))
+    except ValueError:
+        return DEFAULT_QUERY_WORKERS
+
+
+def _json_default(value):
+    # numpy 스칼라 등
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def encode_body(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':'), default=_json_default).encode('utf-8')
+
+
+class QueryService:
+    """
+    요청 처리 상태 (IOLoop 스레드에서만 사용하므로 잠금 없음)
+    진행 중인 작업(키 -> Future), 직렬화된 응답 캐시, 요청 통계를 보관합니다.
+    """
+
+    def __init__(self, comparator, workers=DEFAULT_QUERY_WORKERS):
+        self.comparator = comparator
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dq-query')
+        self._inflight = {}
+        self._responses = OrderedDict()
+        self.stats = {'requests': 0, 'computed': 0, 'coalesced': 0, 'not_modified': 0, 'response_hits': 0}
+
+    async def call(self, key, fn, *args):
+        """작업자 풀에서 fn(*args) 실행 (같은 키의 작업이 진행 중이면 그 결과를 함께 기다림)"""
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+        else:
+            self.stats['computed'] += 1
+            future = asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # 한 요청이 취소되어도 같은 작업을 기다리는 다른 요청에는 영향 없음
+        return await asyncio.shield(future)
+
+    def cached_response(self, key):
+        body = self._responses.get(key)
+        if body is not None:
+            self._responses.move_to_end(key)
+            self.stats['response_hits'] += 1
+        return body
+
+    def store_response(self, key, body):
+        self._responses[key] = body
+        self._responses.move_to_end(key)
+        while len(self._responses) > MAX_CACHED_RESPONSES:
+            self._responses.popitem(last=False)
+
+    def in_flight(self):
+        return len(self._inflight)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class QueryHandler(tornado.web.RequestHandler):
+    def initialize(self, service):
+        self.service = service
+        self.comparator = service.comparator
+
+    def prepare(self):
+        self.service.stats['requests'] += 1
+
+    def write_error(self, status_code, **kwargs):
+        message = self._reason
+        if 'exc_info' in kwargs:
+            error = kwargs['exc_info'][1]
+            if isinstance(error, tornado.web.HTTPError) and error.log_message:
+                message = error.log_message
+        self.set_header('Content-Type', 'application/json; charset=utf-8')
+        self.finish(encode_body({'error': message}))
+
+    def send_json(self, body, etag=None):
+        self.set_header('Content-Type', 'application/json; charset=utf-8')
+        if etag is not None:
+            # 클라이언트는 매번 재검증 (입력 파일이 바뀌면 ETag가 달라짐)
+            self.set_header('Cache-Control', 'no-cache')
+        self.finish(body)
+
+    def not_modified(self, etag):
+        """ETag 헤더 설정 후 If-None-Match와 같으면 304 응답 (응답했으면 True)"""
+        self.set_header('Etag', f'"{etag}"')
+        if not self.check_etag_header():
+            return False
+        self.service.stats['not_modified'] += 1
+        self.set_header('Cache-Control', 'no-cache')
+        self.set_status(304)
+        self.finish()
+        return True
+
+    def num_records(self):
+        value = self.get_query_argument('num_records', str(DEFAULT_NUM_RECORDS))
+        try:
+            num_records = int(value)
+        except ValueError:
+            raise tornado.web.HTTPError(400, f"num_records는 정수여야 합니다: {value}")
+        if not MIN_NUM_RECORDS <= num_records <= MAX_NUM_RECORDS:
+            raise tornado.web.HTTPError(400, f"num_records 범위: {MIN_NUM_RECORDS}~{MAX_NUM_RECORDS}")
+        return num_records
+
+    def date_range(self):
+        """start/end/last 쿼리 인자 -> DateRange (없으면 None = 전체 이력)"""
+        try:
+            return make_date_range(*(self.get_query_argument(name, None) for name in ('start', 'end', 'last')))
+        except ValueError as e:
+            raise tornado.web.HTTPError(400, str(e))
+
+
+class HealthHandler(QueryHandler):
+    def get(self):
+        self.send_json(encode_body({
+            'status': 'ok',
+            'workers': self.service.workers,
+            'in_flight': self.service.in_flight(),
+            'stats': self.service.stats,
+        }))
+
+
+class TickersHandler(QueryHandler):
+    async def get(self):
+        tickers = await self.service.call(('tickers',), self.comparator.get_ticker_list)
+        weights = self.comparator.ticker_weights()
+        self.send_json(encode_body([
+            {'ticker': ticker, 'exchange': exchange, 'location': location, 'weight': weights.get(ticker)}
+            for ticker, exchange, location in tickers
+        ]))
+
+
+class ComparisonHandler(QueryHandler):
+    """비교 결과 (/compare) 또는 통계 (/summary)"""
+
+    def initialize(self, service, kind):
+        super().initialize(service)
+        self.kind = kind
+
+    async def get(self, ticker, data_type):
+        if data_type not in COMPARISON_DATA_TYPES:
+            raise tornado.web.HTTPError(
+                400, f"지원하지 않는 데이터 유형: {data_type} (가능: {', '.join(COMPARISON_DATA_TYPES)})")
+        num_records = self.num_records()
+        date_range = self.date_range()
+
+        etag = await self.service.call(('key', ticker, data_type, num_records, date_range),
+                                       self.comparator.comparison_key, ticker, data_type, num_records, date_range)
+        if self.not_modified(etag):
+            return
+
+        body = self.service.cached_response((self.kind, etag))
+        if body is None:
+            results, error = await self.service.call(('compare', etag), self.comparator.compare_detailed_data,
+                                                     ticker, data_type, num_records, None, None, date_range)
+            if error:
+                raise tornado.web.HTTPError(404, error)
+            body = encode_body(self.payload(ticker, data_type, num_records, date_range, results))
+            self.service.store_response((self.kind, etag), body)
+        self.send_json(body, etag)
+
+    def payload(self, ticker, data_type, num_records, date_range, results):
+        payload = {'ticker': ticker, 'data_type': data_type, 'num_records': num_records}
+        if date_range is not None:
+            payload['date_range'] = date_range._asdict()
+        if self.kind == 'summary':
+            payload['summary'] = summarize_results(results)
+        else:
+            payload['results'] = results
+        return payload
+
+
+class IssuesHandler(QueryHandler):
+    def get(self, ticker=None):
+        issues = self.comparator.issue_tracker.get_issues(ticker)
+        body = encode_body(issues)
+        # 이슈 파일은 작으므로 응답 내용으로 ETag 계산 (tornado 기본 동작)
+        self.set_header('Cache-Control', 'no-cache')
+        self.send_json(body)
+
+
+def make_app(comparator, workers=DEFAULT_QUERY_WORKERS):
+    """조회 서비스 앱 (로컬 클라이언트 테스트 시 app.settings['service']로 통계 확인)"""
+    service = QueryService(comparator, workers)
+    args = {'service': service}
+    return tornado.web.Application([
+        (r'/health', HealthHandler, args),
+        (r'/tickers', TickersHandler, args),
+        (r'/compare/([^/]+)/([a-z_]+)', ComparisonHandler, {**args, 'kind': 'compare'}),
+        (r'/summary/([^/]+)/([a-z_]+)', ComparisonHandler, {**args, 'kind': 'summary'}),
+        (r'/issues', IssuesHandler, args),
+        (r'/issues/([^/]+)', IssuesHandler, args),
+    ], service=service)
+
+
+async def serve(args):
+    if not args.access_log:
+        # 요청마다 남는 200/304 접근 로그 생략 (4xx/5xx는 WARNING 이상이므로 그대로 기록)
+        logging.getLogger('tornado.access').setLevel(logging.WARNING)
+    app = make_app(DataComparator(), args.workers)
+    app.listen(args.port, address=args.host)
+    print(f"조회 서비스 실행: http://{args.host}:{args.port} (작업자 {args.workers}개)")
+    await asyncio.Event().wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="비교 결과 조회용 HTTP 서비스")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8780)
+    parser.add_argument('--workers', type=int, default=query_workers(), help="비교 작업 스레드 수")
+    parser.add_argument('--access-log', action='store_true', help="모든 요청의 접근 로그 출력")
+    asyncio.run(serve(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import multiprocessing
+import os
+import time
+import uuid
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from urllib.parse import quote
+
+import pandas as pd
+
+from dashboard import (COMPARISON_DATA_TYPES, DataComparator, IssueSnapshot, report_env, summarize_results,
+                       write_final_report)
+from exporters import EXPORT_COLUMNS, export_results
+from metrics_store import aggregate_results
+from trading_calendar import ticker_exchange
+
+# 보고서 작업 프로세스 수 (기본: CPU 수, DQ_REPORT_WORKERS 환경 변수로 변경)
+DEFAULT_REPORT_WORKERS = os.cpu_count() or 1
+
+# 종목별 CSV 컬럼 (여러 데이터 유형을 한 파일에 담으므로 데이터 유형 포함)
+REPORT_PACK_CSV_COLUMNS = [c for c in EXPORT_COLUMNS if c[0] != 'ticker']
+
+# 유니버스 목록 파일 / 종목별 요약 컬럼
+REPORT_INDEX_FILE = 'index.html'
+REPORT_SUMMARY_FILE = 'summary.csv'
+REPORT_PACK_COLUMNS = ['ticker', 'exchange', 'weight', 'total', 'matches', 'warnings', 'errors', 'accuracy_rate',
+                       'html', 'csv', 'error', 'seconds']
+
+# 보고서 묶음 설정 (작업 프로세스에 한 번 전달)
+# date_range: DateRange 또는 None, report_date: date
+ReportPackOptions = namedtuple('ReportPackOptions', [
+    'output_dir', 'data_types', 'num_records', 'date_range', 'client_name', 'report_date', 'analyst_name',
+    'report_type', 'result_cache',
+], defaults=(COMPARISON_DATA_TYPES, 10, None, '', None, '', '', True))
+
+# 작업 프로세스별 (DataComparator, ReportPackOptions). 프로세스 시작 시 _init_worker가 한 번 설정
+_worker = None
+
+
+def report_workers():
+    try:
+        return max(1, int(os.environ.get('DQ_REPORT_WORKERS', DEFAULT_REPORT_WORKERS)))
+    except ValueError:
+        return DEFAULT_REPORT_WORKERS
+
+
+def report_file_names(ticker, report_date):
+    """종목별 (HTML, CSV) 파일명 (화면 다운로드 파일명과 같은 형식)"""
+    stamp = report_date.strftime('%Y%m%d')
+    return f"data_quality_report_{ticker}_{stamp}.html", f"data_quality_data_{ticker}_{stamp}.csv"
+
+
+def _init_worker(issues, options):
+    """
+    작업 프로세스 초기화: 프로세스마다 DataComparator를 하나 만들고 이슈 스냅샷을 연결합니다.
+    비교 결과는 디스크 결과 캐시(프로세스 간 공유)에서 읽고, 없으면 이 프로세스에서 계산해 저장합니다.
+    """
+    global _worker
+    comparator = DataComparator()
+    comparator.issue_tracker = IssueSnapshot(issues)
+    comparator.result_cache.enabled = options.result_cache
+    _worker = (comparator, options)
+
+
+def build_ticker_report(ticker):
+    """
+    작업 프로세스에서 종목 하나의 HTML/CSV 보고서 작성 (임시 파일 -> os.replace)
+    반환: 요약 딕셔너리 (REPORT_PACK_COLUMNS 중 종목별 값 + 'metrics': 지표 저장소 집계 행)
+    """
+    comparator, options = _worker
+    started = time.perf_counter()
+    summary = {'ticker': ticker, **summarize_results([]), 'html': '', 'csv': '', 'error': '', 'metrics': []}
+    try:
+        batches, errors = [], []
+        for data_type in options.data_types:
+            results, error = comparator.compare_detailed_data(ticker, data_type, options.num_records,
+                                                              date_range=options.date_range)
+            if error:
+                errors.append(f"{data_type}: {error}")
+            elif results:
+                batches.append((ticker, data_type, results, None))
+                summary['metrics'].extend(aggregate_results(ticker, data_type, results))
+
+        results = [result for _, _, batch_results, _ in batches for result in batch_results]
+        summary.update(summarize_results(results))
+        if not results:
+            summary['error'] = '; '.join(errors) or "비교 결과가 없습니다."
+            return summary
+
+        issues = comparator.issue_tracker.get_issues(ticker)
+        html_name, csv_name = report_file_names(ticker, options.report_date)
+        write_final_report(os.path.join(options.output_dir, html_name), results, ticker, options.client_name,
+                           options.report_date, options.analyst_name, options.report_type, issues)
+        export_results(batches, 'csv', os.path.join(options.output_dir, csv_name), {ticker: issues},
+                       columns=REPORT_PACK_CSV_COLUMNS)
+        summary.update(html=html_name, csv=csv_name, error='; '.join(errors))
+    except Exception as e:
+        summary['error'] = f"{type(e).__name__}: {e}"
+    finally:
+        summary['seconds'] = round(time.perf_counter() - started, 3)
+    return summary
+
+
+def _write_atomic(path, write):
+    """write(임시 경로)로 기록한 뒤 os.replace (같은 디렉터리에 동시에 쓰는 실행끼리 임시 파일이 겹치지 않도록 고유 이름)"""
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def write_report_index(output_dir, summary, options):
+    """유니버스 목록 HTML과 종목별 요약 CSV 저장 (임시 파일 -> os.replace)"""
+    counts = {name: int(summary[name].sum()) for name in ('total', 'matches', 'warnings', 'errors')}
+    totals = {
+        'tickers': len(summary),
+        'reports': int(summary['html'].ne('').sum()),
+        **counts,
+        'accuracy_rate': counts['matches'] / counts['total'] * 100 if counts['total'] else 0,
+    }
+    rows = [{**row, 'html_href': quote(row['html']), 'csv_href': quote(row['csv'])}
+            for row in summary.to_dict('records')]
+
+    stream = report_env.get_template('report_index.html').stream(
+        client_name=options.client_name, report_date=options.report_date, analyst_name=options.analyst_name,
+        report_type=options.report_type, summary=totals, rows=rows)
+    _write_atomic(os.path.join(output_dir, REPORT_INDEX_FILE), lambda tmp_path: stream.dump(tmp_path, encoding='utf-8'))
+
+    _write_atomic(os.path.join(output_dir, REPORT_SUMMARY_FILE),
+                  lambda tmp_path: summary.to_csv(tmp_path, index=False, encoding='utf-8-sig'))
+    return totals
+
+
+def build_report_pack(comparator, tickers, options, workers=None, progress=None):
+    """
+    종목별 보고서를 프로세스 풀에서 병렬 작성한 뒤 유니버스 목록 페이지를 저장합니다.
+    작업은 지수 비중 내림차순으로 제출하고, 이슈는 시작 시점 스냅샷을 모든 작업 프로세스가 함께 사용합니다.
+    progress(완료 수, 전체 수, 종목 요약)는 종목 보고서가 끝날 때마다 호출됩니다.
+    반환: (종목별 요약 DataFrame, 지표 저장소 실행 ID)
+    """
+    os.makedirs(options.output_dir, exist_ok=True)
+    weights = comparator.ticker_weights()
+    exchanges = {ticker: exchange for ticker, exchange, _ in comparator.get_ticker_list()}
+    ordered = sorted(dict.fromkeys(tickers), key=lambda ticker: (-weights.get(ticker, 0.0), ticker))
+    issues = comparator.issue_tracker.get_issues()
+
+    # 작업 프로세스는 spawn으로 시작 (부모의 스레드/락 상태를 fork로 복제하지 않음)
+    summaries = {}
+    with ProcessPoolExecutor(max_workers=workers or report_workers(),
+                             mp_context=multiprocessing.get_context('spawn'),
+                             initializer=_init_worker, initargs=(issues, options)) as executor:
+        futures = [executor.submit(build_ticker_report, ticker) for ticker in ordered]
+        for future in as_completed(futures):
+            result = future.result()
+            summaries[result['ticker']] = result
+            if progress:
+                progress(len(summaries), len(ordered), result)
+
+    metrics = [row for ticker in ordered for row in summaries[ticker].pop('metrics')]
+    run_id = comparator.metrics_store.write_run(metrics)
+
+    summary = pd.DataFrame([summaries[ticker] for ticker in ordered], columns=REPORT_PACK_COLUMNS)
+    summary['exchange'] = [exchanges.get(ticker) or ticker_exchange(ticker) for ticker in ordered]
+    summary['weight'] = [weights.get(ticker, 0.0) for ticker in ordered]
+    write_report_index(options.output_dir, summary, options)
+    return summary, run_id
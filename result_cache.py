@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import shutil
+import uuid
+
+# 캐시 디렉터리 크기 한도. 넘으면 오래 사용하지 않은 항목부터 한도의 EVICT_TARGET 비율까지 삭제
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+EVICT_TARGET = 0.8
+
+
+def _json_default(value):
+    # numpy 스칼라 등
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class ResultCache:
+    """
+    비교 결과 디스크 캐시 (프로세스 간 공유)
+    키 = 입력(종목, 데이터 유형, 매개변수, 원본 파일 시그니처, 엔진 버전)의 해시이며
+    <base_dir>/<키 앞 2자>/<키>.json 에 저장합니다. 입력이 바뀌면 키가 달라지므로 무효화가 따로 필요 없습니다.
+    쓰기는 임시 파일 -> os.replace로 교체하므로 다른 프로세스는 완성된 파일만 봅니다.
+    읽을 때 수정 시각을 갱신하고, 크기 한도를 넘으면 수정 시각이 오래된 항목부터 삭제합니다 (LRU).
+    """
+
+    def __init__(self, base_dir='./result_cache', max_bytes=DEFAULT_MAX_BYTES, enabled=True):
+        self.base_dir = base_dir
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        # 이 프로세스가 마지막으로 확인한 디렉터리 크기 (None이면 다음 쓰기 때 다시 계산)
+        self._size = None
+
+    @staticmethod
+    def key(*parts):
+        """입력 값들의 해시 키 (JSON으로 직렬화 가능한 값)"""
+        payload = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=_json_default)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=20).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.base_dir, key[:2], f"{key}.json")
+
+    def get(self, key):
+        """저장된 값 (없거나 손상되었으면 None)"""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return value
+
+    def put(self, key, value):
+        """값 저장 (크기 한도를 넘으면 오래된 항목 삭제)"""
+        if not self.enabled:
+            return
+        path = self._path(key)
+        content = json.dumps(value, ensure_ascii=False, separators=(',', ':'),
+                             default=_json_default).encode('utf-8')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        if self._size is None:
+            self._size = self.size()
+        else:
+            self._size += len(content)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        """[(수정 시각, 크기, 경로)] (다른 프로세스가 쓰는 중인 임시 파일 제외)"""
+        entries = []
+        if not os.path.isdir(self.base_dir):
+            return entries
+        for directory in os.scandir(self.base_dir):
+            if not directory.is_dir():
+                continue
+            for entry in os.scandir(directory.path):
+                if not entry.name.endswith('.json'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """한도의 EVICT_TARGET 비율이 될 때까지 오래된 항목 삭제 (삭제한 항목 수 반환)"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * EVICT_TARGET
+        removed = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # 다른 프로세스가 먼저 삭제
+                pass
+            total -= size
+            removed += 1
+        self._size = total
+        return removed
+
+    def clear(self):
+        shutil.rmtree(self.base_dir, ignore_errors=True)
+        self._size = 0
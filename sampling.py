@@ -0,0 +1,183 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+# 신뢰수준 95% 정규분포 분위수
+SAMPLE_Z = 1.96
+
+# 층별 초기 표본 수 / 목표 신뢰구간 반폭 / 추가 추출 최대 횟수
+DEFAULT_SAMPLE_PER_STRATUM = 5
+DEFAULT_TARGET_HALF_WIDTH = 0.1
+MAX_SAMPLING_ROUNDS = 4
+
+# 표본 추출을 지원하는 데이터 유형과 비교 항목
+SAMPLING_FIELDS = {
+    'historical_ohlc': ['Open', 'High', 'Low', 'Close', 'Volume'],
+    'dividends': ['Dividends'],
+}
+
+STRATUM_KEYS = ['exchange', 'data_type', 'year', 'field']
+STRATA_COLUMNS = STRATUM_KEYS + ['population', 'sampled', 'mismatches', 'errors', 'rate', 'ci_low', 'ci_high']
+
+
+def wilson_interval(mismatches, n, z=SAMPLE_Z):
+    """이항 비율의 Wilson 신뢰구간 (n=0이면 (0, 1))"""
+    if n == 0:
+        return 0.0, 1.0
+    p = mismatches / n
+    denominator = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def stratified_estimate(strata, by=None, z=SAMPLE_Z):
+    """
+    층별 결과를 모집단 크기로 가중한 불일치율 추정치와 신뢰구간
+    분산은 Agresti-Coull 보정 비율과 유한 모집단 보정을 사용합니다. (불일치 0건인 층도 분산이 0이 되지 않음)
+    """
+    strata = strata[strata['sampled'] > 0]
+    columns = (by or []) + ['population', 'sampled', 'mismatches', 'errors', 'rate', 'ci_low', 'ci_high']
+    if strata.empty:
+        return pd.DataFrame(columns=columns)
+
+    population = strata['population'].to_numpy(dtype=np.float64)
+    sampled = strata['sampled'].to_numpy(dtype=np.float64)
+    mismatches = strata['mismatches'].to_numpy(dtype=np.float64)
+    adjusted = (mismatches + z * z / 2) / (sampled + z * z)
+    fpc = np.where(population > 1, (population - sampled) / np.maximum(population - 1, 1), 0.0)
+
+    frame = strata.assign(
+        _weighted=population * mismatches / sampled,
+        _variance=population ** 2 * adjusted * (1 - adjusted) / sampled * fpc,
+    )
+    grouped = frame.groupby(by) if by else frame.groupby(lambda _: 'all')
+    summary = grouped.agg(population=('population', 'sum'), sampled=('sampled', 'sum'),
+                          mismatches=('mismatches', 'sum'), errors=('errors', 'sum'),
+                          _weighted=('_weighted', 'sum'), _variance=('_variance', 'sum'))
+
+    rate = summary['_weighted'] / summary['population']
+    margin = z * np.sqrt(summary['_variance']) / summary['population']
+    summary['rate'] = rate
+    summary['ci_low'] = (rate - margin).clip(lower=0)
+    summary['ci_high'] = (rate + margin).clip(upper=1)
+    summary = summary.drop(columns=['_weighted', '_variance'])
+    return summary.reset_index(drop=not by)[columns]
+
+
+class SamplingReport:
+    """층화 표본 비교 결과 (층별 집계 + 표본 행)"""
+
+    def __init__(self, strata, results, rounds):
+        self.strata = strata
+        self.results = results
+        self.rounds = rounds
+
+    def estimate(self, by=None):
+        """불일치율 추정 (by: 묶을 층 컬럼 목록, 생략 시 전체)"""
+        return stratified_estimate(self.strata, by)
+
+
+class StratifiedSampler:
+    """
+    (거래소, 데이터 유형, 연도, 항목) 층별 무작위 표본 추출기
+    층마다 모집단 순열을 한 번 만들고, 추가 추출은 같은 순열의 다음 위치부터 이어서 꺼냅니다.
+    """
+
+    def __init__(self, per_stratum=DEFAULT_SAMPLE_PER_STRATUM, target_half_width=DEFAULT_TARGET_HALF_WIDTH,
+                 max_rounds=MAX_SAMPLING_ROUNDS, seed=None):
+        self.per_stratum = per_stratum
+        self.target_half_width = target_half_width
+        self.max_rounds = max_rounds
+        self.rng = np.random.default_rng(seed)
+        self._strata = {}
+
+    def add_population(self, exchange, data_type, ticker, years, positions):
+        """
+        종목 하나의 비교 가능 행을 층에 추가합니다.
+        years/positions: 공통 거래일 프레임의 연도와 행 위치 (같은 길이)
+        """
+        years = np.asarray(years)
+        positions = np.asarray(positions)
+        for year in np.unique(years):
+            year_positions = positions[years == year]
+            for field in SAMPLING_FIELDS[data_type]:
+                stratum = self._strata.setdefault((exchange, data_type, int(year), field),
+                                                  {'tickers': [], 'positions': []})
+                stratum['tickers'].append(np.full(len(year_positions), ticker, dtype=object))
+                stratum['positions'].append(year_positions)
+
+    def run(self, evaluate):
+        """
+        evaluate(data_type, ticker, requests) -> requests [(field, positions), ...]와 같은 순서의 비교 결과 목록
+        (각 결과는 'match'를 포함한 dict 목록)
+        초기 추출 후, 불일치가 관측되고 신뢰구간이 목표보다 넓은 층만 표본을 두 배씩 늘립니다.
+        """
+        states = []
+        for key, stratum in self._strata.items():
+            tickers = np.concatenate(stratum['tickers'])
+            positions = np.concatenate(stratum['positions'])
+            states.append({'key': key, 'tickers': tickers, 'positions': positions,
+                           'order': self.rng.permutation(len(positions)), 'cursor': 0,
+                           'mismatches': 0, 'errors': 0})
+
+        results = []
+        draw = {id(state): self.per_stratum for state in states}
+        rounds = 0
+        while draw and rounds < self.max_rounds:
+            rounds += 1
+            results.extend(self._sample_round(states, draw, evaluate))
+
+            draw = {}
+            for state in states:
+                n = state['cursor']
+                remaining = len(state['order']) - n
+                if remaining <= 0 or state['mismatches'] == 0:
+                    continue
+                low, high = wilson_interval(state['mismatches'], n)
+                if (high - low) / 2 > self.target_half_width:
+                    draw[id(state)] = min(n, remaining)
+
+        rows = []
+        for state in states:
+            exchange, data_type, year, field = state['key']
+            n = state['cursor']
+            low, high = wilson_interval(state['mismatches'], n)
+            rows.append({'exchange': exchange, 'data_type': data_type, 'year': year, 'field': field,
+                         'population': len(state['order']), 'sampled': n,
+                         'mismatches': state['mismatches'], 'errors': state['errors'],
+                         'rate': state['mismatches'] / n if n else np.nan, 'ci_low': low, 'ci_high': high})
+
+        strata = pd.DataFrame(rows, columns=STRATA_COLUMNS).sort_values(STRATUM_KEYS, ignore_index=True)
+        return SamplingReport(strata, results, rounds)
+
+    @staticmethod
+    def _sample_round(states, draw, evaluate):
+        """각 층 순열의 다음 행들을 꺼내 (데이터 유형, 종목) 단위로 한 번에 비교"""
+        requests = {}
+        for state in states:
+            count = draw.get(id(state), 0)
+            if not count:
+                continue
+            picked = state['order'][state['cursor']:state['cursor'] + count]
+            state['cursor'] += len(picked)
+
+            exchange, data_type, year, field = state['key']
+            tickers = state['tickers'][picked]
+            positions = state['positions'][picked]
+            for ticker in pd.unique(tickers):
+                requests.setdefault((data_type, ticker), []).append(
+                    (state, field, np.sort(positions[tickers == ticker])))
+
+        results = []
+        for (data_type, ticker), items in requests.items():
+            batches = evaluate(data_type, ticker, [(field, positions) for _, field, positions in items])
+            for (state, _, _), rows in zip(items, batches):
+                for row in rows:
+                    if row['match'] != '✅':
+                        state['mismatches'] += 1
+                    if row['match'] == '❌':
+                        state['errors'] += 1
+                results.extend(rows)
+        return results
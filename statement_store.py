@@ -0,0 +1,120 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+# 재무제표 데이터 유형 -> EODHD fundamentals 'Financials' 섹션 이름
+STATEMENT_SECTIONS = {
+    'income_statement': 'Income_Statement',
+    'balance_sheet': 'Balance_Sheet',
+    'cash_flow': 'Cash_Flow',
+}
+
+# EODHD 기간별 항목 중 값이 아닌 메타 정보
+EODHD_META_FIELDS = ('date', 'filing_date', 'currency_symbol')
+
+STATEMENT_COLUMNS = ['source', 'ticker', 'statement', 'period_type', 'period_end', 'field', 'value']
+_CATEGORY_COLUMNS = ['source', 'ticker', 'statement', 'period_type', 'field']
+
+
+def statement_value(value):
+    """제공자 값 -> float (문자열 숫자는 ',' 제거, 숫자가 아니거나 비어 있으면 None)"""
+    if isinstance(value, str):
+        try:
+            return float(value.replace(',', ''))
+        except ValueError:
+            return None
+    if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+        return None if pd.isna(value) else float(value)
+    return None
+
+
+def _frame(source, ticker, statement, period_types, period_ends, fields, values):
+    frame = pd.DataFrame({
+        'source': source,
+        'ticker': ticker,
+        'statement': statement,
+        'period_type': period_types,
+        'period_end': period_ends,
+        'field': fields,
+        'value': np.asarray(values, dtype=np.float64),
+    }, columns=STATEMENT_COLUMNS)
+    return frame.astype({column: 'category' for column in _CATEGORY_COLUMNS})
+
+
+def eodhd_statement_frame(ticker, statement, payload):
+    """EODHD 재무제표 ({'quarterly'|'yearly': {기준일: {항목: 값}}}) -> 열 형식 프레임"""
+    period_types, period_ends, fields, values = [], [], [], []
+    for period_type in ('quarterly', 'yearly'):
+        for period_end, period in (payload.get(period_type) or {}).items():
+            for field, value in (period or {}).items():
+                if field in EODHD_META_FIELDS:
+                    continue
+                period_types.append(period_type)
+                period_ends.append(period_end[:10])
+                fields.append(field)
+                value = statement_value(value)
+                values.append(np.nan if value is None else value)
+    return _frame('eodhd', ticker, statement, period_types, period_ends, fields, values)
+
+
+def yfinance_statement_frame(ticker, statement, df):
+    """yfinance 재무제표 CSV (행 = 항목, 열 = 분기 기준일) -> 열 형식 프레임 (분기만 제공)"""
+    if df is None or 'index' not in df.columns:
+        return _frame('yfinance', ticker, statement, [], [], [], [])
+    table = df.set_index('index').apply(pd.to_numeric, errors='coerce')
+    rows, columns = table.shape
+    # 기준일별로 원본 행 순서를 유지 (항목 이름 부분 일치 검색이 앞 행부터 찾음)
+    return _frame('yfinance', ticker, statement,
+                  ['quarterly'] * (rows * columns),
+                  np.repeat([str(column)[:10] for column in table.columns], rows),
+                  np.tile(table.index.astype(str), columns),
+                  table.to_numpy(dtype=np.float64).T.ravel())
+
+
+def period_values(frame, period_type='quarterly', period_end=None):
+    """
+    한 기준일의 항목 값 (기준일 생략 시 최신)
+    반환: (기준일, {항목: float 또는 None}), 해당 기간이 없으면 (None, {})
+    """
+    if frame is None:
+        return None, {}
+    rows = frame[frame['period_type'] == period_type]
+    if rows.empty:
+        return None, {}
+    if period_end is None:
+        period_end = rows['period_end'].max()
+    rows = rows[rows['period_end'] == period_end]
+    values = rows['value'].to_numpy()
+    return period_end, {field: None if np.isnan(value) else float(value)
+                        for field, value in zip(rows['field'].astype(str), values)}
+
+
+class StatementStore:
+    """
+    정규화된 재무제표 저장소 (출처, 종목, 재무제표, 기간 유형, 기준일, 항목) -> 값
+    (출처, 종목, 재무제표)마다 원본을 한 번만 파싱해 열 형식 프레임으로 보관하고,
+    펀더멘털 비교와 재무제표 표가 같은 프레임을 조회합니다. 원본 시그니처가 바뀌면 다시 파싱합니다.
+    """
+
+    def __init__(self):
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def get(self, source, ticker, statement, signature, load_frame):
+        """저장된 프레임 (시그니처가 다르면 load_frame()으로 다시 만듦, 실패 시 None)"""
+        key = (source, ticker, statement)
+        with self._lock:
+            cached = self._frames.get(key)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+
+        frame = load_frame()
+        if frame is not None and signature is not None:
+            with self._lock:
+                self._frames[key] = (signature, frame)
+        return frame
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
@@ -0,0 +1,294 @@
+import csv
+import json
+import math
+import os
+import shutil
+import uuid
+from datetime import date, timedelta
+
+# 시계열 파일 구조: (출처, 데이터 유형) -> (레이아웃, 날짜 키)
+# rows: 한 행 = 한 시점인 CSV / columns: 한 열 = 한 시점인 CSV (EODHD 시가총액) / records: JSON 목록
+SERIES_LAYOUTS = {
+    ('eodhd', 'historical_ohlc'): ('rows', 'date'),
+    ('eodhd', 'dividends'): ('rows', 'date'),
+    ('eodhd', 'market_cap'): ('columns', 'date'),
+    ('yfinance', 'historical_ohlc'): ('rows', 'Date'),
+    ('yfinance', 'dividends'): ('rows', 'Date'),
+    ('yfinance', 'market_cap'): ('records', 'date'),
+}
+
+SEGMENT_DIR_SUFFIX = '.segments'
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+# 델타 세그먼트가 이 수를 넘으면 append 직후 기본 파일로 병합
+MAX_SEGMENTS = 20
+
+# 증분 수집 시 high-water mark 이전 며칠을 다시 받아 기존 값과 대조 (수정주가 재계산 감지)
+OVERLAP_DAYS = 10
+
+# 겹치는 구간 대조 시 숫자 항목 허용 상대 오차 (float 출력 자릿수 차이는 같은 값으로 봄)
+RESTATEMENT_REL_TOL = 1e-9
+
+
+def _write_atomic(path, content):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def _stat_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _same_fields(left, right):
+    """두 시점의 항목 값이 같은지 (숫자는 상대 오차 RESTATEMENT_REL_TOL 이내)"""
+    if len(left) != len(right):
+        return False
+    for a, b in zip(left, right):
+        if a == b:
+            continue
+        try:
+            if not math.isclose(float(a), float(b), rel_tol=RESTATEMENT_REL_TOL):
+                return False
+        except ValueError:
+            return False
+    return True
+
+
+# ---- 레이아웃별 파싱/출력: (헤더, [(날짜, 비교 항목, 원본)]) ----
+
+def _parse_rows(content, date_key):
+    lines = content.decode('utf-8-sig').splitlines()
+    if not lines:
+        return {'header': '', 'indexed': False}, []
+    columns = next(csv.reader([lines[0]]))
+    if date_key not in columns:
+        # 빈 응답 (행 없음)
+        return {'header': lines[0], 'indexed': False}, []
+    position = columns.index(date_key)
+    indexed = columns[0] == ''
+    points = []
+    for line in lines[1:]:
+        if not line:
+            continue
+        fields = next(csv.reader([line]))
+        # 이름 없는 인덱스 열(EODHD)은 비교/병합 시 제외하고 출력할 때 다시 번호를 붙임
+        body = line.split(',', 1)[1] if indexed else line
+        points.append((fields[position][:10], tuple(fields[1:] if indexed else fields), body))
+    return {'header': lines[0], 'indexed': indexed}, points
+
+
+def _render_rows(meta, points):
+    if meta['indexed']:
+        lines = [f"{i},{raw}" for i, (_, _, raw) in enumerate(points)]
+    else:
+        lines = [raw for _, _, raw in points]
+    return ('\n'.join([meta['header']] + lines) + '\n').encode('utf-8')
+
+
+def _parse_columns(content, date_key):
+    rows = list(csv.reader(content.decode('utf-8-sig').splitlines()))
+    labels = [row[0] for row in rows[1:]]
+    if date_key not in labels:
+        return {'labels': labels}, []
+    values = list(zip(*[row[1:] for row in rows[1:]]))
+    position = labels.index(date_key)
+    points = [(point[position][:10], tuple(point), point) for point in values]
+    return {'labels': labels}, points
+
+
+def _render_columns(meta, points):
+    lines = [',' + ','.join(str(i) for i in range(len(points)))]
+    for index, label in enumerate(meta['labels']):
+        lines.append(','.join([label] + [raw[index] for _, _, raw in points]))
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def _parse_records(content, date_key):
+    records = json.loads(content.decode('utf-8-sig'))
+    return {}, [(str(record[date_key])[:10], None, record) for record in records]
+
+
+def _render_records(meta, points):
+    return json.dumps([raw for _, _, raw in points], indent=4, ensure_ascii=False).encode('utf-8')
+
+
+_LAYOUTS = {
+    'rows': (_parse_rows, _render_rows),
+    'columns': (_parse_columns, _render_columns),
+    'records': (_parse_records, _render_records),
+}
+
+
+class TimeSeriesStore:
+    """
+    append 전용 시계열 파일 저장소
+    기본 파일(<경로>) 옆 <경로>.segments/ 에 high-water mark 이후 행만 담은 델타 세그먼트(기본 파일과 같은 형식)를
+    순번 파일로 추가하고, manifest.json에 세그먼트 목록과 high-water mark, 기준이 된 기본 파일 시그니처를 기록합니다.
+    읽는 쪽은 기본 파일 + 세그먼트를 하나의 시계열로 보며, 기본 파일이 다시 쓰이면(전체 갱신/병합)
+    시그니처가 달라지므로 남은 세그먼트는 무시됩니다.
+    """
+
+    def __init__(self, max_segments=MAX_SEGMENTS):
+        self.max_segments = max_segments
+        # manifest 파싱 캐시: 경로 -> (manifest 파일 시그니처, 내용). 읽기 경로에서 매번 JSON을 읽지 않도록 함
+        self._manifests = {}
+
+    @staticmethod
+    def layout(source, data_type):
+        return SERIES_LAYOUTS.get((source, data_type))
+
+    @staticmethod
+    def segment_dir(path):
+        return f"{path}{SEGMENT_DIR_SUFFIX}"
+
+    def manifest(self, path):
+        """유효한 manifest (없거나 기본 파일이 바뀌었으면 None)"""
+        manifest_path = os.path.join(self.segment_dir(path), MANIFEST_NAME)
+        manifest_signature = _stat_signature(manifest_path)
+        if manifest_signature is None:
+            return None
+        cached = self._manifests.get(manifest_path)
+        if cached is not None and cached[0] == manifest_signature:
+            manifest = cached[1]
+        else:
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                return None
+            self._manifests[manifest_path] = (manifest_signature, manifest)
+        base = _stat_signature(path)
+        if manifest.get('version') != MANIFEST_VERSION or base is None or manifest.get('base') != list(base):
+            return None
+        return manifest
+
+    def segment_paths(self, path, manifest=None):
+        """기본 파일 다음에 읽을 세그먼트 경로 (순서대로)"""
+        manifest = manifest if manifest is not None else self.manifest(path)
+        if not manifest:
+            return []
+        return [os.path.join(self.segment_dir(path), segment['name']) for segment in manifest['segments']]
+
+    def signature(self, path):
+        """
+        기본 파일 + 세그먼트 전체 시그니처 (캐시 무효화용, 파일이 없으면 None)
+        앞 두 값은 기본 파일 (수정 시각, 크기)이고 이후는 세그먼트별 '이름:첫 날짜'입니다.
+        """
+        base = _stat_signature(path)
+        if base is None:
+            return None
+        manifest = self.manifest(path)
+        if not manifest:
+            return base
+        return base + tuple(f"{segment['name']}:{segment['first']}" for segment in manifest['segments'])
+
+    def _parse(self, content, layout):
+        kind, date_key = layout
+        return _LAYOUTS[kind][0](content, date_key)
+
+    def _render(self, meta, points, layout):
+        return _LAYOUTS[layout[0]][1](meta, points)
+
+    def _read_points(self, path, layout, manifest=None):
+        with open(path, 'rb') as f:
+            meta, points = self._parse(f.read(), layout)
+        for segment_path in self.segment_paths(path, manifest):
+            with open(segment_path, 'rb') as f:
+                points.extend(self._parse(f.read(), layout)[1])
+        return meta, points
+
+    def read(self, path, layout):
+        """기본 파일 + 세그먼트를 합친 내용 (기본 파일과 같은 형식의 bytes)"""
+        manifest = self.manifest(path)
+        if not manifest or not manifest['segments']:
+            with open(path, 'rb') as f:
+                return f.read()
+        meta, points = self._read_points(path, layout, manifest)
+        return self._render(meta, points, layout)
+
+    def high_water_mark(self, path, layout):
+        """저장된 마지막 날짜 ('YYYY-MM-DD', 파일이 없으면 None)"""
+        if not os.path.exists(path):
+            return None
+        manifest = self.manifest(path)
+        if manifest:
+            return manifest['high_water_mark']
+        _, points = self._read_points(path, layout, manifest={})
+        return max((point[0] for point in points), default=None)
+
+    def fetch_start(self, path, layout, overlap_days=OVERLAP_DAYS):
+        """증분 수집 시작일 (high-water mark - overlap_days, 파일이 없으면 None = 전체 수집)"""
+        mark = self.high_water_mark(path, layout)
+        if mark is None:
+            return None
+        return (date.fromisoformat(mark) - timedelta(days=overlap_days)).isoformat()
+
+    def write_base(self, path, content):
+        """기본 파일 전체 교체 (세그먼트 삭제)"""
+        _write_atomic(path, content)
+        shutil.rmtree(self.segment_dir(path), ignore_errors=True)
+
+    def append(self, path, content, layout):
+        """
+        새로 받은 구간(content, 기본 파일과 같은 형식)을 델타 세그먼트로 추가합니다.
+        high-water mark 이하 날짜는 기존 값과 대조만 하고, 값이 다르면 추가하지 않고 'restated'를 반환합니다.
+        반환: ('created' | 'appended' | 'unchanged' | 'restated', 추가된 행 수)
+        """
+        if not os.path.exists(path):
+            _write_atomic(path, content)
+            return 'created', None
+
+        manifest = self.manifest(path) or {}
+        meta, stored = self._read_points(path, layout, manifest)
+        stored_fields = {}
+        for day, fields, _ in stored:
+            stored_fields.setdefault(day, []).append(fields)
+        mark = manifest.get('high_water_mark') or max((point[0] for point in stored), default='')
+
+        new_meta, points = self._parse(content, layout)
+        if layout[0] == 'rows' and points and new_meta['header'] != meta['header']:
+            return 'restated', 0
+        # records(스냅샷 목록)는 같은 날짜를 다시 받아도 대조하지 않음
+        if layout[0] != 'records':
+            for day, fields, _ in points:
+                if day <= mark and day in stored_fields and \
+                        not any(_same_fields(fields, old) for old in stored_fields[day]):
+                    return 'restated', 0
+
+        fresh = sorted((point for point in points if point[0] > mark), key=lambda point: point[0])
+        if not fresh:
+            return 'unchanged', 0
+
+        segments = list(manifest.get('segments', []))
+        sequence = int(segments[-1]['name'].split('.')[0]) + 1 if segments else 1
+        name = f"{sequence:06d}{os.path.splitext(path)[1]}"
+        # 세그먼트를 먼저 쓰고 manifest를 마지막에 교체 (manifest에 없는 세그먼트는 읽지 않음)
+        _write_atomic(os.path.join(self.segment_dir(path), name), self._render(meta, fresh, layout))
+        segments.append({'name': name, 'rows': len(fresh), 'first': fresh[0][0], 'last': fresh[-1][0]})
+        self._write_manifest(path, {'high_water_mark': fresh[-1][0], 'segments': segments})
+
+        if len(segments) > self.max_segments:
+            self.compact(path, layout)
+        return 'appended', len(fresh)
+
+    def _write_manifest(self, path, manifest):
+        manifest = {'version': MANIFEST_VERSION, 'base': list(_stat_signature(path)), **manifest}
+        _write_atomic(os.path.join(self.segment_dir(path), MANIFEST_NAME),
+                      json.dumps(manifest, indent=2).encode('utf-8'))
+
+    def compact(self, path, layout):
+        """세그먼트를 기본 파일로 병합 (병합한 세그먼트 수 반환)"""
+        manifest = self.manifest(path)
+        if not manifest or not manifest['segments']:
+            return 0
+        merged = self.read(path, layout)
+        self.write_base(path, merged)
+        return len(manifest['segments'])
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+
+# 판정 코드 (큰 값이 더 나쁨)
+MATCH, WARNING, MISMATCH = 0, 1, 2
+MATCH_SYMBOLS = ['✅', '⚠️', '❌']
+_CODES = {symbol: code for code, symbol in enumerate(MATCH_SYMBOLS)}
+
+# 규칙 선택 키 (생략 또는 '*'이면 전체)
+# data_type: historical_ohlc, dividends, fundamentals, financial_statements(재무제표 표)
+# exchange: 티커 접미사 (예: LSE, TA), currency: 보유종목 파일의 시장 통화 (예: GBP, ILS)
+RULE_KEYS = ('data_type', 'field', 'exchange', 'currency')
+
+# 판정 임계값과 기본값 (None이면 해당 조건 없음)
+# 차이 = |a - b|, 상대 차이(%) = 차이 / max(|a|, |b|, rel_floor) * 100
+# 차이 <= match_abs 또는 상대 차이 <= match_rel -> ✅, warn_abs/warn_rel 이내 -> ⚠️, 그 외 -> otherwise
+# unit_factor: 한쪽 값에 곱했을 때 상대 차이가 unit_rel(%) 이내이면 ❌ 대신 ⚠️ (펜스/파운드 같은 단위 혼용)
+RULE_THRESHOLDS = {
+    'match_abs': None,
+    'match_rel': None,
+    'warn_abs': None,
+    'warn_rel': None,
+    'otherwise': '❌',
+    'rel_floor': 0.01,
+    'unit_factor': None,
+    'unit_rel': 0.1,
+}
+
+# 기본 규칙 (기존 비교 기준). 선택 키가 많은 규칙일수록 나중에 적용되어 앞 규칙의 임계값을 덮어씁니다.
+# 시장별 조정은 tolerances.json에 추가합니다. 예:
+#   {"data_type": "historical_ohlc", "exchange": "LSE", "unit_factor": 100}
+#   {"data_type": "historical_ohlc", "exchange": "TA", "field": "Close", "match_abs": 1}
+DEFAULT_TOLERANCE_RULES = [
+    {'data_type': 'historical_ohlc', 'match_abs': 0.01, 'warn_rel': 0.1},
+    {'data_type': 'historical_ohlc', 'field': 'Volume', 'match_abs': 1, 'warn_rel': None},
+    {'data_type': 'dividends', 'match_abs': 0.001, 'otherwise': '⚠️'},
+    {'data_type': 'fundamentals', 'match_abs': 1000},
+    {'data_type': 'financial_statements', 'match_rel': 1.0, 'rel_floor': 1e-9, 'otherwise': '⚠️'},
+]
+
+# 추가 규칙 파일 (DQ_TOLERANCES 환경 변수로 변경, 기본 규칙 뒤에 이어 붙임)
+TOLERANCES_FILE = 'tolerances.json'
+
+CompiledRule = namedtuple('CompiledRule', ['match_abs', 'match_rel', 'warn_abs', 'warn_rel', 'otherwise',
+                                           'rel_floor', 'unit_factor', 'unit_rel'])
+
+
+def as_float64_array(values):
+    """값 배열 -> float64 (float32는 최단 10진 표현을 거쳐 CSV 원본 값을 복원)"""
+    values = np.asarray(values)
+    if values.dtype == np.float32:
+        return values.astype(str).astype(np.float64)
+    return values.astype(np.float64)
+
+
+def validate_rule(rule):
+    """규칙 항목 검사 (알 수 없는 키, 잘못된 otherwise 값이면 ValueError)"""
+    if not isinstance(rule, dict):
+        raise ValueError(f"규칙은 객체여야 합니다: {rule!r}")
+    unknown = set(rule) - set(RULE_KEYS) - set(RULE_THRESHOLDS)
+    if unknown:
+        raise ValueError(f"알 수 없는 규칙 키: {', '.join(sorted(unknown))}")
+    if 'otherwise' in rule and rule['otherwise'] not in _CODES:
+        raise ValueError(f"otherwise는 {', '.join(MATCH_SYMBOLS)} 중 하나여야 합니다: {rule['otherwise']!r}")
+    for key in RULE_THRESHOLDS:
+        if key != 'otherwise' and rule.get(key) is not None and not isinstance(rule[key], (int, float)):
+            raise ValueError(f"{key}는 숫자여야 합니다: {rule[key]!r}")
+    return dict(rule)
+
+
+def load_tolerance_rules(path=None):
+    """
+    설정 파일의 추가 규칙 목록 (파일이 없으면 빈 목록)
+    반환: ([규칙], 오류 메시지)
+    """
+    path = path or os.environ.get('DQ_TOLERANCES', TOLERANCES_FILE)
+    if not os.path.exists(path):
+        return [], None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return [validate_rule(rule) for rule in json.load(f)], None
+    except (OSError, ValueError, TypeError) as e:
+        return [], f"허용 오차 설정 파일 오류 ({path}): {e}"
+
+
+def _specific(value):
+    return value is not None and value != '*'
+
+
+class ToleranceRules:
+    """
+    선언형 허용 오차 규칙
+    (데이터 유형, 항목, 거래소, 통화)마다 해당 규칙들을 구체적인 순서로 겹쳐 임계값 묶음(CompiledRule)을 만들고 캐시합니다.
+    classify()는 행별 임계값 배열을 한 번에 모아 전체 행을 한 번의 벡터 연산으로 판정합니다.
+    """
+
+    def __init__(self, rules=()):
+        self.rules = [validate_rule(rule) for rule in DEFAULT_TOLERANCE_RULES + list(rules)]
+        # 결과 캐시 키에 포함 (규칙이 바뀌면 저장된 비교 결과를 다시 계산)
+        payload = json.dumps(self.rules, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        self.digest = hashlib.blake2b(payload, digest_size=10).hexdigest()
+        self._compiled = {}
+
+    def rule(self, data_type, field=None, exchange='', currency=None):
+        """(데이터 유형, 항목, 거래소, 통화)에 적용되는 임계값 묶음"""
+        key = (data_type, field, exchange or '', currency)
+        compiled = self._compiled.get(key)
+        if compiled is not None:
+            return compiled
+
+        values = dict(zip(RULE_KEYS, key))
+        matched = []
+        for position, rule in enumerate(self.rules):
+            selectors = [name for name in RULE_KEYS if _specific(rule.get(name))]
+            if all(rule[name] == values[name] for name in selectors):
+                matched.append((len(selectors), position, rule))
+
+        thresholds = dict(RULE_THRESHOLDS)
+        for _, _, rule in sorted(matched, key=lambda item: item[:2]):
+            thresholds.update({name: value for name, value in rule.items() if name in RULE_THRESHOLDS})
+
+        def bound(name):
+            value = thresholds[name]
+            return -np.inf if value is None else float(value)
+
+        compiled = CompiledRule(
+            match_abs=bound('match_abs'), match_rel=bound('match_rel'),
+            warn_abs=bound('warn_abs'), warn_rel=bound('warn_rel'),
+            otherwise=_CODES[thresholds['otherwise']], rel_floor=float(thresholds['rel_floor']),
+            unit_factor=np.nan if thresholds['unit_factor'] is None else float(thresholds['unit_factor']),
+            unit_rel=float(thresholds['unit_rel']),
+        )
+        self._compiled[key] = compiled
+        return compiled
+
+    def classify(self, data_type, fields, left, right, exchange='', currency=None):
+        """
+        값 쌍 배열을 한 번에 판정
+        fields: 행별 항목 이름 배열 (모든 행이 같으면 문자열 하나)
+        left/right: float64 배열 (결측 처리는 호출자가 함, NaN은 otherwise)
+        반환: (코드 배열, 절대 차이 배열)
+        """
+        left = np.asarray(left, dtype=np.float64)
+        right = np.asarray(right, dtype=np.float64)
+        if fields is None or isinstance(fields, str):
+            table = np.array([self.rule(data_type, fields, exchange, currency)], dtype=np.float64)
+            thresholds = table[np.zeros(len(left), dtype=np.intp)]
+        else:
+            names, index = np.unique(np.asarray(fields, dtype=str), return_inverse=True)
+            table = np.array([self.rule(data_type, name, exchange, currency) for name in names], dtype=np.float64)
+            thresholds = table[index.reshape(-1)]
+        (match_abs, match_rel, warn_abs, warn_rel, otherwise,
+         rel_floor, unit_factor, unit_rel) = thresholds.T
+
+        difference = np.abs(left - right)
+        scale = np.maximum(np.maximum(np.abs(left), np.abs(right)), rel_floor)
+        relative = difference / scale * 100
+        codes = np.where((difference <= match_abs) | (relative <= match_rel), MATCH,
+                         np.where((difference <= warn_abs) | (relative <= warn_rel), WARNING, otherwise))
+
+        if not np.isnan(unit_factor).all():
+            scaled = np.zeros(len(left), dtype=bool)
+            with np.errstate(invalid='ignore'):
+                for a, b in ((left * unit_factor, right), (left, right * unit_factor)):
+                    floor = np.maximum(np.maximum(np.abs(a), np.abs(b)), rel_floor)
+                    scaled |= np.abs(a - b) / floor * 100 <= unit_rel
+            codes = np.where((codes == MISMATCH) & scaled, WARNING, codes)
+        return codes.astype(np.int8), difference
+
+    def compare(self, data_type, field, left, right, exchange='', currency=None):
+        """값 하나 판정 -> (코드, 절대 차이)"""
+        codes, difference = self.classify(data_type, field, [left], [right], exchange, currency)
+        return int(codes[0]), float(difference[0])
@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+# 관측 거래일 중 이 비율 이상을 차지하는 요일만 정규 거래 요일로 봄 (정규 요일은 약 20%씩)
+SESSION_WEEKDAY_SHARE = 0.05
+
+# 해당 날짜를 포함하는 시계열이 이 수 이상인데 한 시계열에만 있는 날짜는 휴장일 봉으로 봄
+MIN_COVERAGE_FOR_SUPPORT = 3
+
+# 봉(bar) 검사 결과 구분
+BAR_CATEGORIES = {
+    'missing_bar': '누락 봉',
+    'duplicate_bar': '중복 날짜',
+    'out_of_session': '휴장일 봉',
+}
+
+BAR_CHECK_COLUMNS = ['date', 'eodhd_count', 'yfinance_count', 'category']
+
+
+def ticker_exchange(ticker):
+    """티커 접미사 (exchange_mapping의 거래소 코드, 예: JPM.US -> US)"""
+    return ticker.rsplit('.', 1)[-1] if '.' in ticker else ''
+
+
+def yfinance_symbol(ticker):
+    """yfinance 티커 표기 ('.US' 제거, '.LSE' -> '.L')"""
+    ticker = ticker.replace('.US', '') if '.US' in ticker else ticker
+    return ticker.replace('.LSE', '.L') if '.LSE' in ticker else ticker
+
+
+def to_days(dates):
+    """날짜 배열을 datetime64[D]로 변환 (NaT 제외)"""
+    days = np.asarray(pd.to_datetime(dates).to_numpy(), dtype='datetime64[D]')
+    return days[~np.isnat(days)]
+
+
+class ExchangeCalendar:
+    """
+    거래소별 거래일 인덱스
+    소속 종목/출처 시계열에서 관측된 날짜의 합집합으로 만들며, 날짜별로 관측된 시계열 수(support)와
+    해당 날짜가 기간 안에 들어가는 시계열 수(coverage)를 함께 보관합니다.
+    거래일 = 해당 연도의 정규 거래 요일에 관측된 날짜 (여러 시계열이 있는데 한 곳에만 있는 날짜 제외)
+    """
+
+    def __init__(self, exchange, series_dates):
+        self.exchange = exchange
+        series = [np.unique(to_days(dates)) for dates in series_dates]
+        series = [dates for dates in series if len(dates)]
+
+        if series:
+            all_dates = np.concatenate(series)
+            self.dates, self.support = np.unique(all_dates, return_counts=True)
+            starts = np.sort([dates[0] for dates in series])
+            ends = np.sort([dates[-1] for dates in series])
+            # coverage = 시작일 <= 날짜 인 시계열 수 - 종료일 < 날짜 인 시계열 수
+            self.coverage = (np.searchsorted(starts, self.dates, side='right')
+                             - np.searchsorted(ends, self.dates, side='left'))
+        else:
+            self.dates = np.array([], dtype='datetime64[D]')
+            self.support = np.array([], dtype=np.int64)
+            self.coverage = np.array([], dtype=np.int64)
+
+        # 연도별 정규 거래 요일 (월=0 ... 일=6), 거래 요일이 바뀐 거래소(예: TASE)도 연도 단위로 반영
+        weekdays = self._weekday(self.dates)
+        years = self.dates.astype('datetime64[Y]').astype(np.int64)
+        year_index = years - (years.min() if len(years) else 0)
+        counts = np.zeros((int(year_index.max()) + 1 if len(years) else 0, 7), dtype=np.int64)
+        np.add.at(counts, (year_index, weekdays), 1)
+        self.session_weekdays = counts >= np.maximum(1, SESSION_WEEKDAY_SHARE * counts.sum(axis=1, keepdims=True))
+
+        in_session = self.session_weekdays[year_index, weekdays] if len(years) else np.zeros(0, dtype=bool)
+        lone = (self.coverage >= MIN_COVERAGE_FOR_SUPPORT) & (self.support == 1)
+        self.sessions = self.dates[in_session & ~lone]
+
+    @staticmethod
+    def _weekday(days):
+        # 1970-01-01은 목요일(3)
+        return ((days.astype(np.int64) + 3) % 7).astype(np.int64)
+
+    def is_session(self, days):
+        """거래일 여부 (배열)"""
+        return np.isin(days, self.sessions)
+
+    def sessions_between(self, start, end):
+        """start ~ end (포함) 거래일"""
+        lo = np.searchsorted(self.sessions, start, side='left')
+        hi = np.searchsorted(self.sessions, end, side='right')
+        return self.sessions[lo:hi]
+
+
+def _counts_at(days, counts, targets):
+    """정렬된 고유 날짜 배열에서 targets 날짜별 개수 (없으면 0)"""
+    if len(days) == 0:
+        return np.zeros(len(targets), dtype=np.int64)
+    pos = np.minimum(np.searchsorted(days, targets), len(days) - 1)
+    return np.where(days[pos] == targets, counts[pos], 0)
+
+
+def check_bars(calendar, eodhd_dates, yf_dates, span=None):
+    """
+    한 종목의 두 출처 봉을 거래소 달력과 대조합니다. (전달된 날짜 전체, 집합 연산)
+    - missing_bar: 두 출처가 겹치는 기간(span을 지정하면 그 기간)의 거래일인데 한쪽(또는 양쪽)에 없는 날짜
+    - duplicate_bar: 한 출처에 같은 날짜가 두 번 이상 있는 날짜
+    - out_of_session: 거래일이 아닌 날짜의 봉
+    반환 컬럼: date, eodhd_count, yfinance_count, category
+    """
+    eodhd_days, eodhd_counts = np.unique(to_days(eodhd_dates), return_counts=True)
+    yf_days, yf_counts = np.unique(to_days(yf_dates), return_counts=True)
+
+    frames = []
+
+    duplicated = np.union1d(eodhd_days[eodhd_counts > 1], yf_days[yf_counts > 1])
+    frames.append((duplicated, 'duplicate_bar'))
+
+    observed = np.union1d(eodhd_days, yf_days)
+    frames.append((observed[~calendar.is_session(observed)], 'out_of_session'))
+
+    if span is None and len(eodhd_days) and len(yf_days):
+        span = max(eodhd_days[0], yf_days[0]), min(eodhd_days[-1], yf_days[-1])
+    if span is not None:
+        sessions = calendar.sessions_between(*span)
+        missing = np.union1d(np.setdiff1d(sessions, eodhd_days, assume_unique=True),
+                             np.setdiff1d(sessions, yf_days, assume_unique=True))
+        frames.append((missing, 'missing_bar'))
+
+    rows = []
+    for days, category in frames:
+        if len(days) == 0:
+            continue
+        rows.append(pd.DataFrame({
+            'date': days,
+            'eodhd_count': _counts_at(eodhd_days, eodhd_counts, days),
+            'yfinance_count': _counts_at(yf_days, yf_counts, days),
+            'category': category,
+        }))
+
+    if not rows:
+        return pd.DataFrame(columns=BAR_CHECK_COLUMNS)
+    return pd.concat(rows, ignore_index=True).sort_values(['date', 'category'], ignore_index=True)